@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+# Measures the import cost of the library modules with 'python -X importtime', each in a fresh
+# interpreter so nothing is cached between runs. Run it after changing imports to see where the
+# time goes; tests/test_imports.py checks that the API pipeline does not pull in heavy packages.
+
+LIB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+
+MODULES = ["graph_api", "ig_data_scraper", "ig_images", "ig_scraper", "automated_api_insights"]
+RUNS = 3
+TOP_IMPORTS = 8
+
+def import_times(module, lib_path):
+    """
+    Imports a module in a fresh interpreter and returns its import time breakdown.
+
+    Args:
+        module (str): The module to import.
+        lib_path (str): The lib folder, added to the interpreter's path.
+
+    Returns:
+        list: (cumulative_us, package) tuples for every package imported.
+    """
+    code = f"import sys; sys.path.insert(0, {lib_path!r}); import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"{module} failed to import:\n{result.stderr.splitlines()[-1]}")
+        return []
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        times.append((int(cumulative), package.rstrip()))
+    return times
+
+for module in MODULES:
+    runs = [import_times(module, LIB_PATH)]
+    if not runs[0]:
+        continue
+    runs += [import_times(module, LIB_PATH) for _ in range(RUNS - 1)]
+
+    # The module's own line is its total, including everything it imports
+    totals = sorted(next(us for us, package in run if package.strip() == module) for run in runs)
+    print(f"\n{module}: {totals[len(totals) // 2] / 1000:.1f} ms (median of {RUNS})")
+
+    # Direct imports of the module are listed one level deeper, just before the module itself
+    direct = []
+    for us, package in runs[-1]:
+        depth = len(package) - len(package.lstrip())
+        if depth == 1:
+            if package.strip() == module:
+                break
+            direct = []
+        elif depth == 3:
+            direct.append((us, package.strip()))
+
+    for us, package in sorted(direct, reverse=True)[:TOP_IMPORTS]:
+        print(f"    {us / 1000:8.1f} ms  {package}")
@@ -1,126 +1,133 @@
-import os
-import pandas as pd
 import time
 import datetime
+import traceback
 import schedule
-from ig_data_scraper import load_config, get_media_data, get_profile_data, get_demographic_insights, get_actions_insights, get_images
-from openpyxl import load_workbook
+from graph_api import load_config, get_media_with_insights, get_profile_data, get_demographic_insights, get_actions_insights, get_media_list
+from ig_images import get_images
+from response_cache import cache_stats
+
+# pandas, pyarrow and the modules built on them are imported by the jobs that use them, so
+# importing this module (e.g., for run_logged) and starting the scheduler stay cheap.
 
 # Helper Functions
 
-def export_df(df, metrics_path, sheet_name="Sheet 1"):
+def export_df(df, metrics_path, sheet_name="Sheet 1", exports=None):
     """
-    Exports the given DataFrame to both CSV and Excel formats.
+    Exports the given DataFrame to CSV and Excel formats, the partitioned history store and the other configured sinks.
 
     This function performs the following steps:
+        - Compares the DataFrame against the last exported values of the dataset and, if the dataset is listed
+          in 'CHANGE_ONLY_DATASETS' in the configuration file, keeps only the rows whose values changed.
+        - Expands the extraction and publish timestamps into the date part columns of the existing CSV/Excel layout.
         - Exports the DataFrame to a CSV file, appending to it if the file already exists or creating a new one.
         - Exports the DataFrame to an Excel file, appending data to an existing sheet if the file exists, or creating a new file if not.
+        - Appends the DataFrame to the history store dataset named after the file (e.g., "daily_post_metrics"),
+          partitioned by extraction date, in the dataset's compact typed schema (see schemas.py).
+        - Appends the DataFrame to the dataset's Tableau Hyper extract if 'HYPER_EXPORT' is enabled in the configuration file.
+        - Saves the dataset's last values for the next comparison.
+
+    With an export service, the DataFrame is queued and written by its background writer, so the calling stage
+    can move on to its next request right away (see export_service.py).
 
     Args:
         df (pandas.DataFrame): The DataFrame to be exported.
         metrics_path (str): The base file path (without extension) for saving the CSV and Excel files.
         sheet_name (str, optional): The name of the Excel sheet to append to. Defaults to "Sheet 1".
+        exports (ExportService, optional): The export service to queue the DataFrame on (default is None, write it now).
 
     Returns:
         None
 
     Notes:
         - The function will append data to the CSV and Excel files without including headers for subsequent exports.
+        - In change-only mode, use read_as_of (history_query.py) to reconstruct the full snapshot of any date.
+        - The sinks can be chosen with 'EXPORT_SINKS' in the configuration file.
     """
 
-    # CSV Export
-    if os.path.exists(metrics_path + ".csv"):
-        df.to_csv(metrics_path + ".csv", mode="a", index=False, header=False)  # Append without headers
-    else:
-        df.to_csv(metrics_path + ".csv", mode="w", index=False, header=True)   # Create file with headers
+    from export_service import export_snapshot
 
-    # Excel Export
-    try:
-        with pd.ExcelWriter(metrics_path + ".xlsx", mode="a", engine="openpyxl", if_sheet_exists="overlay") as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False, header=False, startrow=writer.sheets[sheet_name].max_row)
-    except FileNotFoundError:
-        # If the file does not exist, create a new one
-        df.to_excel(metrics_path + ".xlsx", sheet_name=sheet_name, index=False)
+    if exports is not None:
+        exports.submit(df, metrics_path, sheet_name)
+    else:
+        export_snapshot(df, metrics_path, sheet_name)
 
 def add_extraction_datetime(df):
     """
-    Adds current datetime and its components as new columns to the input DataFrame.
+    Adds the current datetime as the 'extraction_datetime' column of the input DataFrame.
 
-    This function retrieves the current datetime and extracts its components, then adds the following columns to the DataFrame:
-        - 'extraction_datetime': The full current datetime.
-        - 'extraction_date': The current date in 'YYYY-MM-DD' format.
-        - 'extraction_year': The current year.
-        - 'extraction_month': The full name of the current month (e.g., "March").
-        - 'extraction_day': The current day of the month.
-        - 'extraction_time': The current time in 'HH:MM:SS' format.
+    Date parts (date, year, month name, day and time) are not stored; they are derived from this
+    column when exporting to CSV/Excel (see schemas.to_legacy_layout) or when reading the history
+    store with read_history(..., date_parts=True).
 
     Args:
-        df (pandas.DataFrame): A DataFrame to which the datetime components will be added.
+        df (pandas.DataFrame): A DataFrame to which the extraction datetime will be added.
 
     Returns:
-        pandas.DataFrame: The input DataFrame with additional columns containing the current datetime components.
+        pandas.DataFrame: The input DataFrame with an 'extraction_datetime' column.
     """
 
-    # Get the current datetime
-    now = datetime.datetime.now()
-
-    # Add datetime components to the data
-    df['extraction_datetime'] = now
-    df['extraction_date'] = now.strftime('%Y-%m-%d')  # YYYY-MM-DD format
-    df['extraction_year'] = now.year
-    df['extraction_month'] = now.strftime('%B')  # Full month name (e.g., "March")
-    df['extraction_day'] = now.day
-    df['extraction_time'] = now.strftime('%H:%M:%S')  # Hour:Minute:Second
+    df['extraction_datetime'] = datetime.datetime.now()
     
     return df
 
 def parse_timestamp(df):
     """
-    Converts timestamp data in a DataFrame to datetime components and adds them as separate columns.
+    Converts the API 'timestamp' column of a DataFrame into a 'publish_datetime' column.
 
-    This function performs the following operations on the 'timestamp' column in the input DataFrame:
-        - Converts the 'timestamp' to a datetime object, removing the timezone information.
-        - Extracts and adds the following components as new columns:
-            - 'publish_date': The date portion of the timestamp.
-            - 'publish_year': The year portion of the timestamp.
-            - 'publish_month': The month portion of the timestamp.
-            - 'publish_day': The day portion of the timestamp.
-            - 'publish_time': The time portion of the timestamp.
+    The timestamp is converted to a datetime object and its timezone information is removed
+    (the API returns UTC). Date parts are derived from 'publish_datetime' at export or read time.
 
     Args:
         df (pandas.DataFrame): A DataFrame containing a 'timestamp' column to be parsed.
 
     Returns:
-        pandas.DataFrame: The input DataFrame with additional columns for the extracted datetime components.
+        pandas.DataFrame: The input DataFrame with a 'publish_datetime' column.
     """
 
-    # Convert to datetime
-    df["publish_datetime"] = pd.to_datetime(df["timestamp"]).dt.tz_localize(None)
+    import pandas as pd
 
-    # Extract components
-    df['publish_date'] = df['publish_datetime'].dt.date
-    df['publish_year'] = df['publish_datetime'].dt.year
-    df['publish_month'] = df['publish_datetime'].dt.month
-    df['publish_day'] = df['publish_datetime'].dt.day
-    df['publish_time'] = df['publish_datetime'].dt.time
+    df["publish_datetime"] = pd.to_datetime(df["timestamp"], errors="coerce", utc=True).dt.tz_localize(None)
 
     return df
 
+def run_logged(job, *args, **kwargs):
+    """
+    Runs a scheduled job, printing its error instead of raising it.
+
+    The scheduler loop runs for days; a failed request or a full disk in one job is logged
+    and the job runs again on its next tick, instead of stopping every other job.
+
+    Args:
+        job (callable): The job to run, e.g., 'sampler.run_pending'.
+        *args: Positional arguments for the job.
+        **kwargs: Keyword arguments for the job.
+
+    Returns:
+        The job's return value, or None if it failed.
+    """
+    try:
+        return job(*args, **kwargs)
+    except Exception:
+        print(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} Error in {getattr(job, '__qualname__', job)}, retrying on its next run:")
+        traceback.print_exc()
+        return None
+
 # Custom Post Classification
 
 def classify_caption(row):
     caption = str(row['caption']).lower()
+    publish_date = row['publish_datetime'].normalize()
     date_threshold_pre_influencer = datetime.datetime(2025, 2, 4)
     date_threshold_self_liberation = datetime.datetime(2025, 4, 7)
     date_threshold_lifestyle = datetime.datetime(2025, 3, 7)
 
-    if row['publish_date'] < date_threshold_pre_influencer:
+    if publish_date < date_threshold_pre_influencer:
         return 'locs'
     elif any(tag in caption for tag in ['progress', 'texture', 'wrap']):
         return 'locs'
-    elif any(tag in caption for tag in ['recap', 'dump']) and row['publish_date'] > date_threshold_lifestyle:
+    elif any(tag in caption for tag in ['recap', 'dump']) and publish_date > date_threshold_lifestyle:
         return 'lifestyle'
-    elif any(tag in caption for tag in ['creative', 'creativity', 'art', 'liberation']) and row['publish_date'] > date_threshold_self_liberation:
+    elif any(tag in caption for tag in ['creative', 'creativity', 'art', 'liberation']) and publish_date > date_threshold_self_liberation:
         return 'self liberation'
     elif any(tag in caption for tag in ['loc', 'hair']):
         return 'locs'
@@ -129,65 +136,71 @@ def classify_caption(row):
 
 # Requests
 
-def get_media_insights():
+def get_media_insights(exports=None):
     """
     Retrieves and processes media insights for posts, then exports the data to a specified path.
 
     The function performs the following steps:
         - Loads the configuration to get the file paths.
-        - Makes a request to retrieve media data, including post caption, media type, URL, permalink, and timestamp.
+        - Makes a paged request to retrieve media data, including post caption, media type, URL, permalink, timestamp,
+          children and thumbnails, then requests the insights that apply to each media type in batches of posts.
+          While the post sampler runs, posts older than DAILY_POLL_MAX_AGE are left out: the sampler reads
+          their insights weekly, and change-only exports keep their last values.
         - Extracts insights data, including metric names and values, for each post.
         - Stores the data for each post, including the insights, in a structured format.
         - Converts the extracted post data into a pandas DataFrame.
         - Adds the extraction datetime and formats the timestamp.
-        - Exports the DataFrame to a specified path for storage or further analysis.
+        - Exports the DataFrame to a specified path for storage or further analysis; the export also appends each
+          post metric's change since the previous extraction to "post_metric_deltas".
 
     The processed insights include media details such as captions, media type, URLs, and associated metric values,
     and are exported as a structured dataset for further use.
 
+    Args:
+        exports (ExportService, optional): The export service to queue the snapshot on (default is None, write it now).
+
     Returns:
-        None
+        list: The fetched posts, each with its 'image_url', for get_post_images.
     """
 
+    from graph_flatten import flatten_children
+    from post_sampler import DAILY_POLL_MAX_AGE, sampler_enabled
+    from schemas import SCHEMAS
+
     # SET UP
     config = load_config()
     daily_post_metrics_path = config['CLEANED_DATA_PATH'] + "daily_post_metrics"
 
     # Make request
     fields = "caption,media_type,media_url,permalink,timestamp"
-    data = get_media_data(fields)
-
-    posts_data = []
-    for post in data:
-        post_info = {
-            'caption': post.get('caption', ''),
-            'media_type': post.get('media_type', ''),
-            'media_url': post.get('media_url', ''),
-            'permalink': post.get('permalink', ''),
-            'post_id': post.get('id', ''),
-            'timestamp': post.get('timestamp', '')
-        }
-        
-        # Extract insights data (if present)
-        insights = post.get('insights', {}).get('data', [])
-        for insight in insights:
-            post_info["name"] = insight['name']  # Put the metric name in "name"
-            post_info["value"] = insight['values'][0]['value']  # Put the metric value in "value"
-            
-            posts_data.append(post_info.copy())  # Use copy to avoid overwriting
-
-    # Create a DataFrame
-    df = pd.DataFrame(posts_data)
+    data = get_media_with_insights(fields, max_age=DAILY_POLL_MAX_AGE if sampler_enabled() else None)
+
+    # One row per post metric, built column by column
+    df = flatten_children(
+        data,
+        parent_fields={
+            'caption': 'caption',
+            'media_type': 'media_type',
+            'media_url': 'media_url',
+            'permalink': 'permalink',
+            'post_id': 'id',
+            'timestamp': 'timestamp'
+        },
+        children_path=('insights', 'data'),
+        child_fields={'name': 'name', 'value': ('values', 0, 'value')},
+        dtypes=SCHEMAS['daily_post_metrics']
+    )
 
     # Format dates
     df = add_extraction_datetime(df)
     df = parse_timestamp(df)
-    df['publish_date'] = pd.to_datetime(df['publish_date'], errors='coerce')
     df['content_pillar'] = df.apply(classify_caption, axis=1)
 
-    export_df(df, daily_post_metrics_path, sheet_name="post_metrics")
+    export_df(df, daily_post_metrics_path, sheet_name="post_metrics", exports=exports)
+
+    return data
 
-def get_profile_insights():
+def get_profile_insights(exports=None):
     """
     Retrieves and processes profile insights, then exports the data to a specified path.
 
@@ -196,15 +209,21 @@ def get_profile_insights():
         - Makes a request to retrieve profile data, including biography, follower count, following count, media count, and profile picture URL.
         - Converts the retrieved profile data into a pandas DataFrame.
         - Adds the extraction datetime to the DataFrame.
-        - Exports the DataFrame to a specified path for storage or further analysis.
+        - Exports the DataFrame to a specified path for storage or further analysis; the export also appends the change
+          in follower, following and media counts since the previous extraction to "profile_metric_deltas".
 
     The processed profile insights include key metrics about the profile, such as followers, media content, and profile picture URL, 
     and are exported as a structured dataset for further use.
 
+    Args:
+        exports (ExportService, optional): The export service to queue the snapshot on (default is None, write it now).
+
     Returns:
         None
     """
 
+    import pandas as pd
+
     # SET UP
     config = load_config()
     daily_profile_metrics_path = config['CLEANED_DATA_PATH'] + "daily_profile_metrics"
@@ -216,9 +235,9 @@ def get_profile_insights():
     df = pd.DataFrame([response])
     df = add_extraction_datetime(df)
 
-    export_df(df, daily_profile_metrics_path, sheet_name="profile_metrics")
+    export_df(df, daily_profile_metrics_path, sheet_name="profile_metrics", exports=exports)
 
-def get_demo_insights():
+def get_demo_insights(exports=None):
     """
     Retrieves and processes demographic insights, then exports the data to a specified path.
 
@@ -233,9 +252,15 @@ def get_demo_insights():
     The processed insights include demographic breakdowns by category, age, gender, and value,
     and are exported as a structured dataset for further use.
 
+    Args:
+        exports (ExportService, optional): The export service to queue the snapshot on (default is None, write it now).
+
     Returns:
         None
     """
+    from graph_flatten import flatten_breakdowns
+    from schemas import SCHEMAS
+
     # SET UP
     config = load_config()
     daily_demographic_metrics_path = config['CLEANED_DATA_PATH'] + "daily_demographic_metrics"
@@ -243,22 +268,13 @@ def get_demo_insights():
     # Make request
     data = get_demographic_insights()
 
-    records = []
-    for item in data["data"]:
-        category = item["name"]
-        for breakdown in item["total_value"]["breakdowns"]:
-            for result in breakdown["results"]:
-                age, gender = result["dimension_values"]
-                value = result["value"]
-                records.append({"category": category, "age": age, "gender": gender, "value": value})
-
-    # Convert to DataFrame
-    df = pd.DataFrame(records)
+    # One row per category, age and gender breakdown result
+    df = flatten_breakdowns(data["data"], name_column="category", dtypes=SCHEMAS['daily_demographic_metrics'])
     df = add_extraction_datetime(df)
 
-    export_df(df, daily_demographic_metrics_path, sheet_name="demographics_metrics")
+    export_df(df, daily_demographic_metrics_path, sheet_name="demographics_metrics", exports=exports)
 
-def get_act_insights():
+def get_act_insights(exports=None):
     """
     Retrieves and processes activity-based insights, then exports the data to a specified path.
 
@@ -268,15 +284,22 @@ def get_act_insights():
         - Extracts and processes relevant metrics from the response data, ensuring numerical values are integers.
         - Converts the extracted metrics into a pandas DataFrame.
         - Adds the extraction datetime to the DataFrame.
-        - Exports the DataFrame to a specified path for storage or further analysis.
+        - Exports the DataFrame to a specified path for storage or further analysis; the export also appends each
+          metric's change since the previous extraction to "actions_metric_deltas".
 
     The processed insights include metric names, titles, and associated values, which are exported 
     as a clean and structured dataset.
 
+    Args:
+        exports (ExportService, optional): The export service to queue the snapshot on (default is None, write it now).
+
     Returns:
         None
     """
 
+    from graph_flatten import flatten_records
+    from schemas import SCHEMAS
+
     # SET UP
     config = load_config()
     daily_actions_metrics_path = config['CLEANED_DATA_PATH'] + "daily_actions_metrics"
@@ -285,21 +308,141 @@ def get_act_insights():
     data = get_actions_insights()
 
     # Extracting data
-    metrics = []
-    for item in data['data']:
-        metrics.append({
-            'Metric Name': item['name'],
-            'Title': item['title'],
-            'Value': int(item.get('total_value', {}).get('value', 0))  # Ensuring integer
+    df = flatten_records(
+        data['data'],
+        fields={'Metric Name': 'name', 'Title': 'title', 'Value': ('total_value', 'value')},
+        dtypes=SCHEMAS['daily_actions_metrics']
+    )
+    df['Value'] = df['Value'].fillna(0)  # Metrics without a total count as zero
+    df = add_extraction_datetime(df)
+
+    export_df(df, daily_actions_metrics_path, sheet_name="actions_metrics", exports=exports)
+
+def get_competitor_insights():
+    """
+    Retrieves and stores follower, media and recent-post metrics for a watchlist of competitor accounts.
+
+    The function performs the following steps:
+        - Loads the competitor usernames from 'COMPETITOR_USERNAMES' in the configuration file.
+        - Fetches every competitor's business discovery data in batched Graph API calls, reusing cached responses.
+        - Builds one profile snapshot row per competitor and one row per recent post.
+        - Adds the extraction datetime to both DataFrames.
+        - Appends both snapshots to the history store ("competitor_profile_metrics" and "competitor_media_metrics").
+
+    Returns:
+        None
+    """
+
+    import pandas as pd
+    from competitor_tracking import get_competitors_data
+    from history_store import write_partition
+
+    # SET UP
+    config = load_config()
+    usernames = config.get('COMPETITOR_USERNAMES', [])
+    if not usernames:
+        return None
+
+    # Make request
+    data = get_competitors_data(usernames)
+
+    profiles = []
+    media = []
+    for username, account in data.items():
+        if account is None:
+            print(f"No business discovery data for {username}")
+            continue
+
+        profiles.append({
+            'username': username,
+            'name': account.get('name', ''),
+            'followers_count': account.get('followers_count'),
+            'follows_count': account.get('follows_count'),
+            'media_count': account.get('media_count')
         })
 
-    # Convert to DataFrame
-    df = pd.DataFrame(metrics)
-    df = add_extraction_datetime(df)
+        for post in account.get('media', {}).get('data', []):
+            media.append({
+                'username': username,
+                'post_id': post.get('id', ''),
+                'caption': post.get('caption', ''),
+                'media_type': post.get('media_type', ''),
+                'media_product_type': post.get('media_product_type', ''),
+                'permalink': post.get('permalink', ''),
+                'timestamp': post.get('timestamp', ''),
+                'like_count': post.get('like_count'),
+                'comments_count': post.get('comments_count')
+            })
+
+    profiles_df = add_extraction_datetime(pd.DataFrame(profiles))
+    media_df = add_extraction_datetime(pd.DataFrame(media))
+    if not media_df.empty:
+        media_df = parse_timestamp(media_df)
+
+    write_partition(profiles_df, "competitor_profile_metrics")
+    write_partition(media_df, "competitor_media_metrics")
+
+def get_comment_insights():
+    """
+    Retrieves new comments and replies on all posts and stores them by post.
+
+    The function performs the following steps:
+        - Requests the comment count of every post in one paged call.
+        - Fetches comment threads, concurrently, only for posts whose comment count changed since the last run.
+        - Keeps only comments newer than each post's stored watermark.
+        - Adds the extraction datetime and appends the comments to the history store ("post_comments"),
+          one partition per extraction date with the rows sorted by post ID, so a run writes a single
+          file and reads by post ID can still skip row groups.
+        - Saves the advanced watermarks once the comments are stored.
+
+    Returns:
+        None
+    """
+
+    from comment_ingestion import ingest_comments, save_watermarks
+    from history_store import write_partition
+
+    # Make request
+    posts = get_media_list("id,timestamp,comments_count")
+    df, watermarks = ingest_comments(posts)
+
+    if not df.empty:
+        df = parse_timestamp(add_extraction_datetime(df)).sort_values(["post_id", "publish_datetime"], kind="stable")
+        write_partition(df, "post_comments")
+
+    save_watermarks(watermarks)
 
-    export_df(df, daily_actions_metrics_path, sheet_name="actions_metrics")
+def get_hashtag_insights():
+    """
+    Retrieves and stores recent and top media for the tracked hashtags.
+
+    The function performs the following steps:
+        - Loads the hashtags from 'TRACKED_HASHTAGS' in the configuration file.
+        - Sweeps the recent and top media of every hashtag concurrently, with pagination,
+          resolving hashtag IDs from the persistent cache.
+        - Adds the extraction datetime and appends the posts to the history store ("hashtag_media").
+
+    Returns:
+        None
+    """
+
+    from hashtag_tracking import sweep_hashtags
+    from history_store import write_partition
+
+    # SET UP
+    config = load_config()
+    hashtags = config.get('TRACKED_HASHTAGS', [])
+    if not hashtags:
+        return None
+
+    # Make request
+    df = sweep_hashtags(hashtags)
 
-def get_post_images():
+    if not df.empty:
+        df = parse_timestamp(add_extraction_datetime(df))
+        write_partition(df, "hashtag_media")
+
+def get_post_images(posts=None):
     """
     Calls the get_images function to download images from URLs in a dataframe 
     and move them to a Tableau repository shape folder.
@@ -309,11 +452,15 @@ def get_post_images():
         - Downloading images from URLs in the dataframe.
         - Moving the downloaded images to a designated Tableau repo shape folder.
 
+    Args:
+        posts (list, optional): Posts returned by get_media_insights, whose image URLs are reused
+            instead of listing the posts again (default is None).
+
     Returns:
         None
     """
     
-    get_images()
+    get_images(posts)
 
 # Final Script
 
@@ -323,23 +470,67 @@ def automated_script():
 
     The following functions are called in sequence:
         - get_media_insights(): Collects insights related to media content.
+        - update_caption_index(): Adds the words and hashtags of new posts' captions to the caption index.
         - get_profile_insights(): Retrieves insights about the profile's performance.
         - get_demo_insights(): Gathers demographic insights for the profile's audience.
         - get_act_insights(): Collects activity-based insights, such as engagement metrics.
-        - get_post_images(): Retrieves images associated with posts.
+        - get_competitor_insights(): Tracks follower and post metrics for competitor accounts.
+        - get_comment_insights(): Ingests new comments and replies on posts.
+        - get_hashtag_insights(): Sweeps recent and top media for tracked hashtags.
+        - get_post_images(): Retrieves images associated with posts, reusing the image URLs fetched with the media.
+        - refresh_rollups(): Rebuilds the weekly and monthly rollups touched by today's extraction.
+        - publish_snapshots(): Publishes the memory-mappable Arrow snapshots of the daily datasets.
 
-    This script automates the process of collecting various types of insights for analysis and reporting.
-    """
+    The daily snapshots are written by a background export service while the next stages fetch their data;
+    it is closed, and the files are flushed to disk, before the rollups read the history store. If a snapshot
+    could not be exported, closing it raises, so the rollups and snapshots are not rebuilt over missing data
+    and run_logged records the failed run.
 
-    get_media_insights()
-    get_profile_insights()
-    get_demo_insights()
-    get_act_insights()
-    get_post_images()
+    The response cache hit/miss counts are printed at the end of the run.
 
-# Run every day
-schedule.every().day.at("17:38").do(automated_script)
+    This script automates the process of collecting various types of insights for analysis and reporting.
+    """
 
-while True:
-    schedule.run_pending()
-    time.sleep(60)  # Check every minute
\ No newline at end of file
+    from caption_index import update_caption_index
+    from export_service import ExportService
+    from history_query import publish_snapshots
+    from rollups import refresh_rollups
+
+    with ExportService() as exports:
+        posts = get_media_insights(exports)
+        update_caption_index(posts)
+        get_profile_insights(exports)
+        get_demo_insights(exports)
+        get_act_insights(exports)
+        get_competitor_insights()
+        get_comment_insights()
+        get_hashtag_insights()
+        get_post_images(posts)
+    refresh_rollups()
+    publish_snapshots()
+
+    print("Response cache:", cache_stats())
+
+if __name__ == "__main__":
+    from post_sampler import PostSampler
+    from story_capture import StoryCapture
+
+    # Run every day
+    # Every job runs through run_logged, so an error is printed and the loop keeps going
+    schedule.every().day.at("17:38").do(run_logged, automated_script)
+
+    # Sample young posts several times a day between the daily runs; new posts are picked up hourly
+    sampler = PostSampler()
+    if sampler.budget_per_hour > 0:
+        run_logged(sampler.refresh_posts)
+        schedule.every().hour.do(run_logged, sampler.refresh_posts)
+
+    # Stories are only live for 24 hours, so they are polled on their own short interval
+    stories = StoryCapture()
+
+    while True:
+        schedule.run_pending()
+        if sampler.budget_per_hour > 0:
+            run_logged(sampler.run_pending)
+        run_logged(stories.run_pending)
+        time.sleep(60)  # Check every minute
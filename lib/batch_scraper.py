@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import datetime
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ig_scraper import ChromeDriverPool, scrape_ig_post, PAGE_DEADLINE
+
+# --- Batch Scraping Settings ---
+DEFAULT_RETRIES = 2     # Extra attempts per URL after the first one fails
+RETRY_BACKOFF = 2.0     # Seconds to wait before a retry, doubled on every further attempt
+PARQUET_FLUSH_ROWS = 50 # Results buffered before a Parquet part file is written
+
+# Columns of the Parquet results; scraped elements missing from a record are stored as nulls
+PARQUET_COLUMNS = ["url", "status", "attempts", "scraped_at", "error", "likes", "hashtags"]
+
+# Helper Functions
+
+def is_parquet_output(output_path):
+    """
+    Returns True when results should go to a folder of Parquet part files instead of a JSONL file.
+    """
+    return output_path.endswith(".parquet")
+
+def read_result_records(output_path):
+    """
+    Yields the result records stored at 'output_path', oldest first.
+
+    For JSONL files, lines that cannot be parsed (e.g., a final line cut off when a previous run was
+    interrupted) are ignored. For Parquet output, the part files are read in the order they were written;
+    files starting with "." are unfinished writes and are skipped.
+
+    Args:
+        output_path (str): Path to the JSONL results file or the Parquet results folder.
+
+    Yields:
+        dict: One result record per scraped URL.
+    """
+    if not os.path.exists(output_path):
+        return
+
+    if is_parquet_output(output_path):
+        import pyarrow.parquet as pq
+
+        for name in sorted(os.listdir(output_path)):
+            if name.startswith(".") or not name.endswith(".parquet"):
+                continue
+            table = pq.read_table(os.path.join(output_path, name), columns=["url", "status"])
+            yield from table.to_pylist()
+        return
+
+    with open(output_path, "r", encoding="utf-8") as results_file:
+        for line in results_file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def load_completed_urls(output_path):
+    """
+    Reads a JSONL results file or Parquet results folder and returns the URLs that were already scraped successfully.
+
+    A partially written file can always be resumed, see read_result_records.
+
+    Args:
+        output_path (str): Path to the JSONL results file or the Parquet results folder.
+
+    Returns:
+        set: The URLs whose latest record has status "ok".
+    """
+    completed = set()
+
+    for record in read_result_records(output_path):
+        if record.get("status") == "ok":
+            completed.add(record["url"])
+        else:
+            completed.discard(record.get("url"))
+
+    return completed
+
+def write_parquet_part(records, output_path):
+    """
+    Writes a batch of result records as a new part file in the Parquet results folder.
+
+    The function performs the following steps:
+        - Maps every record onto PARQUET_COLUMNS, storing "Not Found" elements as nulls so each
+          column keeps a single type (likes as text, hashtags as a list of text).
+        - Writes the part under a hidden temporary name and renames it into place, so an interrupted
+          write never leaves a truncated part behind.
+
+    Args:
+        records (list): Result records returned by scrape_with_retries.
+        output_path (str): Path of the Parquet results folder.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not records:
+        return
+
+    schema = pa.schema([
+        ("url", pa.string()), ("status", pa.string()), ("attempts", pa.int64()), ("scraped_at", pa.string()),
+        ("error", pa.string()), ("likes", pa.string()), ("hashtags", pa.list_(pa.string())),
+    ])
+    rows = []
+    for record in records:
+        row = {column: record.get(column) for column in PARQUET_COLUMNS}
+        if row["likes"] is not None:
+            row["likes"] = None if row["likes"] == "Not Found" else str(row["likes"])
+        if not isinstance(row["hashtags"], list):
+            row["hashtags"] = None
+        rows.append(row)
+
+    os.makedirs(output_path, exist_ok=True)
+    # Zero-padded timestamps keep the part files in write order when sorted by name
+    name = f"part-{time.time_ns():020d}.parquet"
+    temp_path = os.path.join(output_path, "." + name)
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), temp_path)
+    os.replace(temp_path, os.path.join(output_path, name))
+
+def scrape_with_retries(url, pool, elements=None, retries=DEFAULT_RETRIES, timeout=PAGE_DEADLINE):
+    """
+    Scrapes a single post with a leased browser, retrying scrapes that fail or whose page does not load.
+
+    A post that loads but has hidden likes or no hashtags is a successful scrape with "Not Found" values.
+
+    Args:
+        url (str): The URL of the Instagram post.
+        pool (ChromeDriverPool): The pool of browsers to lease from.
+        elements (list, optional): A list of elements to scrape, e.g., ['likes', 'hashtags'].
+        retries (int, optional): Extra attempts after the first failure (default is DEFAULT_RETRIES).
+        timeout (float, optional): Seconds each attempt may wait for the page's elements (default is PAGE_DEADLINE).
+
+    Returns:
+        dict: A result record with the URL, status ("ok" or "failed"), number of attempts, scrape time and
+              either the scraped elements or the last error message.
+    """
+    error = None
+
+    for attempt in range(1, retries + 2):
+        try:
+            result = scrape_ig_post(url, elements=elements, pool=pool, deadline=timeout, require_page=True)
+            record = {"url": url, "status": "ok", "attempts": attempt}
+            record.update(result)
+            break
+        except Exception as e:
+            error = str(e)
+
+        if attempt <= retries:
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+    else:
+        record = {"url": url, "status": "failed", "attempts": retries + 1, "error": error}
+
+    record["scraped_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+    return record
+
+# Batch Engine
+
+def scrape_ig_posts(urls, output_path, pool=None, workers=2, elements=None, retries=DEFAULT_RETRIES, timeout=PAGE_DEADLINE, resume=True, login=True):
+    """
+    Scrapes many Instagram posts across a pool of browsers and streams the results to a JSONL file or Parquet folder.
+
+    The function performs the following steps:
+        - Skips URLs already scraped successfully in 'output_path' when 'resume' is True.
+        - Starts a ChromeDriverPool with 'workers' browsers, unless a pool is provided.
+        - Scrapes the remaining URLs concurrently, one leased browser per job, retrying failures.
+        - Appends one JSON line per URL as soon as it completes, so an interrupted run loses
+          at most the jobs that were in flight; queued URLs are cancelled and left for the next run.
+        - If 'output_path' ends with ".parquet", writes the results instead as Parquet part files in
+          that folder, one per PARQUET_FLUSH_ROWS results, plus the remainder when the run ends or is interrupted.
+
+    Args:
+        urls (iterable): Instagram post URLs, e.g., the links returned by get_ig_post_links.
+        output_path (str): Path of the JSONL file to append results to, or of a Parquet results folder
+                           if it ends with ".parquet".
+        pool (ChromeDriverPool, optional): An existing pool of browsers to scrape with (default is None).
+        workers (int, optional): Number of concurrent scrape jobs and, if no pool is given, browsers (default is 2).
+        elements (list, optional): A list of elements to scrape, e.g., ['likes', 'hashtags'] (default is all).
+        retries (int, optional): Extra attempts per URL after the first failure (default is DEFAULT_RETRIES).
+        timeout (float, optional): Seconds each attempt may wait for the page's elements (default is PAGE_DEADLINE).
+        resume (bool, optional): Whether to skip URLs already scraped successfully (default is True).
+        login (bool, optional): Whether a newly started pool should load the saved Instagram cookies (default is True).
+
+    Returns:
+        dict: Counts of "ok", "failed" and "skipped" URLs.
+
+    Example:
+        links, _ = get_ig_post_links("username")
+        print(scrape_ig_posts(links, "competitor_posts.jsonl", workers=3))
+        print(scrape_ig_posts(links, "competitor_posts.parquet", workers=3))
+    """
+    # Deduplicate while keeping the input order
+    urls = list(dict.fromkeys(urls))
+    completed = load_completed_urls(output_path) if resume else set()
+    pending = [url for url in urls if url not in completed]
+    summary = {"ok": 0, "failed": 0, "skipped": len(urls) - len(pending)}
+
+    if not pending:
+        return summary
+
+    parquet = is_parquet_output(output_path)
+    buffered = []
+    owns_pool = pool is None
+
+    try:
+        if owns_pool:
+            pool = ChromeDriverPool(size=workers, login=login)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                (nullcontext() if parquet else open(output_path, "a", encoding="utf-8")) as results_file:
+            futures = [
+                executor.submit(scrape_with_retries, url, pool, elements, retries, timeout)
+                for url in pending
+            ]
+
+            try:
+                # Results are written from this thread only, in completion order
+                for i, future in enumerate(as_completed(futures), start=1):
+                    record = future.result()
+                    if parquet:
+                        buffered.append(record)
+                        if len(buffered) >= PARQUET_FLUSH_ROWS:
+                            write_parquet_part(buffered, output_path)
+                            buffered = []
+                    else:
+                        results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        results_file.flush()
+                    summary[record["status"]] += 1
+                    print(f"🔹 {i}/{len(pending)} {record['status']}: {record['url']}")
+            except BaseException:
+                # On Ctrl+C or an error, drop the queued URLs and only wait for the scrapes in flight
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        # Results still buffered for Parquet are kept even when the run is interrupted
+        write_parquet_part(buffered, output_path)
+        if owns_pool and pool is not None:
+            pool.close()
+
+    return summary
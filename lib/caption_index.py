@@ -0,0 +1,232 @@
+import os
+import datetime
+import pandas as pd
+from history_store import dataset_dir, write_partition
+from history_query import read_history, read_as_of
+from change_tracking import load_last_values
+from file_locks import dataset_lock
+
+# --- Caption Index Layout ---
+# An inverted index of post captions: one (term, post_id) posting per distinct word or hashtag
+# of a caption, stored in the history store partitioned by kind ("word" or "hashtag"). Each post
+# is tokenized once, the first time it is seen, and its postings are appended as a new part file.
+INDEX_DATASET = "caption_postings"
+INDEX_PARTITION_COL = "kind"
+INDEXED_POSTS_FILE = "_indexed_posts.parquet"  # IDs of the indexed posts; "_" files are skipped by dataset readers
+
+HASHTAG_PATTERN = r"#(\w+)"
+MENTION_PATTERN = r"@[\w.]+|https?://\S+"  # Removed before words are extracted
+WORD_PATTERN = r"[^\W_]+(?:'[^\W_]+)?"
+
+def tokenize_captions(posts):
+    """
+    Extracts the distinct lowercase words and hashtags of every caption.
+
+    Hashtags are indexed without their '#' and are not indexed as words; mentions and links
+    are skipped. Every caption is processed with vectorized string operations.
+
+    Args:
+        posts (pandas.DataFrame): Posts with 'post_id' and 'caption'.
+
+    Returns:
+        pandas.DataFrame: The postings, one row per distinct ('kind', 'term', 'post_id').
+    """
+    captions = posts["caption"].fillna("").astype(str).str.lower()
+    captions.index = posts["post_id"].astype(str).to_numpy()
+
+    hashtags = captions.str.findall(HASHTAG_PATTERN)
+    words = captions.str.replace(HASHTAG_PATTERN, " ", regex=True).str.replace(MENTION_PATTERN, " ", regex=True).str.findall(WORD_PATTERN)
+
+    postings = []
+    for kind, terms in (("hashtag", hashtags), ("word", words)):
+        exploded = terms.explode().dropna()
+        postings.append(pd.DataFrame({"kind": kind, "term": exploded.to_numpy(), "post_id": exploded.index.to_numpy()}))
+
+    return pd.concat(postings, ignore_index=True).drop_duplicates(ignore_index=True)
+
+def indexed_posts_path():
+    """
+    Returns the path of the file listing the posts already in the caption index.
+
+    Returns:
+        str: The file path, next to the index's partitions.
+    """
+    return os.path.join(dataset_dir(INDEX_DATASET), INDEXED_POSTS_FILE)
+
+def indexed_post_ids():
+    """
+    Returns the IDs of the posts already in the caption index.
+
+    Reads the small list of indexed posts kept next to the index, one row per post; an index
+    built before that list existed is scanned once instead (only its 'post_id' column).
+
+    Returns:
+        set: Post IDs as text.
+    """
+    if os.path.exists(indexed_posts_path()):
+        return set(pd.read_parquet(indexed_posts_path())["post_id"].astype(str))
+
+    postings = read_history(INDEX_DATASET, columns=["post_id"], partition_col=INDEX_PARTITION_COL)
+    return set(postings["post_id"].astype(str)) if not postings.empty else set()
+
+def save_indexed_post_ids(post_ids):
+    """
+    Saves the IDs of the indexed posts, replacing the previous list atomically.
+
+    Args:
+        post_ids (iterable): Post IDs as text.
+
+    Returns:
+        None
+    """
+    path = indexed_posts_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = os.path.join(os.path.dirname(path), f".{INDEXED_POSTS_FILE}.tmp")
+    pd.DataFrame({"post_id": sorted(post_ids)}, dtype="string").to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def update_caption_index(posts):
+    """
+    Adds the posts that are not in the caption index yet.
+
+    This function performs the following steps:
+        - Reads the IDs of the posts already indexed from the index's list of indexed posts.
+        - Tokenizes the captions of the new posts into words and hashtags.
+        - Appends their postings to the 'caption_postings' dataset, without rewriting earlier postings.
+        - Adds the new posts to the list of indexed posts.
+
+    The index lock is held meanwhile, so two runs never index the same posts twice. Captions
+    edited after a post was indexed keep their original terms.
+
+    Args:
+        posts (list or pandas.DataFrame): Posts with 'id' (or 'post_id') and 'caption', e.g., from get_media_with_insights.
+
+    Returns:
+        int: The number of posts indexed.
+    """
+    df = pd.DataFrame(posts)
+    if df.empty:
+        return 0
+    if "post_id" not in df.columns:
+        df = df.rename(columns={"id": "post_id"})
+    if "caption" not in df.columns:
+        df["caption"] = ""
+
+    with dataset_lock(INDEX_DATASET):
+        indexed = indexed_post_ids()
+        new = df[~df["post_id"].astype(str).isin(indexed)].drop_duplicates("post_id")
+        if new.empty:
+            return 0
+
+        postings = tokenize_captions(new)
+        postings["indexed_datetime"] = datetime.datetime.now()
+        write_partition(postings, INDEX_DATASET, partition_col=INDEX_PARTITION_COL)
+
+        # Written after the postings: if the run stops in between, the posts are indexed again
+        # next time, and 'read_postings' drops the duplicate postings
+        save_indexed_post_ids(indexed | set(new["post_id"].astype(str)))
+
+    print(f"Indexed the captions of {len(new)} new posts")
+    return len(new)
+
+def parse_terms(terms):
+    """
+    Splits query terms into hashtags (written with a leading '#') and words.
+
+    Args:
+        terms (str or list): A term or a list of terms, e.g., ["wrap", "#locjourney"].
+
+    Returns:
+        pandas.DataFrame: 'kind', 'term' (lowercase, without '#') and 'query' (the term as given).
+    """
+    terms = [terms] if isinstance(terms, str) else list(terms)
+    return pd.DataFrame({
+        "kind": ["hashtag" if term.startswith("#") else "word" for term in terms],
+        "term": [term.lstrip("#").lower() for term in terms],
+        "query": terms,
+    })
+
+def read_postings(terms):
+    """
+    Reads the postings of the given terms, touching only the matching kind partitions and terms.
+
+    Args:
+        terms (str or list): A term or a list of terms; hashtags start with '#'.
+
+    Returns:
+        pandas.DataFrame: 'query' (the term as given) and 'post_id', one row per matching post.
+    """
+    wanted = parse_terms(terms)
+    postings = read_history(
+        INDEX_DATASET,
+        columns=["kind", "term", "post_id"],
+        filters=[("kind", "in", wanted["kind"].unique()), ("term", "in", wanted["term"].unique())],
+        partition_col=INDEX_PARTITION_COL,
+    )
+    if postings.empty:
+        return pd.DataFrame({"query": pd.Series(dtype=str), "post_id": pd.Series(dtype=str)})
+
+    postings = postings.astype({"kind": str, "term": str, "post_id": str})
+    return postings.merge(wanted, on=["kind", "term"])[["query", "post_id"]].drop_duplicates()
+
+def latest_post_metric(metric):
+    """
+    Returns the latest value of a post metric for every post.
+
+    Uses the last exported values kept for change detection, a single small file, and falls
+    back to reconstructing them from the history store.
+
+    Args:
+        metric (str): The metric name, e.g., "reach".
+
+    Returns:
+        pandas.DataFrame: 'post_id' (as text) and 'value'.
+    """
+    latest = load_last_values("daily_post_metrics")
+    if latest is None:
+        latest = read_as_of("daily_post_metrics", datetime.date.today(), columns=["value"], filters=[("name", "==", metric)])
+    if latest.empty:
+        return pd.DataFrame({"post_id": pd.Series(dtype=str), "value": pd.Series(dtype="Int64")})
+
+    latest = latest[latest["name"].astype(str) == metric]
+    return pd.DataFrame({"post_id": latest["post_id"].astype(str).to_numpy(), "value": latest["value"].astype("Int64").to_numpy()})
+
+def term_engagement(terms, metric="reach", combine=None):
+    """
+    Summarizes a metric over the posts that use each term.
+
+    Postings and metric values are joined and aggregated with vectorized merges and group-bys,
+    so no caption is scanned at query time.
+
+    Args:
+        terms (str or list): Words and hashtags, e.g., ["wrap", "#locjourney"].
+        metric (str, optional): The post metric to summarize (default is "reach").
+        combine (str, optional): "any" to summarize the posts using at least one of the terms, or
+            "all" for the posts using every term, as a single row (default is None, one row per term).
+
+    Returns:
+        pandas.DataFrame: 'term', 'posts', 'mean', 'median' and 'total' of the metric.
+
+    Example:
+        term_engagement(["wrap", "#locjourney"], metric="reach", combine="any")
+    """
+    postings = read_postings(terms)
+    queries = parse_terms(terms)["query"].drop_duplicates()
+
+    if combine == "any":
+        labels = [" OR ".join(queries)]
+        postings = postings.drop_duplicates("post_id").assign(query=labels[0])
+    elif combine == "all":
+        labels = [" AND ".join(queries)]
+        counts = postings.groupby("post_id")["query"].nunique()
+        postings = pd.DataFrame({"query": labels[0], "post_id": counts.index[counts == len(queries)].astype(str)})
+    else:
+        labels = list(queries)
+
+    merged = postings.merge(latest_post_metric(metric), on="post_id")
+    summary = merged.groupby("query")["value"].agg(posts="count", mean="mean", median="median", total="sum")
+
+    # Terms no post uses are reported with zero posts
+    summary = summary.reindex(labels).fillna({"posts": 0, "total": 0}).astype({"posts": int})
+    return summary.rename_axis("term").reset_index()
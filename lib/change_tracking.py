@@ -0,0 +1,124 @@
+import os
+import pandas as pd
+from history_store import dataset_dir
+
+# --- Change Tracking Definitions ---
+# keys:   Columns identifying one metric series.
+# values: Columns compared against the last stored values; a row is exported in change-only
+#         mode when any of them changed or its series is new.
+CHANGE_SPECS = {
+    "daily_post_metrics": {
+        "keys": ["post_id", "name"],
+        "values": ["value"],
+    },
+    "daily_profile_metrics": {
+        "keys": ["id"],
+        "values": ["followers_count", "follows_count", "media_count"],
+    },
+    "daily_demographic_metrics": {
+        "keys": ["category", "age", "gender"],
+        "values": ["value"],
+    },
+    "daily_actions_metrics": {
+        "keys": ["Metric Name"],
+        "values": ["Value"],
+    },
+}
+
+# Stored next to the dataset's partitions; names starting with "_" are skipped by dataset readers
+LAST_VALUES_FILE = "_last_values.parquet"
+
+def last_values_path(dataset):
+    """
+    Returns the path of the file holding the latest value of every series of a dataset.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+
+    Returns:
+        str: The last values file path.
+    """
+    return os.path.join(dataset_dir(dataset), LAST_VALUES_FILE)
+
+def load_last_values(dataset):
+    """
+    Loads the latest value of every series of a dataset, as of the last export.
+
+    Args:
+        dataset (str): The dataset name, a key of CHANGE_SPECS.
+
+    Returns:
+        pandas.DataFrame or None: The key columns (as text), the value columns and 'extraction_datetime'
+        (the last time the series was seen), or None if nothing has been exported yet.
+    """
+    path = last_values_path(dataset)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+def save_last_values(dataset, state):
+    """
+    Saves the latest value of every series of a dataset, replacing the previous file atomically.
+
+    Args:
+        dataset (str): The dataset name.
+        state (pandas.DataFrame): The state returned by 'detect_changes'.
+
+    Returns:
+        None
+    """
+    path = last_values_path(dataset)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    state.reset_index(drop=True).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def values_differ(current, previous):
+    """
+    Compares two value columns element-wise, treating two missing values as equal.
+
+    Args:
+        current (pandas.Series): The current values.
+        previous (pandas.Series): The last stored values.
+
+    Returns:
+        pandas.Series: True where the value changed.
+    """
+    current = current.astype(object)
+    previous = previous.astype(object)
+    both_missing = current.isna() & previous.isna()
+    return (current != previous) & ~both_missing
+
+def detect_changes(dataset, df):
+    """
+    Finds the rows of a snapshot whose values changed since the last export.
+
+    Args:
+        dataset (str): The dataset name, a key of CHANGE_SPECS.
+        df (pandas.DataFrame): The snapshot that is about to be exported, with 'extraction_datetime'.
+
+    Returns:
+        tuple: (changed, state) where 'changed' holds the rows of 'df' that are new or changed, and
+        'state' is the updated last values to save with 'save_last_values' once the export succeeded.
+    """
+    spec = CHANGE_SPECS[dataset]
+    keys, values = spec["keys"], spec["values"]
+
+    # Keys are compared as text so that backfilled numeric IDs match IDs from the API
+    current = df[keys + values + ["extraction_datetime"]].reset_index(drop=True)
+    current = current.assign(**{key: current[key].astype(str) for key in keys})
+
+    previous = load_last_values(dataset)
+    if previous is None:
+        return df, current
+
+    merged = current.merge(previous, on=keys, how="left", suffixes=("", "_previous"), indicator=True)
+    changed = merged["_merge"] == "left_only"
+    for column in values:
+        changed |= values_differ(merged[column], merged[f"{column}_previous"])
+
+    # Series not in this snapshot keep their last values
+    seen = previous.merge(current[keys], on=keys, how="left", indicator=True)["_merge"] == "both"
+    state = pd.concat([previous[~seen.to_numpy()], current], ignore_index=True)
+
+    return df[changed.to_numpy()], state
@@ -0,0 +1,147 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from graph_api import load_config, paged_request
+from history_store import history_root
+
+# --- Comment Ingestion Settings ---
+COMMENT_FIELDS = "id,text,timestamp,username,like_count"
+COMMENT_WORKERS = 8  # Posts whose comments are fetched concurrently
+WATERMARKS_FILE = "comment_watermarks.json"
+
+def watermarks_path():
+    """
+    Returns the path of the file holding the per-post comment watermarks.
+
+    Returns:
+        str: The watermarks file path inside the history store.
+    """
+    return os.path.join(history_root(), WATERMARKS_FILE)
+
+def load_watermarks():
+    """
+    Loads the per-post comment watermarks saved by the previous run.
+
+    Returns:
+        dict: Post ID mapped to {"last_timestamp": str, "comments_count": int}.
+    """
+    try:
+        with open(watermarks_path(), "r", encoding="utf-8") as watermarks_file:
+            return json.load(watermarks_file)
+    except FileNotFoundError:
+        return {}
+
+def save_watermarks(watermarks):
+    """
+    Saves the per-post comment watermarks, replacing the file atomically.
+
+    Args:
+        watermarks (dict): Post ID mapped to {"last_timestamp": str, "comments_count": int}.
+
+    Returns:
+        None
+    """
+    path = watermarks_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as watermarks_file:
+        json.dump(watermarks, watermarks_file)
+    os.replace(tmp_path, path)
+
+def fetch_post_comments(post_id, since=None):
+    """
+    Retrieves every comment and reply on a post, following pagination, newer than a watermark.
+
+    Replies are requested through nested field expansion on the comments edge, so a thread
+    costs one request per page of comments; reply threads longer than one page are followed
+    through their own 'paging.next' links.
+
+    Args:
+        post_id (str): The ID of the Instagram media post.
+        since (str, optional): ISO timestamp of the newest comment already stored (default is None).
+
+    Returns:
+        list: One dictionary per comment or reply with 'parent_id' set for replies.
+
+    Raises:
+        RuntimeError: If a page of comments or replies could not be fetched.
+    """
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{post_id}/comments"
+
+    params = {
+        "fields": f"{COMMENT_FIELDS},replies{{{COMMENT_FIELDS}}}",
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 50
+    }
+
+    rows = []
+    for comment in paged_request(endpoint, params, raise_on_error=True):
+        replies = comment.pop("replies", {})
+        rows.append(dict(comment, parent_id=None))
+
+        reply_items = replies.get("data", [])
+        next_url = replies.get("paging", {}).get("next")
+        if next_url:
+            reply_items = reply_items + paged_request(next_url, raise_on_error=True)
+        rows.extend(dict(reply, parent_id=comment["id"]) for reply in reply_items)
+
+    if since:
+        rows = [row for row in rows if row.get("timestamp", "") > since]
+    return rows
+
+def ingest_comments(posts, watermarks=None, workers=COMMENT_WORKERS):
+    """
+    Fetches new comments for many posts concurrently, skipping posts with no new comments.
+
+    The function performs the following steps:
+        - Skips posts whose 'comments_count' matches the count stored in their watermark.
+        - Fetches the remaining posts' comment threads concurrently.
+        - Keeps only comments newer than each post's watermark.
+        - Advances the watermarks to the newest comment and current count of each post.
+        - Leaves out the comments and keeps the watermark of every post whose thread failed to fetch
+          completely, so the next run fetches it again instead of skipping the missing pages.
+
+    Args:
+        posts (list): Dictionaries with at least 'id' and 'comments_count', e.g., from get_media_list.
+        watermarks (dict, optional): Existing watermarks (default is the saved watermarks).
+        workers (int, optional): Number of posts fetched concurrently (default is COMMENT_WORKERS).
+
+    Returns:
+        pandas.DataFrame: One row per new comment or reply, with its 'comment_id' and 'post_id'.
+        dict: The updated watermarks.
+    """
+    watermarks = dict(load_watermarks() if watermarks is None else watermarks)
+
+    changed = [
+        post for post in posts
+        if watermarks.get(post["id"], {}).get("comments_count") != post.get("comments_count", 0)
+    ]
+
+    def fetch(post):
+        since = watermarks.get(post["id"], {}).get("last_timestamp")
+        try:
+            return post, fetch_post_comments(post["id"], since)
+        except Exception as e:
+            print(f"Error fetching comments of post {post['id']}, retrying next run: {e}")
+            return post, None
+
+    records = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for post, rows in executor.map(fetch, changed):
+            if rows is None:
+                failed += 1
+                continue
+            previous = watermarks.get(post["id"], {}).get("last_timestamp")
+            newest = max([row.get("timestamp", "") for row in rows] + [previous or ""])
+            watermarks[post["id"]] = {
+                "last_timestamp": newest or None,
+                "comments_count": post.get("comments_count", 0)
+            }
+            records.extend(dict(row, post_id=post["id"]) for row in rows)
+
+    print(f"Fetched {len(records)} new comments from {len(changed) - failed} of {len(posts)} posts ({failed} failed)")
+    return pd.DataFrame(records).rename(columns={"id": "comment_id"}), watermarks
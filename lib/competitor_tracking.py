@@ -0,0 +1,76 @@
+from urllib.parse import urlencode
+from graph_api import load_config, graph_batch_request
+from response_cache import cache_key, read_cache, write_cache
+
+# --- Competitor Tracking Settings ---
+COMPETITOR_CACHE_TTL = 6 * 60 * 60  # Seconds a competitor snapshot is reused before refetching
+COMPETITOR_MEDIA_LIMIT = 12         # Recent posts fetched per competitor
+COMPETITOR_MEDIA_FIELDS = "id,caption,media_type,media_product_type,permalink,timestamp,like_count,comments_count"
+
+def competitor_fields(username, media_limit=COMPETITOR_MEDIA_LIMIT):
+    """
+    Builds the nested business_discovery field expansion for one competitor.
+
+    A single expansion returns the account counts and its most recent media with their
+    public engagement counts, so each competitor costs one sub-request.
+
+    Args:
+        username (str): The competitor's Instagram username.
+        media_limit (int, optional): Number of recent posts to include (default is COMPETITOR_MEDIA_LIMIT).
+
+    Returns:
+        str: The value of the 'fields' parameter.
+    """
+    return (
+        f"business_discovery.username({username})"
+        f"{{username,name,followers_count,follows_count,media_count,"
+        f"media.limit({media_limit}){{{COMPETITOR_MEDIA_FIELDS}}}}}"
+    )
+
+def get_competitors_data(usernames, media_limit=COMPETITOR_MEDIA_LIMIT, ttl=COMPETITOR_CACHE_TTL):
+    """
+    Retrieves business discovery data for a watchlist of competitor accounts.
+
+    The function performs the following steps:
+        - Returns cached responses for competitors fetched within the last 'ttl' seconds.
+        - Fetches all remaining competitors through Graph API batch requests (50 accounts per call).
+        - Caches each successful response.
+
+    Args:
+        usernames (list): The competitors' Instagram usernames.
+        media_limit (int, optional): Number of recent posts to include per competitor (default is COMPETITOR_MEDIA_LIMIT).
+        ttl (float, optional): Maximum age in seconds of a reusable cached response (default is COMPETITOR_CACHE_TTL).
+
+    Returns:
+        dict: Username mapped to its business_discovery data, or None if the request failed.
+
+    Example:
+        data = get_competitors_data(["bluebottle", "locwithaush"])
+        print(data["bluebottle"]["followers_count"])
+    """
+    config = load_config()
+    ig_user_id = config['ACCOUNT_ID']
+
+    results = {}
+    missing = []
+    for username in dict.fromkeys(usernames):
+        key = cache_key(ig_user_id, {"fields": competitor_fields(username, media_limit)})
+        cached = read_cache(key, ttl)
+        if cached is not None:
+            results[username] = cached
+        else:
+            missing.append((username, key))
+
+    relative_urls = [
+        f"{ig_user_id}?" + urlencode({"fields": competitor_fields(username, media_limit)})
+        for username, _ in missing
+    ]
+    responses = graph_batch_request(relative_urls)
+
+    for (username, key), response in zip(missing, responses):
+        data = response.get("business_discovery") if response else None
+        if data is not None:
+            write_cache(key, data)
+        results[username] = data
+
+    return results
@@ -0,0 +1,168 @@
+import pandas as pd
+from history_store import list_partitions
+from history_query import read_history
+from change_tracking import load_last_values
+
+# --- Delta Table Definitions ---
+# keys:          Columns identifying one metric series.
+# value:         Column holding the cumulative value (long format datasets).
+# value_columns: Columns melted into name/value rows first (wide format datasets).
+# from_zero:     Series start at zero, so a key seen for the first time gained its whole value.
+# monthly_reset: Values are month-to-date totals, so the first snapshot of a month starts from zero.
+DELTA_SPECS = {
+    "daily_post_metrics": {
+        "output": "post_metric_deltas",
+        "keys": ["post_id", "name"],
+        "value": "value",
+        "from_zero": True,
+        "monthly_reset": False,
+    },
+    "daily_profile_metrics": {
+        "output": "profile_metric_deltas",
+        "keys": ["name"],
+        "value_columns": ["followers_count", "follows_count", "media_count"],
+        "from_zero": False,
+        "monthly_reset": False,
+    },
+    "daily_actions_metrics": {
+        "output": "actions_metric_deltas",
+        "keys": ["Metric Name"],
+        "value": "Value",
+        "from_zero": False,
+        "monthly_reset": True,
+    },
+}
+
+def to_long(df, spec):
+    """
+    Reshapes a snapshot into one row per metric series with a numeric 'value' column.
+
+    Args:
+        df (pandas.DataFrame): Snapshot rows as exported by the pipeline.
+        spec (dict): The dataset's entry in DELTA_SPECS.
+
+    Returns:
+        pandas.DataFrame: The key columns, 'value' and 'extraction_datetime'.
+    """
+    if "value_columns" in spec:
+        df = df.melt(id_vars=["extraction_datetime"], value_vars=spec["value_columns"], var_name="name", value_name="value")
+    else:
+        df = df[spec["keys"] + [spec["value"], "extraction_datetime"]].rename(columns={spec["value"]: "value"})
+
+    # Keys are compared as text so that backfilled numeric IDs match IDs from the API
+    df = df.assign(**{key: df[key].astype(str) for key in spec["keys"]})
+    df = df.assign(
+        value=pd.to_numeric(df["value"], errors="coerce"),
+        extraction_datetime=pd.to_datetime(df["extraction_datetime"])
+    )
+    return df
+
+def empty_previous(spec):
+    """
+    Returns an empty previous snapshot with the column types 'compute_deltas' expects.
+
+    Args:
+        spec (dict): The dataset's entry in DELTA_SPECS.
+
+    Returns:
+        pandas.DataFrame: No rows, with the key columns, 'previous_value' and 'previous_datetime'.
+    """
+    columns = {key: pd.Series(dtype="object") for key in spec["keys"]}
+    columns["previous_value"] = pd.Series(dtype="float64")
+    columns["previous_datetime"] = pd.Series(dtype="datetime64[ns]")
+    return pd.DataFrame(columns)
+
+def previous_snapshot(dataset, spec, before):
+    """
+    Reads the latest stored value of every metric series from before a given time.
+
+    The last values saved by the previous export are used when they exist, since in change-only
+    mode an unchanged series may not appear in recent partitions. Otherwise only the two most
+    recent partitions up to 'before' are read: the extraction that just ran may already be
+    stored in today's partition, and the previous one is either earlier that day or in the
+    partition before it.
+
+    Args:
+        dataset (str): The source dataset name.
+        spec (dict): The dataset's entry in DELTA_SPECS.
+        before (datetime): Extraction datetime of the current snapshot.
+
+    Returns:
+        pandas.DataFrame: One row per series with 'previous_value' and 'previous_datetime'.
+    """
+    previous = load_last_values(dataset)
+    if previous is not None:
+        previous = previous[previous["extraction_datetime"] < before]
+    else:
+        today = before.strftime("%Y-%m-%d")
+        partitions = [value for value in list_partitions(dataset) if value <= today][-2:]
+        if not partitions:
+            return empty_previous(spec)
+
+        columns = spec.get("value_columns", [spec.get("value")]) + ["extraction_datetime"]
+        if "value_columns" not in spec:
+            columns = spec["keys"] + columns
+
+        previous = read_history(dataset, columns=columns, start=partitions[0], end=partitions[-1],
+                                filters=[("extraction_datetime", "<", pd.Timestamp(before).to_pydatetime())])
+    if previous.empty:
+        return empty_previous(spec)
+
+    previous = to_long(previous, spec)
+    previous = previous.sort_values("extraction_datetime").drop_duplicates(spec["keys"], keep="last")
+    return previous.rename(columns={"value": "previous_value", "extraction_datetime": "previous_datetime"})
+
+def compute_deltas(current, previous, spec):
+    """
+    Computes the change of every metric series between two snapshots.
+
+    Args:
+        current (pandas.DataFrame): The current snapshot in long format (see 'to_long').
+        previous (pandas.DataFrame): The previous snapshot from 'previous_snapshot'.
+        spec (dict): The dataset's entry in DELTA_SPECS.
+
+    Returns:
+        pandas.DataFrame: The key columns plus 'value', 'previous_value', 'delta', 'days_elapsed',
+        'delta_per_day' and 'extraction_datetime'.
+    """
+    df = current.merge(previous, on=spec["keys"], how="left")
+
+    if spec["monthly_reset"]:
+        new_month = df["previous_datetime"].dt.to_period("M") != df["extraction_datetime"].dt.to_period("M")
+        df.loc[new_month & df["previous_datetime"].notna(), "previous_value"] = 0
+
+    baseline = df["previous_value"].fillna(0) if spec["from_zero"] else df["previous_value"]
+    df["delta"] = df["value"] - baseline
+
+    elapsed = df["extraction_datetime"] - df["previous_datetime"]
+    df["days_elapsed"] = elapsed.dt.total_seconds() / 86400
+    df["delta_per_day"] = df["delta"] / df["days_elapsed"]
+
+    return df.drop(columns=["previous_datetime"])
+
+def snapshot_deltas(dataset, df):
+    """
+    Computes the day-over-day changes of a snapshot that is about to be exported.
+
+    Only the snapshot that was just extracted and the latest stored value of each series are
+    read, so the work per run grows with today's rows rather than with the history. The deltas
+    are written by export_snapshot (export_service.py) once the snapshot itself is stored, so an
+    export that fails leaves no deltas behind to be counted again on the next run.
+
+    Args:
+        dataset (str): The source dataset name, e.g., "daily_post_metrics".
+        df (pandas.DataFrame): The full snapshot that was just extracted, with 'extraction_datetime'.
+            Call this before the dataset's last values are saved, so they still hold the previous extraction.
+
+    Returns:
+        pandas.DataFrame: The delta rows for the dataset's delta table (DELTA_SPECS "output").
+    """
+    spec = DELTA_SPECS[dataset]
+    current = to_long(df, spec)
+    if current.empty:
+        return current
+
+    before = current["extraction_datetime"].min()
+    deltas = compute_deltas(current, previous_snapshot(dataset, spec, before), spec)
+    deltas["extraction_date"] = deltas["extraction_datetime"].dt.strftime("%Y-%m-%d")
+    return deltas
@@ -0,0 +1,314 @@
+import os
+import queue
+import threading
+import traceback
+import pandas as pd
+from graph_api import load_config
+from history_store import write_partition
+from schemas import to_legacy_layout
+from change_tracking import CHANGE_SPECS, detect_changes, save_last_values, last_values_path
+from derived_metrics import DELTA_SPECS, snapshot_deltas
+from file_locks import dataset_lock, atomic_publish
+
+# --- Export Service Settings ---
+EXPORT_QUEUE_SIZE = 8  # Snapshots waiting to be written before a submitting stage blocks
+DEFAULT_SINKS = ["csv", "xlsx", "history"]
+
+def export_sinks(config=None):
+    """
+    Returns the sinks every exported snapshot is written to.
+
+    Uses 'EXPORT_SINKS' from the configuration file if set (any of "csv", "xlsx", "history", "hyper"),
+    otherwise CSV, Excel and the history store; "hyper" is added when 'HYPER_EXPORT' is enabled.
+
+    Args:
+        config (dict, optional): The loaded configuration (default is None, load it).
+
+    Returns:
+        list: The sink names.
+    """
+    config = config or load_config()
+    sinks = list(config.get("EXPORT_SINKS", DEFAULT_SINKS))
+    if config.get("HYPER_EXPORT", False) and "hyper" not in sinks:
+        sinks.append("hyper")
+    return sinks
+
+# --- Sinks ---
+
+def write_csv(df, metrics_path, fsync=True):
+    """
+    Appends a DataFrame to a CSV file, writing the header only when the file is created.
+
+    The rows are appended in place, so an append costs only the new rows however long the file
+    is; callers hold the dataset's writer lock (see export_snapshot). If the append fails, the
+    file is cut back to its previous size, so it never keeps a partly written row.
+
+    Args:
+        df (pandas.DataFrame): The rows to write, in the legacy layout.
+        metrics_path (str): The base file path (without extension).
+        fsync (bool, optional): Flush the file to disk after appending (default is True).
+
+    Returns:
+        list: The path of the file written.
+    """
+    path = metrics_path + ".csv"
+    with open(path, "a", encoding="utf-8", newline="") as csv_file:
+        size = csv_file.tell()
+        try:
+            df.to_csv(csv_file, index=False, header=size == 0)  # Headers only for a new file
+            csv_file.flush()
+            if fsync:
+                os.fsync(csv_file.fileno())
+        except BaseException:
+            csv_file.truncate(size)
+            raise
+    return [path]
+
+def write_xlsx(df, metrics_path, sheet_name="Sheet 1", fsync=True):
+    """
+    Appends a DataFrame to a sheet of an Excel file, creating the file if it does not exist.
+
+    The workbook is updated in a copy that then replaces it. A warning is printed when the file is
+    open in Excel, since Excel would overwrite the new rows if the workbook is saved from there.
+
+    Args:
+        df (pandas.DataFrame): The rows to write, in the legacy layout.
+        metrics_path (str): The base file path (without extension).
+        sheet_name (str, optional): The name of the Excel sheet to append to (default is "Sheet 1").
+        fsync (bool, optional): Flush the file to disk before publishing it (default is True).
+
+    Returns:
+        list: The path of the file written.
+    """
+    path = metrics_path + ".xlsx"
+    directory, name = os.path.split(path)
+    if os.path.exists(os.path.join(directory, "~$" + name)):  # Excel's owner file for open workbooks
+        print(f"Warning: {name} is open in Excel, close it without saving to keep the new rows")
+
+    with atomic_publish(path, copy_existing=True, fsync=fsync) as tmp_path:
+        if os.path.exists(tmp_path):
+            with pd.ExcelWriter(tmp_path, mode="a", engine="openpyxl", if_sheet_exists="overlay") as writer:
+                df.to_excel(writer, sheet_name=sheet_name, index=False, header=False, startrow=writer.sheets[sheet_name].max_row)
+        else:
+            # If the file does not exist, create a new one
+            df.to_excel(tmp_path, sheet_name=sheet_name, index=False, engine="openpyxl")
+    return [path]
+
+def write_hyper(df, dataset):
+    """
+    Upserts a DataFrame into the dataset's Tableau Hyper extract.
+
+    Rows are matched on the dataset's change-tracking keys plus 'extraction_datetime', so
+    exporting the same snapshot again replaces its rows instead of duplicating them. Datasets
+    without change-tracking keys are appended to.
+
+    Args:
+        df (pandas.DataFrame): The rows to write, in the dataset's schema.
+        dataset (str): The dataset name.
+
+    Returns:
+        list: The path of the extract, or an empty list if nothing was written.
+    """
+    from hyper_export import export_hyper, hyper_path  # Only load the Hyper API when it is enabled
+    upsert_keys = CHANGE_SPECS[dataset]["keys"] + ["extraction_datetime"] if dataset in CHANGE_SPECS else None
+    return [hyper_path(dataset)] if export_hyper(df, dataset, upsert_keys=upsert_keys) else []
+
+def export_snapshot(df, metrics_path, sheet_name="Sheet 1", sinks=None, fsync=True):
+    """
+    Writes one snapshot of a dataset to every configured sink.
+
+    The dataset's writer lock is held for the whole export, so concurrent runs, stages or accounts
+    writing the same dataset take turns; the CSV file is appended to in place and the Excel file
+    is replaced atomically.
+
+    This function performs the following steps:
+        - Compares the DataFrame against the last exported values of the dataset and, if the dataset is listed
+          in 'CHANGE_ONLY_DATASETS' in the configuration file, keeps only the rows whose values changed.
+        - Appends the rows, in the original CSV/Excel layout, to the CSV file and to the Excel sheet.
+        - Appends the rows to the history store dataset named after the file (e.g., "daily_post_metrics"),
+          partitioned by extraction date, in the dataset's compact typed schema (see schemas.py).
+        - Upserts the rows into the dataset's Tableau Hyper extract.
+        - Saves the dataset's last values for the next comparison.
+        - For datasets in DELTA_SPECS, appends each series' change since the previous extraction to the
+          dataset's delta table (e.g., "post_metric_deltas"). The deltas are computed from the full snapshot
+          before the last values are replaced, and written only once the snapshot is stored, so a failed
+          export is never counted twice.
+
+    Args:
+        df (pandas.DataFrame): The snapshot to export.
+        metrics_path (str): The base file path (without extension) for saving the CSV and Excel files.
+        sheet_name (str, optional): The name of the Excel sheet to append to (default is "Sheet 1").
+        sinks (list, optional): The sinks to write to (default is 'export_sinks()').
+        fsync (bool, optional): Flush the CSV and Excel files to disk before publishing them (default is True).
+            ExportService passes False and fsyncs every file written once, when it is closed.
+
+    Returns:
+        list: The paths of the files written.
+    """
+    config = load_config()
+    sinks = export_sinks(config) if sinks is None else sinks
+    dataset = os.path.basename(metrics_path)
+    written = []
+
+    with dataset_lock(dataset):
+        deltas = snapshot_deltas(dataset, df) if dataset in DELTA_SPECS else None
+
+        # Change Detection
+        state = None
+        if dataset in CHANGE_SPECS:
+            changed, state = detect_changes(dataset, df)
+            if dataset in config.get('CHANGE_ONLY_DATASETS', []):
+                print(f"{dataset}: exporting {len(changed)} changed rows of {len(df)}")
+                df = changed
+
+        if "csv" in sinks or "xlsx" in sinks:
+            legacy_df = to_legacy_layout(df, dataset)
+            if "csv" in sinks:
+                written += write_csv(legacy_df, metrics_path, fsync)
+            if "xlsx" in sinks:
+                written += write_xlsx(legacy_df, metrics_path, sheet_name, fsync)
+
+        if "history" in sinks:
+            written += write_partition(df, dataset)
+        if "hyper" in sinks:
+            written += write_hyper(df, dataset)
+
+        if state is not None:
+            save_last_values(dataset, state)
+            written.append(last_values_path(dataset))
+
+        if deltas is not None:
+            written += write_partition(deltas, DELTA_SPECS[dataset]["output"])
+
+    return written
+
+def fsync_paths(paths):
+    """
+    Flushes files, and the directories they were created in, from the OS cache to disk.
+
+    Args:
+        paths (iterable): File paths; paths that no longer exist are skipped.
+
+    Returns:
+        None
+    """
+    directories = set()
+    for path in paths:
+        try:
+            with open(path, "rb") as written_file:
+                os.fsync(written_file.fileno())
+        except FileNotFoundError:
+            continue
+        directories.add(os.path.dirname(path))
+
+    # Persists the renames of atomically replaced files; directories cannot be opened on Windows
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+class ExportService:
+    """
+    Writes exported snapshots to their sinks on a background thread while the stages keep fetching.
+
+    Stages hand their DataFrames to 'submit', which returns as soon as the snapshot is queued, so
+    network-bound fetching and disk-bound serialization (CSV, openpyxl, Parquet, Hyper) overlap
+    instead of adding up. The queue is bounded: if the writer falls 'queue_size' snapshots behind,
+    'submit' blocks until it catches up. Snapshots are written in the order they were submitted,
+    by a single writer, and every file written is fsynced once when the service is closed.
+    Closing the service raises if any snapshot could not be written, so a run does not carry on
+    (e.g., into the rollups) as if its data were complete.
+
+    Args:
+        queue_size (int, optional): Maximum snapshots waiting to be written (default is 8).
+        sinks (list, optional): The sinks to write to (default is 'export_sinks()').
+
+    Example:
+        with ExportService() as exports:
+            exports.submit(df, daily_post_metrics_path, sheet_name="post_metrics")
+    """
+
+    def __init__(self, queue_size=EXPORT_QUEUE_SIZE, sinks=None):
+        self.sinks = sinks
+        self.failures = []  # (metrics path, error) of snapshots that could not be written
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._written = set()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="export-writer", daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # An error raised inside the block is not replaced by the export failures it may have caused
+        self.close(raise_on_error=exc_type is None)
+
+    def submit(self, df, metrics_path, sheet_name="Sheet 1"):
+        """
+        Queues a snapshot to be written to every sink.
+
+        The DataFrame must not be modified after it is submitted.
+
+        Args:
+            df (pandas.DataFrame): The snapshot to export.
+            metrics_path (str): The base file path (without extension) for saving the CSV and Excel files.
+            sheet_name (str, optional): The name of the Excel sheet to append to (default is "Sheet 1").
+
+        Returns:
+            None
+        """
+        if self._closed:
+            raise RuntimeError("The export service is closed")
+        self._queue.put((df, metrics_path, sheet_name))
+
+    def close(self, raise_on_error=True):
+        """
+        Waits for every queued snapshot to be written, then fsyncs the files written.
+
+        Args:
+            raise_on_error (bool, optional): Raise if a snapshot could not be written (default is True).
+
+        Returns:
+            list: (metrics path, error) of the snapshots that could not be written.
+
+        Raises:
+            RuntimeError: If 'raise_on_error' is True and a snapshot could not be written.
+        """
+        if self._closed:
+            return self.failures
+        self._closed = True
+
+        self._queue.put(None)
+        self._writer.join()
+        fsync_paths(sorted(self._written))
+
+        for metrics_path, error in self.failures:
+            print(f"Export of {os.path.basename(metrics_path)} failed: {error}")
+        if self.failures and raise_on_error:
+            datasets = ", ".join(os.path.basename(metrics_path) for metrics_path, _ in self.failures)
+            raise RuntimeError(f"Could not export {datasets}")
+        return self.failures
+
+    def _run(self):
+        """
+        Writes queued snapshots until the service is closed; a failing snapshot does not stop the others.
+        """
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            df, metrics_path, sheet_name = job
+            try:
+                self._written.update(export_snapshot(df, metrics_path, sheet_name, sinks=self.sinks, fsync=False))
+            except Exception as e:
+                traceback.print_exc()
+                self.failures.append((metrics_path, e))
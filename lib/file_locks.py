@@ -0,0 +1,164 @@
+import os
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+from graph_api import load_config
+
+# Advisory locks: fcntl on Linux/macOS, msvcrt on Windows
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# --- Lock Settings ---
+LOCK_TIMEOUT = 600  # Seconds to wait for another writer before giving up
+LOCK_POLL_INTERVAL = 0.1
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+_held = threading.local()  # Datasets whose lock the current thread holds
+
+def lock_dir():
+    """
+    Returns the directory that holds the lock files.
+
+    Uses 'LOCK_PATH' from the configuration file if set, otherwise a '.locks' folder inside
+    'CLEANED_DATA_PATH', so every run and account writing to the same files shares the locks.
+
+    Returns:
+        str: The lock directory.
+    """
+    config = load_config()
+    return config.get("LOCK_PATH", os.path.join(config["CLEANED_DATA_PATH"], ".locks"))
+
+def try_lock(lock_file):
+    """
+    Tries to take an exclusive lock on an open file without waiting.
+
+    Args:
+        lock_file (file): The lock file, opened for writing.
+
+    Returns:
+        bool: True if the lock was taken, False if another process holds it.
+    """
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def unlock(lock_file):
+    """
+    Releases a lock taken with 'try_lock'.
+
+    Args:
+        lock_file (file): The locked file.
+
+    Returns:
+        None
+    """
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def dataset_lock(dataset, timeout=LOCK_TIMEOUT):
+    """
+    Holds the single-writer lock of a dataset, across threads and processes.
+
+    Every writer of a dataset's CSV, Excel, history and Hyper files takes this lock first:
+    'write_partition' and 'replace_partition' take it for every history store write, and
+    'export_snapshot' holds it for a whole export. Two runs, two stages or two accounts sharing
+    a data folder therefore never interleave their writes. The lock is reentrant within a thread,
+    so a writer already holding it can call 'write_partition'. It is advisory: it only excludes
+    other writers that also take it.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        timeout (float, optional): Seconds to wait for the current writer (default is 600).
+
+    Raises:
+        TimeoutError: If the lock is still held by another writer after 'timeout' seconds.
+
+    Example:
+        with dataset_lock("daily_post_metrics"):
+            write_partition(df, "daily_post_metrics")
+    """
+    held = getattr(_held, "datasets", None)
+    if held is None:
+        held = _held.datasets = set()
+    if dataset in held:
+        yield  # Already held further up this thread's stack
+        return
+
+    # Threads of this process queue on a regular lock, processes on the lock file
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(dataset, threading.Lock())
+    if not thread_lock.acquire(timeout=timeout):
+        raise TimeoutError(f"Timed out waiting for the {dataset} writer lock")
+
+    try:
+        directory = lock_dir()
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{dataset}.lock"), "a+") as lock_file:
+            deadline = time.monotonic() + timeout
+            while not try_lock(lock_file):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for the {dataset} writer lock held by another process")
+                time.sleep(LOCK_POLL_INTERVAL)
+            held.add(dataset)
+            try:
+                yield
+            finally:
+                held.discard(dataset)
+                unlock(lock_file)
+    finally:
+        thread_lock.release()
+
+@contextmanager
+def atomic_publish(path, copy_existing=False, fsync=True):
+    """
+    Writes a file under a temporary name and renames it over 'path' once it is complete.
+
+    Readers (and Tableau) only ever see the previous or the new version of the file, never a
+    partly written one, and a failed write leaves the previous version untouched.
+
+    Args:
+        path (str): The file to publish.
+        copy_existing (bool, optional): Start the temporary file as a copy of the current file,
+            for appends (default is False).
+        fsync (bool, optional): Flush the file to disk before it replaces 'path' (default is True). Callers
+            that fsync every file they wrote in one pass at the end (see ExportService) pass False.
+
+    Yields:
+        str: The temporary path to write to, in the same directory as 'path'.
+
+    Example:
+        with atomic_publish("daily_post_metrics.csv", copy_existing=True) as tmp_path:
+            df.to_csv(tmp_path, mode="a", header=False, index=False)
+    """
+    # Dot-prefixed, and the extension is kept so writers that check it (openpyxl) accept the file
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".tmp-{os.getpid()}-{threading.get_ident()}-{name}")
+
+    if copy_existing and os.path.exists(path):
+        shutil.copyfile(path, tmp_path)
+
+    try:
+        yield tmp_path
+        if fsync:
+            with open(tmp_path, "rb") as tmp_file:
+                os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
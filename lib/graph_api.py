@@ -0,0 +1,784 @@
+import requests
+import json
+import os
+import datetime
+import threading
+
+# --- Hashtag Settings ---
+HASHTAG_IDS_FILE = "hashtag_ids.json"
+HASHTAG_MEDIA_FIELDS = "id,caption,media_type,permalink,timestamp,like_count,comments_count"
+_hashtag_ids_lock = threading.Lock()
+
+# --- Media Insight Settings ---
+# Metrics supported by each kind of media; requesting an unsupported metric fails the whole request
+# (stories have no "comments" metric, their replies are counted by "replies")
+FEED_METRICS = "comments,follows,likes,profile_activity,profile_visits,reach,saved,shares,total_interactions,views"
+REEL_METRICS = "comments,ig_reels_avg_watch_time,ig_reels_video_view_total_time,likes,reach,saved,shares,total_interactions,views"
+STORY_METRICS = "navigation,profile_activity,profile_visits,reach,replies,shares,total_interactions,views"
+MEDIA_PRODUCT_METRICS = {"FEED": FEED_METRICS, "REELS": REEL_METRICS, "STORY": STORY_METRICS}
+
+# Image sources requested with every post, so no extra call is needed per post for its image
+MEDIA_IMAGE_FIELDS = "media_type,media_product_type,media_url,thumbnail_url,children{media_type,media_url,thumbnail_url}"
+MEDIA_IDS_PER_REQUEST = 50  # Maximum object IDs the API accepts in one '?ids=' request
+STORY_FIELDS = "id,media_type,media_url,permalink,thumbnail_url,timestamp"
+
+# --- Load Configuration Securely ---
+def load_config():
+    """
+    Loads the configuration settings from the 'insights_config.json' file.
+
+    This function sets the working directory to the location of the script 
+    and then reads the JSON configuration file, returning its contents as a dictionary.
+
+    Returns:
+        dict: The parsed configuration data from 'insights_config.json'.
+
+    Raises:
+        FileNotFoundError: If 'insights_config.json' does not exist in the script's directory.
+        json.JSONDecodeError: If the JSON file is improperly formatted.
+    """
+    # Sets path to lib folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    with open("insights_config.json", "r") as config_file:
+        config = json.load(config_file)
+        return config
+
+# --- Instagram Graph API Setup and Request---
+
+def get_media_insights(post_id, type="IG image", breakdown=None):
+    """
+    Fetches insights data for a specific Instagram post via the Facebook Graph API.
+
+    This function retrieves insights (metrics) related to an Instagram post based on its type (feed, reel, or other) 
+    and optional breakdown criteria. The function sends a request to the Instagram Graph API to gather post insights 
+    such as likes, comments, reach, views, and more.
+
+    Args:
+        post_id (str): The unique identifier for the Instagram post.
+        type (str): The type of post, which can be "IG image", "IG carousel", "IG reel", or another type. Default is "IG image".
+        breakdown (str, optional): The breakdown parameter for more detailed insights (e.g., "age", "gender"). Default is None.
+
+    Returns:
+        response: response containing the requested post insights, or an error message.
+
+    Example:
+        response = get_media_insights("1234567890", type="reel", breakdown="age")
+        print(response)
+    
+    Reference:
+        Instagram Graph API documentation: https://developers.facebook.com/docs/instagram-platform/api-reference/instagram-user/insights
+    """
+
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/{post_id}/insights"
+    
+    if type == "IG image" or type == "IG carousel":
+        metrics = FEED_METRICS
+    elif type == "IG reel":
+        metrics = REEL_METRICS
+    else:
+        metrics = STORY_METRICS
+
+    if breakdown:
+        params = {
+            "metric": metrics,
+            "period": "day",
+            "breakdown": breakdown,
+            "access_token": config['ACCESS_TOKEN']
+        }
+    else:
+        params = {
+            "metric": metrics,
+            "period": "day",
+            "access_token": config['ACCESS_TOKEN']
+        }
+
+    response = requests.get(endpoint, params=params)
+        
+    return response
+
+def get_media_data(fields):
+    """
+    Retrieves media post data along with key engagement insights from the Instagram Graph API.
+
+    This function requests detailed media information (e.g., caption, media type, timestamp) and 
+    associated insights (e.g., impressions, reach, likes, comments, shares, follows, views) 
+    for an Instagram user.
+
+    Args:
+        fields (str): A comma-separated string of media fields to retrieve (e.g., "id,caption,media_url,timestamp").
+
+    Returns:
+        list: A list of dictionaries containing media post data and insights.
+
+    Notes:
+        - Requires a valid access token and Instagram account ID from the config.
+        - Uses version 22.0 of the Instagram Graph API.
+        - Supports pagination to retrieve all posts up to the API limit.
+    """
+
+    config = load_config()
+    ig_user_id = config ['ACCOUNT_ID']
+    endpoint = f"https://graph.facebook.com/v22.0/{ig_user_id}"
+    
+    params = {
+        "fields": f"media{{{fields},insights.metric(impressions,reach,likes,comments,shares,follows,views)}}",
+        "access_token": config['ACCESS_TOKEN'],
+         "limit": 1000
+    }
+         
+    all_posts = media_data_request(endpoint, params)
+        
+    return all_posts
+
+def get_profile_data(fields, bypass_cache=False):
+    """
+    Retrieves specified profile fields for an Instagram user using the Graph API.
+
+    Sends a request to the Instagram Graph API to fetch user profile data based on the
+    provided list of fields.
+
+    Args:
+        fields (str): A comma-separated string of fields to retrieve (e.g., "username,biography,followers_count").
+        bypass_cache (bool, optional): Fetch a fresh response instead of a cached one (default is False).
+
+    Returns:
+        dict: A JSON-like dictionary containing the requested profile information.
+
+    Notes:
+        - Requires a valid access token and Instagram account ID from the config.
+        - Uses version 22.0 of the Instagram Graph API.
+        - The 'limit' parameter is included but may be ignored depending on the requested fields.
+        - Responses are cached on disk for the "profile" TTL in response_cache.py.
+    """
+    # Imported here because response_cache builds on this module
+    from response_cache import cached_get, endpoint_ttl
+
+    config = load_config()
+    ig_user_id = config ['ACCOUNT_ID']
+    endpoint = f"https://graph.facebook.com/v22.0/{ig_user_id}"
+    
+    params = {
+        "fields": fields,
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 1000
+    }
+
+    data = cached_get(endpoint, params, ttl=endpoint_ttl("profile"), bypass=bypass_cache)
+        
+    return data
+
+def get_demographic_insights(bypass_cache=False):
+    """
+    Retrieves lifetime Instagram demographic insights for the current month using the Graph API.
+
+    This function queries the Instagram Graph API for lifetime metrics related to audience demographics,
+    including the age and gender breakdowns of engaged users, reached users, and followers.
+
+    Args:
+        bypass_cache (bool, optional): Fetch a fresh response instead of a cached one (default is False).
+
+    Returns:
+        dict: A JSON-like dictionary containing demographic insights for the current month.
+
+    Notes:
+        - Requires a valid access token and Instagram account ID from the config.
+        - Uses version 22.0 of the Instagram Graph API.
+        - Metrics returned include:
+            - engaged_audience_demographics
+            - reached_audience_demographics
+            - follower_demographics
+        - Responses are cached on disk for the "demographic_insights" TTL in response_cache.py.
+    """
+    # Imported here because response_cache builds on this module
+    from response_cache import cached_get, endpoint_ttl
+
+    config = load_config()
+    ig_user_id = config ['ACCOUNT_ID']
+    endpoint = f"https://graph.facebook.com/v22.0/{ig_user_id}/insights"
+    
+    # Lifetime Period
+    params = {
+        "metric": "engaged_audience_demographics,reached_audience_demographics,follower_demographics",
+        "period": "lifetime",
+        "metric_type": "total_value",
+        "timeframe": "this_month",
+        "breakdown": "age,gender",
+        "access_token": config['ACCESS_TOKEN']
+    }
+
+    lifetime_data = cached_get(endpoint, params, ttl=endpoint_ttl("demographic_insights"), bypass=bypass_cache)
+        
+    return lifetime_data
+
+def get_actions_insights():
+    """
+    Retrieves daily Instagram account action insights for the current month using the Graph API.
+
+    This function sends a request to the Instagram Graph API to obtain daily metrics such as reach,
+    website clicks, profile views, interactions, likes, comments, and more. The metrics are aggregated
+    for the current month using the "day" period and returned as JSON.
+
+    Returns:
+        dict: A JSON-like dictionary containing the requested insight metrics for the current month.
+
+    Notes:
+        - Requires a valid access token and Instagram account ID from the config file.
+        - Uses version 22.0 of the Instagram Graph API.
+        - Metrics returned include user engagement and account interaction indicators.
+    """
+
+    config = load_config()
+    ig_user_id = config ['ACCOUNT_ID']
+    endpoint = f"https://graph.facebook.com/v22.0/{ig_user_id}/insights"
+
+    # Day Period
+    params = {
+        "metric": "reach, website_clicks, profile_views, total_interactions, likes, comments, shares, saves, replies, views, follows_and_unfollows, profile_links_taps",
+        "period": "day",
+        "metric_type": "total_value",
+        "timeframe": "this_month",
+        "access_token": config['ACCESS_TOKEN']
+    }
+
+    response = requests.get(endpoint, params=params)
+    data = response.json()
+        
+    return data
+
+def business_discovery(username, bypass_cache=False):
+    """
+    Fetches business discovery data for a specific Instagram account using the Facebook Graph API.
+
+    This function retrieves the followers count and media count of a business Instagram account 
+    based on the provided username. The function sends a request to the Instagram Graph API to gather 
+    insights into the account's popularity and media engagement.
+
+    Args:
+        username (str): The Instagram username of the business account for which data is being retrieved.
+        bypass_cache (bool, optional): Fetch a fresh response instead of a cached one (default is False).
+
+    Returns:
+        dict: A JSON response containing the followers count, media count, or an error message.
+            Responses are cached on disk for the "business_discovery" TTL in response_cache.py.
+
+    Example:
+        response = business_discovery("bluebottle")
+        print(response)
+    
+    Reference:
+        Instagram Graph API documentation: https://developers.facebook.com/docs/instagram-platform/instagram-api-with-facebook-login/business-discovery
+    """
+    # Imported here because response_cache builds on this module
+    from response_cache import cached_get, endpoint_ttl
+    
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{config['ACCOUNT_ID']}"
+    
+    params = {
+        "fields": f"business_discovery.username({username}){{followers_count,media_count}}",
+        "access_token": config['ACCESS_TOKEN']
+    }
+    
+    return cached_get(endpoint, params, ttl=endpoint_ttl("business_discovery"), bypass=bypass_cache)
+
+def graph_batch_request(relative_urls, batch_size=50):
+    """
+    Sends many Graph API GET requests in as few HTTP calls as possible using the batch endpoint.
+
+    The Graph API accepts up to 50 requests per batch call. Each relative URL is executed
+    server-side and its response body is returned in the same order as the input.
+
+    Args:
+        relative_urls (list): Request paths relative to the API version, e.g., "<ig_user_id>?fields=...".
+        batch_size (int, optional): Requests per batch call, at most 50 (default is 50).
+
+    Returns:
+        list: The parsed JSON body of each request, or None for requests that failed.
+
+    Reference:
+        Graph API batch requests: https://developers.facebook.com/docs/graph-api/batch-requests
+    """
+    config = load_config()
+    endpoint = "https://graph.facebook.com/v22.0/"
+    results = []
+
+    for start in range(0, len(relative_urls), batch_size):
+        batch = [
+            {"method": "GET", "relative_url": relative_url}
+            for relative_url in relative_urls[start:start + batch_size]
+        ]
+        response = requests.post(endpoint, data={
+            "access_token": config['ACCESS_TOKEN'],
+            "batch": json.dumps(batch),
+            "include_headers": "false"
+        })
+
+        if response.status_code != 200:
+            print(response.status_code)
+            print("Response JSON:", response.json())
+            results.extend([None] * len(batch))
+            continue
+
+        for item in response.json():
+            if item and item.get("code") == 200:
+                results.append(json.loads(item["body"]))
+            else:
+                print("Batch item failed:", item.get("body") if item else None)
+                results.append(None)
+
+    return results
+
+def get_comments(media_id):
+    """
+    Retrieves comments for a specific Instagram media post using the Facebook Graph API.
+
+    This function fetches all comments for a given media post by sending a request to the 
+    Instagram Graph API. It returns the comments data including the text of the comments and 
+    related metadata.
+
+    Args:
+        media_id (str): The ID of the Instagram media post for which comments are being retrieved.
+
+    Returns:
+        dict: A JSON response containing the list of comments or an error message.
+
+    Example:
+        comments_data = get_comments("17895695668004550")
+        print(comments_data)
+    
+    Reference:
+        Instagram Graph API documentation: https://developers.facebook.com/docs/instagram-platform/instagram-api-with-facebook-login/business-discovery
+    """
+    
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/{media_id}/comments"
+
+    params = {
+        "access_token": config['ACCESS_TOKEN']
+    }
+    
+    response = requests.get(endpoint, params=params)
+    return response.json()
+
+def hashtag_ids_path():
+    """
+    Returns the path of the persistent hashtag name to ID cache.
+
+    Returns:
+        str: The path of "hashtag_ids.json" inside the raw data path.
+    """
+    config = load_config()
+    return os.path.join(config['RAW_DATA_PATH'], HASHTAG_IDS_FILE)
+
+def load_hashtag_ids():
+    """
+    Loads the cached hashtag IDs resolved on previous runs.
+
+    Returns:
+        dict: Lowercase hashtag name mapped to its Graph API hashtag ID.
+    """
+    try:
+        with open(hashtag_ids_path(), "r", encoding="utf-8") as ids_file:
+            return json.load(ids_file)
+    except FileNotFoundError:
+        return {}
+
+def get_hashtag_id(hashtag):
+    """
+    Resolves a hashtag name to its Graph API ID, using the persistent cache whenever possible.
+
+    The Graph API allows only 30 unique hashtag searches per account every 7 days, and a
+    hashtag's ID never changes, so each hashtag is searched at most once and its ID is kept
+    in "hashtag_ids.json".
+
+    Args:
+        hashtag (str): The hashtag name, with or without the leading '#'.
+
+    Returns:
+        str or None: The hashtag ID, or None if the search failed.
+
+    Reference:
+        Instagram Graph API documentation: https://developers.facebook.com/docs/instagram-platform/instagram-api-with-facebook-login/hashtag-search
+    """
+    name = hashtag.lstrip("#").lower()
+
+    with _hashtag_ids_lock:
+        hashtag_ids = load_hashtag_ids()
+        if name in hashtag_ids:
+            return hashtag_ids[name]
+
+        config = load_config()
+        endpoint = f"https://graph.facebook.com/ig_hashtag_search"
+
+        params = {
+            "user_id": config['ACCOUNT_ID'],
+            "q": name,
+            "access_token": config['ACCESS_TOKEN']
+        }
+
+        id_response = requests.get(endpoint, params=params)
+        id_dict = id_response.json()
+        if id_response.status_code != 200 or not id_dict.get('data'):
+            print(id_response.status_code)
+            print("Response JSON:", id_dict)
+            return None
+
+        hashtag_ids[name] = id_dict['data'][0]['id']
+        path = hashtag_ids_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as ids_file:
+            json.dump(hashtag_ids, ids_file, indent=2)
+        os.replace(path + ".tmp", path)
+
+        return hashtag_ids[name]
+
+def get_hashtags(hashtag, hashtag_id=None, search=False, edge="recent_media"):
+    """
+    Retrieves data related to a specific Instagram hashtag using the Facebook Graph API.
+
+    This function can either resolve a hashtag by name or fetch media related to a specific 
+    hashtag ID. Hashtag IDs are resolved through 'get_hashtag_id', so the weekly hashtag search
+    quota is only spent on hashtags that were never looked up before.
+
+    Args:
+        hashtag (str): The name of the hashtag to search for.
+        hashtag_id (str, optional): The ID of the hashtag if already known. If None, the ID is taken 
+                                    from the hashtag ID cache or searched for.
+        search (bool, optional): If True, fetches the first page of recent or top media for the given hashtag. 
+                                  Defaults to False.
+        edge (str, optional): The media edge to fetch when searching, "recent_media" or "top_media".
+                              Defaults to "recent_media".
+
+    Returns:
+        dict: A JSON response containing the hashtag data, including media associated with the 
+              hashtag or an error message.
+
+    Example:
+        hashtags_data = get_hashtags("bluebottle")
+        print(hashtags_data)
+
+    Reference:
+        Instagram Graph API documentation: https://developers.facebook.com/docs/instagram-platform/instagram-api-with-facebook-login/hashtag-search
+    """
+
+    config = load_config()
+
+    if hashtag_id is None:
+        hashtag_id = get_hashtag_id(hashtag)
+
+    if not search:
+        return {"data": [{"id": hashtag_id}]}
+
+    endpoint = f"https://graph.facebook.com/v22.0/{hashtag_id}/{edge}"
+    params = {
+        "user_id": config['ACCOUNT_ID'],
+        "fields": HASHTAG_MEDIA_FIELDS,
+        "access_token": config['ACCESS_TOKEN']
+    }
+
+    response = requests.get(endpoint, params=params)
+    return response.json()
+
+def media_data_request(endpoint, params):
+    """
+    Sends a request to the Instagram Graph API to retrieve media post data, handling pagination.
+
+    This function fetches media posts from a given API endpoint using the provided parameters,
+    appends the results to a list, and continues retrieving data through pagination links until
+    all available posts have been collected.
+
+    Args:
+        endpoint (str): The initial URL endpoint to send the GET request to.
+        params (dict): A dictionary of parameters to include in the initial request (e.g., access token, fields).
+
+    Returns:
+        list or None: A list of media post data dictionaries if successful, or None if the request fails.
+
+    Notes:
+        - Prints the status code and response if the initial request is unsuccessful.
+        - Supports pagination through the 'paging.next' field in the response.
+        - Designed for use with Instagram Graph API responses that nest media under a "media" field.
+    """
+    # Initialize list to store posts
+    all_posts = []
+
+    response = requests.get(endpoint, params=params)
+    data = response.json()
+
+    if response.status_code != 200:
+        print(response.status_code)
+        print("Response JSON:", response.json())  #
+        return None
+    else:
+        # Collect posts
+        all_posts.extend(data.get("media", {}).get("data", []))
+
+        # Handle pagination
+        i = 1
+        while "paging" in data and "next" in data["paging"] or "paging" in data.get("media", {}) and "next" in data["media"]["paging"]:
+            if i > 1:
+                next_url = data["paging"]["next"]
+            else:
+                next_url = data["media"]["paging"]["next"]
+            response = requests.get(next_url)
+            data = response.json()
+            all_posts.extend(data.get("data", []))
+            i += 1
+            
+        return all_posts
+
+def paged_request(endpoint, params=None, max_pages=None, raise_on_error=False):
+    """
+    Sends a request to a Graph API edge and follows 'paging.next' links until all pages are collected.
+
+    Args:
+        endpoint (str): The URL of the edge, e.g., "https://graph.facebook.com/v22.0/<media_id>/comments".
+        params (dict, optional): Parameters for the first request (access token, fields, limit).
+        max_pages (int, optional): Maximum number of pages to fetch (default is all pages).
+        raise_on_error (bool, optional): Raise if a page fails instead of returning the pages collected
+            so far, for callers that must not mistake partial data for complete data (default is False).
+
+    Returns:
+        list: The items of every page's "data" list, in the order returned by the API.
+
+    Raises:
+        RuntimeError: If 'raise_on_error' is True and a request is unsuccessful.
+
+    Notes:
+        - Prints the status code and response and stops paging if a request is unsuccessful.
+        - The 'next' links already carry the access token and parameters of the first request.
+    """
+    items = []
+    response = requests.get(endpoint, params=params)
+    pages = 1
+
+    while True:
+        data = response.json()
+        if response.status_code != 200:
+            print(response.status_code)
+            print("Response JSON:", data)
+            if raise_on_error:
+                raise RuntimeError(f"Request failed with status {response.status_code} after {pages - 1} pages")
+            break
+
+        items.extend(data.get("data", []))
+
+        next_url = data.get("paging", {}).get("next")
+        if not next_url or (max_pages and pages >= max_pages):
+            break
+        response = requests.get(next_url)
+        pages += 1
+
+    return items
+
+def get_media_list(fields="id,timestamp,comments_count", max_pages=None):
+    """
+    Retrieves lightweight fields for every media post of the Instagram user, without insights.
+
+    Args:
+        fields (str, optional): A comma-separated string of media fields (default is "id,timestamp,comments_count").
+        max_pages (int, optional): Maximum number of pages of 100 posts to fetch (default is all pages).
+
+    Returns:
+        list: A list of dictionaries, one per media post, newest first.
+    """
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{config['ACCOUNT_ID']}/media"
+
+    params = {
+        "fields": fields,
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 100
+    }
+
+    return paged_request(endpoint, params, max_pages=max_pages)
+
+def media_image_url(post):
+    """
+    Returns the image that represents a post, from fields requested with MEDIA_IMAGE_FIELDS.
+
+    Args:
+        post (dict): A media object with 'media_type', 'media_url', 'thumbnail_url' and 'children'.
+
+    Returns:
+        str or None: The image URL for single images, the first child's image for carousels,
+        and the thumbnail for videos.
+    """
+    if post.get("media_type") == "CAROUSEL_ALBUM":
+        children = post.get("children", {}).get("data", [])
+        post = children[0] if children else {}
+
+    if post.get("media_type") == "VIDEO":
+        return post.get("thumbnail_url")
+    return post.get("media_url")
+
+def ids_request(ids, fields, stats=None):
+    """
+    Reads the same fields of many objects with one '?ids=' request per MEDIA_IDS_PER_REQUEST objects.
+
+    If a request fails, its objects are split in halves and retried, so a single failing object
+    (e.g., an old post without insights) costs a few extra requests and does not lose the others.
+
+    Args:
+        ids (list): Object IDs.
+        fields (str): The fields to read, e.g., "insights.metric(reach,likes)".
+        stats (dict, optional): Its "requests" count is increased by every request sent, retries
+            included, for callers that budget their calls (default is None).
+
+    Returns:
+        dict: Object ID mapped to its JSON data; objects that failed are left out.
+    """
+    config = load_config()
+    endpoint = "https://graph.facebook.com/v22.0/"
+    results = {}
+
+    for start in range(0, len(ids), MEDIA_IDS_PER_REQUEST):
+        chunk = ids[start:start + MEDIA_IDS_PER_REQUEST]
+        response = requests.get(endpoint, params={
+            "ids": ",".join(chunk),
+            "fields": fields,
+            "access_token": config['ACCESS_TOKEN']
+        })
+        if stats is not None:
+            stats["requests"] = stats.get("requests", 0) + 1
+
+        if response.status_code == 200:
+            results.update(response.json())
+        elif len(chunk) > 1:
+            half = len(chunk) // 2
+            results.update(ids_request(chunk[:half], fields, stats))
+            results.update(ids_request(chunk[half:], fields, stats))
+        else:
+            print(response.status_code)
+            print("Response JSON:", response.json())
+
+    return results
+
+def get_media_with_insights(fields="caption,media_type,media_url,permalink,timestamp", max_age=None):
+    """
+    Retrieves every media post with its image URL and the insights that apply to its media type.
+
+    This function performs the following steps:
+        - Requests all posts from the paged media edge, including children and thumbnails (MEDIA_IMAGE_FIELDS).
+        - Groups the posts by media product type (feed, reels), since each supports different metrics,
+          leaving out posts older than 'max_age' when it is given.
+        - Requests the insights of up to MEDIA_IDS_PER_REQUEST posts per call with '?ids=', one metric set per group.
+        - Attaches the insights and the post's image URL ('image_url') to each post.
+
+    A full refresh takes one request per page of posts plus one per 50 posts of each media type,
+    instead of one or more requests per post.
+
+    Args:
+        fields (str, optional): A comma-separated string of media fields (default is "caption,media_type,media_url,permalink,timestamp").
+        max_age (float, optional): Only request the insights of posts published at most this many seconds ago;
+            older posts are returned with empty insights (default is None, every post).
+
+    Returns:
+        list: Posts in the same shape as 'get_media_data', each with 'insights' and 'image_url'.
+
+    Raises:
+        RuntimeError: If a page of the media edge fails, so a truncated post list is never
+            exported (and compared against the last values) as if it were complete.
+    """
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{config['ACCOUNT_ID']}/media"
+
+    params = {
+        "fields": f"id,{fields},{MEDIA_IMAGE_FIELDS}",
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 100
+    }
+    posts = paged_request(endpoint, params, raise_on_error=True)
+
+    if max_age is not None:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=max_age)
+
+    groups = {}
+    for post in posts:
+        if max_age is not None and post.get("timestamp") and \
+                datetime.datetime.strptime(post["timestamp"], "%Y-%m-%dT%H:%M:%S%z") < cutoff:
+            continue
+        metrics = MEDIA_PRODUCT_METRICS.get(post.get("media_product_type"), FEED_METRICS)
+        groups.setdefault(metrics, []).append(post["id"])
+
+    insights = {}
+    for metrics, ids in groups.items():
+        insights.update(ids_request(ids, f"insights.metric({metrics})"))
+
+    for post in posts:
+        post["insights"] = insights.get(post["id"], {}).get("insights", {"data": []})
+        post["image_url"] = media_image_url(post)
+
+    return posts
+
+def get_stories(fields=STORY_FIELDS):
+    """
+    Retrieves the stories of the Instagram user that are currently live.
+
+    Stories are only returned by the stories edge for the 24 hours they are visible, so the
+    edge has to be polled during that window to measure them.
+
+    Args:
+        fields (str, optional): A comma-separated string of story fields (default is STORY_FIELDS).
+
+    Returns:
+        list: A list of dictionaries, one per live story.
+    """
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{config['ACCOUNT_ID']}/stories"
+
+    params = {
+        "fields": fields,
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 100
+    }
+
+    return paged_request(endpoint, params)
+
+def first_image_url_request(media_id, media_type):
+    """
+    Retrieves the appropriate image URL for a given media object from the Instagram Graph API.
+
+    Depending on the media type, this function returns:
+        - The direct media URL for single images.
+        - The first image URL from a carousel album.
+        - The thumbnail URL for videos.
+
+    Args:
+        media_id (str): The ID of the media object to retrieve.
+        media_type (str): The type of media. Expected values are "IMAGE", "CAROUSEL_ALBUM", or "VIDEO".
+
+    Returns:
+        str or None: The URL of the media image or thumbnail. Returns None if the media type is unrecognized
+        or if the expected URL cannot be extracted.
+
+    Notes:
+        - Requires a valid access token in the loaded config.
+        - Uses version 19.0 of the Instagram Graph API.
+    """
+    config = load_config()
+    url = f"https://graph.facebook.com/v19.0/{media_id}"
+
+    if media_type == "IMAGE" or media_type == "CAROUSEL_ALBUM":
+        params = {
+            "fields": "id,media_type,media_url,children{media_url}",
+            "access_token": config['ACCESS_TOKEN']
+        }
+        
+        response = requests.get(url, params=params)
+        data = response.json()
+        
+        if media_type == "IMAGE":
+            return data.get("media_url")
+        else:
+            return data.get("children", {}).get("data", [{}])[0].get("media_url")
+    elif media_type == "VIDEO":
+        params = {
+            "fields": "id,media_type,media_url,thumbnail_url",
+            "access_token": config['ACCESS_TOKEN']
+        }
+        response = requests.get(url, params=params)
+        data = response.json()
+        return data.get("thumbnail_url")
+    return None
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from schemas import cast_column
+
+# --- Flattening Graph API Payloads ---
+# Responses are flattened into one list per column in a single pass over the payload, then
+# turned into a DataFrame once. No dictionary is built per output row, and fields of a parent
+# object (e.g., a post's caption) are stored once and repeated with numpy rather than copied.
+
+def get_path(obj, path, default=None):
+    """
+    Follows a path of keys and list indexes into a nested Graph API object.
+
+    Args:
+        obj (dict or list): The object to read from.
+        path (str or tuple): A single key, or a tuple of keys and indexes, e.g., ("values", 0, "value").
+        default (optional): Returned when any step of the path is missing (default is None).
+
+    Returns:
+        The value at the end of the path, or 'default'.
+    """
+    if not isinstance(path, tuple):
+        path = (path,)
+
+    for step in path:
+        try:
+            obj = obj[step]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return default if obj is None else obj
+
+def to_frame(columns, dtypes=None):
+    """
+    Builds a DataFrame from column lists and casts it to the given dtypes.
+
+    Args:
+        columns (dict): Column name mapped to a list or array of values.
+        dtypes (dict, optional): Column name mapped to a schema dtype (see schemas.SCHEMAS).
+
+    Returns:
+        pandas.DataFrame: The typed DataFrame.
+    """
+    df = pd.DataFrame(columns)
+    for column, dtype in (dtypes or {}).items():
+        if column in df.columns:
+            df[column] = cast_column(df[column], dtype)
+    return df
+
+def flatten_records(items, fields, dtypes=None):
+    """
+    Flattens a list of objects into one row per object.
+
+    Args:
+        items (list): Objects from a response's 'data' list.
+        fields (dict): Output column mapped to its path in each object (see get_path),
+            e.g., {"Value": ("total_value", "value")}.
+        dtypes (dict, optional): Column name mapped to a schema dtype.
+
+    Returns:
+        pandas.DataFrame: One row per object.
+    """
+    columns = {column: [get_path(item, path) for item in items] for column, path in fields.items()}
+    return to_frame(columns, dtypes)
+
+def flatten_children(items, parent_fields, children_path, child_fields, dtypes=None):
+    """
+    Flattens objects with a nested list (e.g., posts and their insights) into one row per child.
+
+    Parent fields are read once per parent and repeated for each of its children, so a post
+    with ten metrics does not have its caption copied into ten dictionaries.
+
+    Args:
+        items (list): Parent objects, e.g., posts from get_media_data.
+        parent_fields (dict): Output column mapped to its path in the parent, e.g., {"post_id": "id"}.
+        children_path (str or tuple): Path of the child list in the parent, e.g., ("insights", "data").
+        child_fields (dict): Output column mapped to its path in each child, e.g., {"value": ("values", 0, "value")}.
+        dtypes (dict, optional): Column name mapped to a schema dtype.
+
+    Returns:
+        pandas.DataFrame: One row per child; parents without children produce no rows.
+    """
+    parents = {column: [] for column in parent_fields}
+    children = {column: [] for column in child_fields}
+    counts = []
+
+    for item in items:
+        child_items = get_path(item, children_path, [])
+        counts.append(len(child_items))
+        for column, path in parent_fields.items():
+            parents[column].append(get_path(item, path, ""))
+        for column, path in child_fields.items():
+            children[column].extend(get_path(child, path) for child in child_items)
+
+    counts = np.asarray(counts, dtype=np.int64)
+    columns = {column: np.repeat(np.asarray(values, dtype=object), counts) for column, values in parents.items()}
+    columns.update(children)
+    return to_frame(columns, dtypes)
+
+def flatten_breakdowns(items, name_column="name", value_column="value", dtypes=None):
+    """
+    Flattens 'total_value.breakdowns' insights into one row per breakdown result.
+
+    Each breakdown's 'dimension_keys' (e.g., ["age", "gender"]) name the dimension columns,
+    so the same function handles any breakdown the API returns.
+
+    Args:
+        items (list): Insight objects from a response's 'data' list.
+        name_column (str, optional): Output column for the metric name (default is "name").
+        value_column (str, optional): Output column for the result value (default is "value").
+        dtypes (dict, optional): Column name mapped to a schema dtype.
+
+    Returns:
+        pandas.DataFrame: The metric name, one column per dimension key and the value.
+    """
+    columns = {name_column: []}
+    values = []
+
+    for item in items:
+        for breakdown in get_path(item, ("total_value", "breakdowns"), []):
+            keys = breakdown.get("dimension_keys", [])
+            results = breakdown.get("results", [])
+            row_count = len(values)
+
+            for key in keys:
+                # Dimensions first seen in a later breakdown are missing for earlier rows
+                columns.setdefault(key, [None] * row_count)
+            for column in columns:
+                if column != name_column and column not in keys:
+                    columns[column].extend([None] * len(results))
+
+            columns[name_column].extend([item.get("name")] * len(results))
+            for result in results:
+                dimension_values = result.get("dimension_values", [])
+                for index, key in enumerate(keys):
+                    columns[key].append(dimension_values[index] if index < len(dimension_values) else None)
+                values.append(result.get("value"))
+
+    columns[value_column] = values
+    return to_frame(columns, dtypes)
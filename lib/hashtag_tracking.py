@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from graph_api import load_config, paged_request, get_hashtag_id, HASHTAG_MEDIA_FIELDS
+
+# --- Hashtag Sweep Settings ---
+HASHTAG_EDGES = ("recent_media", "top_media")
+HASHTAG_MAX_PAGES = 3   # Pages (of up to 50 posts) fetched per hashtag and edge
+HASHTAG_WORKERS = 4     # Hashtag edges fetched concurrently
+
+def fetch_hashtag_media(hashtag, hashtag_id, edge, max_pages=HASHTAG_MAX_PAGES):
+    """
+    Retrieves the posts on one media edge of a hashtag, following pagination.
+
+    Args:
+        hashtag (str): The hashtag name.
+        hashtag_id (str): The hashtag's Graph API ID.
+        edge (str): "recent_media" or "top_media".
+        max_pages (int, optional): Maximum number of pages to fetch (default is HASHTAG_MAX_PAGES).
+
+    Returns:
+        list: One dictionary per post, tagged with the hashtag and edge.
+    """
+    config = load_config()
+    endpoint = f"https://graph.facebook.com/v22.0/{hashtag_id}/{edge}"
+
+    params = {
+        "user_id": config['ACCOUNT_ID'],
+        "fields": HASHTAG_MEDIA_FIELDS,
+        "access_token": config['ACCESS_TOKEN'],
+        "limit": 50
+    }
+
+    posts = paged_request(endpoint, params, max_pages=max_pages)
+    return [dict(post, hashtag=hashtag, edge=edge) for post in posts]
+
+def sweep_hashtags(hashtags, edges=HASHTAG_EDGES, max_pages=HASHTAG_MAX_PAGES, workers=HASHTAG_WORKERS):
+    """
+    Retrieves recent and top media for a list of tracked hashtags concurrently.
+
+    The function performs the following steps:
+        - Resolves each hashtag to its ID through the persistent hashtag ID cache, so known
+          hashtags never spend hashtag search quota.
+        - Fetches every (hashtag, edge) pair concurrently, following pagination up to 'max_pages'.
+        - Combines all posts into a single DataFrame.
+
+    Args:
+        hashtags (list): Hashtag names, with or without the leading '#'.
+        edges (tuple, optional): Media edges to fetch (default is ("recent_media", "top_media")).
+        max_pages (int, optional): Maximum number of pages per hashtag and edge (default is HASHTAG_MAX_PAGES).
+        workers (int, optional): Number of concurrent requests (default is HASHTAG_WORKERS).
+
+    Returns:
+        pandas.DataFrame: One row per post found, with 'hashtag' and 'edge' columns.
+    """
+    # Resolve IDs first, sequentially, so the cache file is only written from this thread
+    jobs = []
+    for hashtag in dict.fromkeys(tag.lstrip("#").lower() for tag in hashtags):
+        hashtag_id = get_hashtag_id(hashtag)
+        if hashtag_id is None:
+            print(f"Skipping hashtag {hashtag}: ID could not be resolved")
+            continue
+        jobs.extend((hashtag, hashtag_id, edge) for edge in edges)
+
+    records = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for posts in executor.map(lambda job: fetch_hashtag_media(*job, max_pages=max_pages), jobs):
+            records.extend(posts)
+
+    return pd.DataFrame(records).rename(columns={"id": "post_id"})
@@ -0,0 +1,297 @@
+import os
+import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as fs
+from graph_api import load_config
+from history_store import dataset_dir, snapshot_path, list_partitions, partition_value, partition_column, DEFAULT_PARTITION_COL
+from schemas import SCHEMAS, LEGACY_LAYOUTS, add_date_parts
+from change_tracking import CHANGE_SPECS
+from file_locks import atomic_publish
+
+# --- Query Settings ---
+FILTER_OPERATORS = {
+    "==": lambda field, value: field == value,
+    "!=": lambda field, value: field != value,
+    "<": lambda field, value: field < value,
+    "<=": lambda field, value: field <= value,
+    ">": lambda field, value: field > value,
+    ">=": lambda field, value: field >= value,
+    "in": lambda field, value: field.isin(list(value)),
+    "not in": lambda field, value: ~field.isin(list(value)),
+}
+
+# Schema dtypes as Arrow types; categoricals are dictionary-encoded strings
+ARROW_TYPES = {
+    "string": pa.string(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "Int64": pa.int64(),
+    "float32": pa.float32(),
+    "datetime64[ns]": pa.timestamp("ns"),
+}
+
+# Keep integer columns as nullable integers instead of floats when they contain missing values
+PANDAS_TYPES = {pa.int64(): pd.Int64Dtype()}
+
+# Datasets published as Arrow snapshots after each run, unless 'ARROW_SNAPSHOTS' is set
+DEFAULT_SNAPSHOT_DATASETS = list(LEGACY_LAYOUTS)
+
+# Partition columns holding 'YYYY-MM-DD' dates, which a snapshot window can be applied to
+DATE_PARTITION_COLS = (DEFAULT_PARTITION_COL, "period_start")
+
+def arrow_schema(dataset, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Returns the Arrow schema of a registered dataset, including its partition column.
+
+    Reading with this schema casts every part file to the same types, so older files
+    (e.g., backfilled from CSV) are read as the current schema.
+
+    Args:
+        dataset (str): The dataset name, a key of 'schemas.SCHEMAS'.
+        partition_col (str, optional): The partition column (default is "extraction_date").
+
+    Returns:
+        pyarrow.Schema: The dataset schema.
+    """
+    fields = [(column, ARROW_TYPES[dtype]) for column, dtype in SCHEMAS[dataset].items() if column != partition_col]
+    return pa.schema(fields + [(partition_col, pa.string())])
+
+def open_history(dataset, partition_col=DEFAULT_PARTITION_COL, snapshot=False):
+    """
+    Opens a history store dataset lazily as a partitioned Arrow dataset.
+
+    Nothing is read at this point; files are only opened when a query is executed,
+    and only the ones whose partition and column statistics can match the query.
+    Datasets registered in 'schemas.SCHEMAS' are read with their typed schema.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        partition_col (str, optional): The partition column (default is "extraction_date").
+        snapshot (bool, optional): Open the dataset's memory-mapped Arrow snapshot instead of its
+            Parquet partitions, if one was published (default is False).
+
+    Returns:
+        pyarrow.dataset.Dataset or None: The dataset, or None if nothing has been stored yet.
+    """
+    if snapshot and os.path.exists(snapshot_path(dataset)):
+        # Columns are read as views of the mapped file, shared through the OS page cache
+        return ds.dataset(snapshot_path(dataset), format="ipc", filesystem=fs.LocalFileSystem(use_mmap=True))
+
+    path = dataset_dir(dataset)
+    if not os.path.isdir(path):
+        return None
+
+    partitioning = ds.partitioning(pa.schema([(partition_col, pa.string())]), flavor="hive")
+    schema = arrow_schema(dataset, partition_col) if dataset in SCHEMAS else None
+    return ds.dataset(path, format="parquet", partitioning=partitioning, schema=schema)
+
+def build_filter(data, partition_col=DEFAULT_PARTITION_COL, start=None, end=None, post_ids=None, filters=None):
+    """
+    Builds an Arrow filter expression for a history query.
+
+    Date bounds are applied to the partition column, so partitions outside the range are
+    skipped without being opened. Post IDs and metric filters are pushed down into the
+    Parquet scan.
+
+    Args:
+        data (pyarrow.dataset.Dataset): The dataset being queried.
+        partition_col (str, optional): The partition column (default is "extraction_date").
+        start (str or date, optional): First partition to include, inclusive.
+        end (str or date, optional): Last partition to include, inclusive.
+        post_ids (iterable, optional): Post IDs to keep.
+        filters (list, optional): (column, operator, value) tuples, e.g., [("name", "==", "reach")].
+
+    Returns:
+        pyarrow.dataset.Expression or None: The combined filter, or None if there is nothing to filter.
+    """
+    expressions = []
+
+    if start is not None:
+        expressions.append(ds.field(partition_col) >= partition_value(start))
+    if end is not None:
+        expressions.append(ds.field(partition_col) <= partition_value(end))
+
+    if post_ids is not None:
+        # Match the stored type so the comparison can be pushed down
+        post_id_type = data.schema.field("post_id").type
+        values = pa.array([str(post_id) for post_id in post_ids]).cast(post_id_type)
+        expressions.append(ds.field("post_id").isin(values))
+
+    for column, operator, value in filters or []:
+        expressions.append(FILTER_OPERATORS[operator](ds.field(column), value))
+
+    if not expressions:
+        return None
+
+    combined = expressions[0]
+    for expression in expressions[1:]:
+        combined = combined & expression
+    return combined
+
+def read_history(dataset, columns=None, start=None, end=None, post_ids=None, filters=None, as_arrow=False, date_parts=False, partition_col=DEFAULT_PARTITION_COL, snapshot=False):
+    """
+    Reads a slice of a history store dataset, touching only the partitions and columns it needs.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        columns (list, optional): Columns to return (default is all columns).
+        start (str or date, optional): First extraction date to include, inclusive.
+        end (str or date, optional): Last extraction date to include, inclusive.
+        post_ids (iterable, optional): Post IDs to keep.
+        filters (list, optional): (column, operator, value) tuples, e.g., [("name", "==", "reach"), ("value", ">", 100)].
+            Supported operators are ==, !=, <, <=, >, >=, in and not in.
+        as_arrow (bool, optional): Return a pyarrow.Table instead of a DataFrame (default is False).
+        date_parts (bool, optional): Derive the '<prefix>_date', '_year', '_month', '_day' and '_time' columns
+            from 'extraction_datetime' and 'publish_datetime' when returned (default is False).
+        partition_col (str, optional): The partition column (default is "extraction_date").
+        snapshot (bool, optional): Read the dataset's Arrow snapshot, as of the last published run, instead of
+            its Parquet partitions (default is False). With 'as_arrow' and no filters, the columns are not copied.
+
+    Returns:
+        pandas.DataFrame or pyarrow.Table: The matching rows.
+
+    Example:
+        reach = read_history("daily_post_metrics", columns=["post_id", "value", "extraction_date"],
+                             start="2025-04-01", filters=[("name", "==", "reach")])
+    """
+    data = open_history(dataset, partition_col, snapshot)
+    if data is None:
+        table = pa.table({column: pa.array([], pa.null()) for column in columns or []})
+        return table if as_arrow else table.to_pandas()
+
+    expression = build_filter(data, partition_col, start, end, post_ids, filters)
+    table = data.to_table(columns=columns, filter=expression)
+    if as_arrow:
+        return table
+
+    df = table.to_pandas(types_mapper=PANDAS_TYPES.get)
+    if date_parts:
+        for column, prefix in (("extraction_datetime", "extraction"), ("publish_datetime", "publish")):
+            if column in df.columns:
+                df = add_date_parts(df, column, prefix)
+    return df
+
+def latest_partition(dataset, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Returns the most recent partition value of a dataset.
+
+    Args:
+        dataset (str): The dataset name.
+        partition_col (str, optional): The partition column (default is "extraction_date").
+
+    Returns:
+        str or None: The latest partition value, or None if the dataset is empty.
+    """
+    partitions = list_partitions(dataset, partition_col)
+    return partitions[-1] if partitions else None
+
+def read_as_of(dataset, as_of, columns=None, post_ids=None, filters=None, keys=None, partition_col=DEFAULT_PARTITION_COL, snapshot=False):
+    """
+    Reconstructs a dataset's snapshot as it stood at the end of a given date.
+
+    Works for both full and change-only exports: every series is taken from its most recent
+    stored row up to 'as_of', so a value that did not change for weeks is still returned. Only
+    partitions up to 'as_of' and the requested columns are read.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        as_of (str or date): The last extraction date to include, inclusive.
+        columns (list, optional): Columns to return (default is all columns). Key columns and
+            'extraction_datetime' are always included.
+        post_ids (iterable, optional): Post IDs to keep.
+        filters (list, optional): (column, operator, value) tuples on key columns, e.g., [("name", "==", "reach")].
+            Filters on values would hide later changes, so apply them to the result instead.
+        keys (list, optional): Columns identifying one series (default is the dataset's keys in
+            'change_tracking.CHANGE_SPECS').
+        partition_col (str, optional): The partition column (default is "extraction_date").
+        snapshot (bool, optional): Read the dataset's Arrow snapshot instead of its Parquet partitions (default is False).
+
+    Returns:
+        pandas.DataFrame: One row per series with its latest value as of 'as_of'.
+
+    Example:
+        snapshot = read_as_of("daily_post_metrics", "2025-04-30", filters=[("name", "==", "reach")])
+    """
+    keys = keys or CHANGE_SPECS[dataset]["keys"]
+    if columns is not None:
+        columns = list(dict.fromkeys(keys + columns + ["extraction_datetime"]))
+
+    df = read_history(dataset, columns=columns, end=as_of, post_ids=post_ids, filters=filters, partition_col=partition_col, snapshot=snapshot)
+    if df.empty:
+        return df
+
+    latest = df.sort_values("extraction_datetime", kind="stable").drop_duplicates(keys, keep="last")
+    return latest.reset_index(drop=True)
+
+# --- Arrow Snapshots ---
+
+def publish_snapshot(dataset, partition_col=None, days=None):
+    """
+    Writes a dataset's history as one Arrow IPC (Feather v2) file for memory-mapped reads.
+
+    The file is uncompressed and its categorical columns share one dictionary, so readers can
+    map it and use its columns without decoding or copying them. It replaces the previous
+    snapshot atomically; readers that already mapped the old file keep reading it.
+
+    Every call reads and rewrites the whole history (or the last 'days' of it), so its cost grows
+    with the dataset. A windowed snapshot only holds series that were written within the window;
+    'read_as_of' on the snapshot of a change-only dataset then misses series unchanged since.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        partition_col (str, optional): The partition column, stored as a regular column (default is the
+            column the dataset is partitioned by on disk, e.g., "period_start" for rollups).
+        days (int, optional): Only include the partitions of the last 'days' days, for datasets partitioned
+            by date (default is None, the whole history).
+
+    Returns:
+        str or None: The snapshot path, or None if the dataset is empty.
+    """
+    partition_col = partition_col or partition_column(dataset)
+    data = open_history(dataset, partition_col)
+    if data is None:
+        return None
+
+    start = None
+    if days and partition_col in DATE_PARTITION_COLS:
+        start = datetime.date.today() - datetime.timedelta(days=days)
+
+    # The IPC file format allows a single dictionary per column
+    table = data.to_table(filter=build_filter(data, partition_col, start=start)).unify_dictionaries().combine_chunks()
+
+    path = snapshot_path(dataset)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_publish(path) as tmp_path:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return path
+
+def publish_snapshots(datasets=None):
+    """
+    Publishes the Arrow snapshots of several datasets.
+
+    Args:
+        datasets (list, optional): The dataset names (default is 'ARROW_SNAPSHOTS' from the configuration
+            file, or the four daily datasets).
+
+    Returns:
+        list: The snapshot paths written.
+    """
+    config = load_config()
+    if datasets is None:
+        datasets = config.get("ARROW_SNAPSHOTS", DEFAULT_SNAPSHOT_DATASETS)
+    days = config.get("ARROW_SNAPSHOT_DAYS")
+
+    paths = []
+    for dataset in datasets:
+        try:
+            path = publish_snapshot(dataset, days=days)
+        except OSError as e:
+            # Windows does not replace a file that a reader still has mapped
+            print(f"Could not publish the {dataset} snapshot: {e}")
+            continue
+        if path:
+            paths.append(path)
+    return paths
@@ -0,0 +1,236 @@
+import os
+import uuid
+import datetime
+import pandas as pd
+from graph_api import load_config
+from schemas import SCHEMAS, enforce_schema
+from file_locks import dataset_lock
+
+# --- History Store Layout ---
+# <HISTORY_PATH>/<dataset>/<partition_col>=<value>/part-<timestamp>-<id>.parquet
+# The partition column is encoded in the directory name only (Hive layout), so the
+# files can be read directly or as one partitioned dataset.
+DEFAULT_PARTITION_COL = "extraction_date"
+
+# <HISTORY_PATH>/_snapshots/<dataset>.arrow holds a whole dataset as one uncompressed
+# Arrow IPC (Feather v2) file that readers can memory-map (see history_query.publish_snapshot).
+SNAPSHOTS_DIR = "_snapshots"
+
+def history_root():
+    """
+    Returns the root directory of the partitioned history store.
+
+    Uses 'HISTORY_PATH' from the configuration file if set, otherwise a 'history'
+    folder inside 'CLEANED_DATA_PATH'.
+
+    Returns:
+        str: The history store root directory.
+    """
+    config = load_config()
+    return config.get("HISTORY_PATH", os.path.join(config["CLEANED_DATA_PATH"], "history"))
+
+def dataset_dir(dataset):
+    """
+    Returns the directory that holds all partitions of a dataset.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+
+    Returns:
+        str: The dataset directory.
+    """
+    return os.path.join(history_root(), dataset)
+
+def snapshot_path(dataset):
+    """
+    Returns the path of a dataset's Arrow IPC snapshot.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+
+    Returns:
+        str: The snapshot file path.
+    """
+    return os.path.join(history_root(), SNAPSHOTS_DIR, f"{dataset}.arrow")
+
+def partition_value(value):
+    """
+    Formats a partition key as it appears in a partition directory name.
+
+    Args:
+        value: A date, datetime, or any value with a meaningful string form.
+
+    Returns:
+        str: 'YYYY-MM-DD' for dates and datetimes, otherwise str(value).
+    """
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+def write_partition(df, dataset, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Appends a DataFrame to the history store, one Parquet file per partition value.
+
+    Each write adds new part files and never rewrites existing ones, so appends cost only the
+    size of the new rows. Files are written under a temporary name and renamed into place so
+    readers never see a half-written part, while the dataset's writer lock is held. Datasets registered in 'schemas.SCHEMAS' are cast
+    to their schema first, so every part file of a dataset has the same compact column types.
+
+    Args:
+        df (pandas.DataFrame): The rows to store. Must contain 'partition_col', or 'extraction_datetime'
+            when partitioning by extraction date.
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+        partition_col (str, optional): The column to partition by (default is "extraction_date").
+
+    Returns:
+        list: The paths of the part files written.
+    """
+    if df.empty:
+        return []
+
+    if partition_col not in df.columns and partition_col == DEFAULT_PARTITION_COL:
+        df = df.assign(**{partition_col: pd.to_datetime(df["extraction_datetime"]).dt.strftime("%Y-%m-%d")})
+
+    written = []
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    keys = df[partition_col].map(partition_value).to_numpy()
+
+    rows_df = enforce_schema(df, dataset) if dataset in SCHEMAS else df.reset_index(drop=True)
+    rows_df = rows_df.drop(columns=[partition_col], errors="ignore")
+
+    with dataset_lock(dataset):
+        for key, rows in rows_df.groupby(keys, sort=False):
+            directory = os.path.join(dataset_dir(dataset), f"{partition_col}={key}")
+            os.makedirs(directory, exist_ok=True)
+
+            name = f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+            path = os.path.join(directory, name)
+            tmp_path = os.path.join(directory, f".{name}.tmp")  # Dot-prefixed files are skipped by dataset readers
+            rows.reset_index(drop=True).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            written.append(path)
+
+    return written
+
+def replace_partition(df, dataset, value, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Replaces every row of one partition with the given DataFrame.
+
+    The new part file is written before the old ones are removed, so the partition is never
+    missing; used for tables that are recomputed rather than appended to, such as rollups. The
+    dataset's writer lock is held meanwhile, so two writers never keep both of their new parts.
+
+    Args:
+        df (pandas.DataFrame): The new rows of the partition (without 'partition_col').
+        dataset (str): The dataset name.
+        value: The partition value to replace.
+        partition_col (str, optional): The partition column (default is "extraction_date").
+
+    Returns:
+        list: The paths of the part files written.
+    """
+    directory = os.path.join(dataset_dir(dataset), f"{partition_col}={partition_value(value)}")
+
+    with dataset_lock(dataset):
+        old_parts = [name for name in os.listdir(directory) if name.endswith(".parquet")] if os.path.isdir(directory) else []
+
+        written = write_partition(df.assign(**{partition_col: partition_value(value)}), dataset, partition_col)
+
+        for name in old_parts:
+            os.remove(os.path.join(directory, name))
+    return written
+
+def list_partitions(dataset, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Lists the partition values stored for a dataset.
+
+    Args:
+        dataset (str): The dataset name.
+        partition_col (str, optional): The partition column (default is "extraction_date").
+
+    Returns:
+        list: The partition values (as strings), sorted ascending.
+    """
+    directory = dataset_dir(dataset)
+    if not os.path.isdir(directory):
+        return []
+
+    prefix = f"{partition_col}="
+    return sorted(name[len(prefix):] for name in os.listdir(directory) if name.startswith(prefix))
+
+def partition_column(dataset):
+    """
+    Returns the column a dataset is partitioned by, read from its partition directory names.
+
+    Args:
+        dataset (str): The dataset name, e.g., "post_rollups_weekly".
+
+    Returns:
+        str: The partition column, or "extraction_date" if the dataset has no partitions yet.
+    """
+    directory = dataset_dir(dataset)
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if "=" in name and not name.startswith((".", "_")):
+                return name.split("=", 1)[0]
+    return DEFAULT_PARTITION_COL
+
+def read_partitions(dataset, values=None, partition_col=DEFAULT_PARTITION_COL, columns=None):
+    """
+    Reads selected partitions of a dataset into one DataFrame.
+
+    Args:
+        dataset (str): The dataset name.
+        values (list, optional): Partition values to read (default is all partitions).
+        partition_col (str, optional): The partition column (default is "extraction_date").
+        columns (list, optional): Columns to read from the files (default is all columns).
+
+    Returns:
+        pandas.DataFrame: The rows of the selected partitions, with 'partition_col' restored as a column.
+    """
+    if values is None:
+        values = list_partitions(dataset, partition_col)
+
+    frames = []
+    for value in values:
+        directory = os.path.join(dataset_dir(dataset), f"{partition_col}={partition_value(value)}")
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".parquet"):
+                frame = pd.read_parquet(os.path.join(directory, name), columns=columns)
+                frame[partition_col] = partition_value(value)
+                frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=(columns or []) + [partition_col])
+    return pd.concat(frames, ignore_index=True)
+
+def backfill_from_csv(dataset, csv_path=None, partition_col=DEFAULT_PARTITION_COL):
+    """
+    Loads a legacy CSV export (e.g., "daily_post_metrics.csv") into the history store.
+
+    Runs only when the dataset has no partitions yet, so it is safe to call repeatedly.
+
+    Args:
+        dataset (str): The dataset name, matching the CSV file name without extension.
+        csv_path (str, optional): The CSV file to load (default is '<CLEANED_DATA_PATH><dataset>.csv').
+        partition_col (str, optional): The partition column (default is "extraction_date").
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    if list_partitions(dataset, partition_col):
+        print(f"{dataset} already has history, skipping backfill")
+        return 0
+
+    if csv_path is None:
+        config = load_config()
+        csv_path = config["CLEANED_DATA_PATH"] + dataset + ".csv"
+
+    df = pd.read_csv(csv_path)
+    if "extraction_datetime" in df.columns:
+        df["extraction_datetime"] = pd.to_datetime(df["extraction_datetime"])
+    write_partition(df, dataset, partition_col)
+    print(f"Backfilled {len(df)} rows into {dataset}")
+    return len(df)
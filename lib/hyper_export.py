@@ -0,0 +1,156 @@
+import os
+import pandas as pd
+from graph_api import load_config
+from schemas import SCHEMAS, enforce_schema
+
+# The Hyper API is optional; it is only needed when 'HYPER_EXPORT' is enabled
+try:
+    from tableauhyperapi import (HyperProcess, Telemetry, Connection, CreateMode, TableDefinition, TableName,
+                                 SqlType, Inserter, Nullability, Persistence, escape_name)
+except ImportError:
+    HyperProcess = None
+
+# --- Hyper Extract Layout ---
+# <HYPER_PATH>/<dataset>.hyper with a single "Extract"."Extract" table, the table name
+# Tableau uses for extracts, so the files can be opened directly as a data source.
+HYPER_SCHEMA = "Extract"
+HYPER_TABLE = TableName(HYPER_SCHEMA, "Extract") if HyperProcess else None
+
+def hyper_available():
+    """
+    Returns whether the Tableau Hyper API ('tableauhyperapi') is installed.
+
+    Returns:
+        bool: True if Hyper extracts can be written.
+    """
+    return HyperProcess is not None
+
+def hyper_path(dataset):
+    """
+    Returns the path of a dataset's Hyper extract.
+
+    Uses 'HYPER_PATH' from the configuration file if set, otherwise a 'hyper' folder
+    inside 'CLEANED_DATA_PATH'.
+
+    Args:
+        dataset (str): The dataset name, e.g., "daily_post_metrics".
+
+    Returns:
+        str: The .hyper file path.
+    """
+    config = load_config()
+    directory = config.get("HYPER_PATH", os.path.join(config["CLEANED_DATA_PATH"], "hyper"))
+    return os.path.join(directory, f"{dataset}.hyper")
+
+def sql_type(dtype):
+    """
+    Maps a schema dtype (see schemas.SCHEMAS) to a Hyper column type.
+
+    Args:
+        dtype (str): The schema dtype.
+
+    Returns:
+        tableauhyperapi.SqlType: The Hyper column type.
+    """
+    if dtype == "Int64":
+        return SqlType.big_int()
+    if dtype == "datetime64[ns]":
+        return SqlType.timestamp()
+    return SqlType.text()  # "string" and "category"
+
+def table_definition(dataset, table_name=None, persistence=None):
+    """
+    Builds the Hyper table definition of a dataset from its schema.
+
+    Args:
+        dataset (str): The dataset name, a key of SCHEMAS.
+        table_name (tableauhyperapi.TableName, optional): The table name (default is "Extract"."Extract").
+        persistence (tableauhyperapi.Persistence, optional): Table persistence (default is permanent).
+
+    Returns:
+        tableauhyperapi.TableDefinition: The typed table definition.
+    """
+    columns = [TableDefinition.Column(column, sql_type(dtype), Nullability.NULLABLE)
+               for column, dtype in SCHEMAS[dataset].items()]
+    return TableDefinition(table_name or HYPER_TABLE, columns, persistence=persistence or Persistence.PERMANENT)
+
+def hyper_rows(df):
+    """
+    Converts a typed DataFrame into rows of plain Python values for the Hyper inserter.
+
+    Args:
+        df (pandas.DataFrame): Rows in the dataset's schema.
+
+    Returns:
+        list: One list of values per row, with missing values as None.
+    """
+    columns = []
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = [None if pd.isna(value) else value.to_pydatetime() for value in series]
+        elif pd.api.types.is_integer_dtype(series):
+            values = [None if pd.isna(value) else int(value) for value in series]
+        else:
+            values = [None if pd.isna(value) else str(value) for value in series]
+        columns.append(values)
+    return [list(row) for row in zip(*columns)]
+
+def export_hyper(df, dataset, upsert_keys=None):
+    """
+    Appends or upserts a DataFrame into a dataset's Hyper extract.
+
+    This function performs the following steps:
+        - Casts the DataFrame to the dataset's schema so the extract has typed columns.
+        - Creates the .hyper file and its "Extract"."Extract" table if they do not exist yet.
+        - Without 'upsert_keys', inserts the rows at the end of the table.
+        - With 'upsert_keys', loads the rows into a temporary table, deletes the rows of the extract
+          with the same keys and inserts the new ones, all in one transaction.
+
+    Only the new rows are written, so an export takes the same time however long the history is.
+
+    Args:
+        df (pandas.DataFrame): The rows to export.
+        dataset (str): The dataset name, a key of SCHEMAS.
+        upsert_keys (list, optional): Columns identifying a row to replace (default is None, append only).
+
+    Returns:
+        int: The number of rows written, or 0 if the Hyper API is not installed.
+    """
+    if not hyper_available():
+        print("tableauhyperapi is not installed, skipping Hyper export")
+        return 0
+    if df.empty:
+        return 0
+
+    df = enforce_schema(df, dataset)
+    path = hyper_path(dataset)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with HyperProcess(telemetry=Telemetry.DO_NOT_SEND_USAGE_DATA_TO_TABLEAU) as hyper:
+        with Connection(hyper.endpoint, path, CreateMode.CREATE_IF_NOT_EXISTS) as connection:
+            connection.catalog.create_schema_if_not_exists(HYPER_SCHEMA)
+            connection.catalog.create_table_if_not_exists(table_definition(dataset))
+
+            if not upsert_keys:
+                with Inserter(connection, HYPER_TABLE) as inserter:
+                    inserter.add_rows(hyper_rows(df))
+                    inserter.execute()
+                return len(df)
+
+            staging = TableName("staging")
+            connection.catalog.create_table(table_definition(dataset, staging, Persistence.TEMPORARY))
+            with Inserter(connection, staging) as inserter:
+                inserter.add_rows(hyper_rows(df))
+                inserter.execute()
+
+            matches = " AND ".join(f"target.{escape_name(key)} IS NOT DISTINCT FROM staging.{escape_name(key)}"
+                                   for key in upsert_keys)
+            connection.execute_command("BEGIN TRANSACTION")
+            connection.execute_command(
+                f"DELETE FROM {HYPER_TABLE} AS target WHERE EXISTS (SELECT 1 FROM {staging} WHERE {matches})"
+            )
+            connection.execute_command(f"INSERT INTO {HYPER_TABLE} SELECT * FROM {staging}")
+            connection.execute_command("COMMIT")
+
+    return len(df)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import requests
+from graph_api import load_config, get_media_list, media_image_url, MEDIA_IMAGE_FIELDS
+
+# --- Post Images ---
+
+def get_images(posts=None):
+    """
+    Retrieves and stores the most recent Instagram post images for Tableau visualization.
+
+    This function performs the following steps:
+    1. Uses the image URLs of the given posts, or lists all posts with their image fields in one
+       paged request (children and thumbnails included), so no request is made per post.
+    2. Picks each post's image: the media URL for images, the first child's image for carousels,
+       and the thumbnail for videos.
+    3. Downloads the images locally and moves them to the configured Tableau shapes directory.
+
+    The images are intended for use in Tableau dashboards (e.g., as custom shapes),
+    and this function ensures that only the most up-to-date post visuals are included.
+
+    Args:
+        posts (list, optional): Posts from 'get_media_with_insights', which already carry 'image_url'
+            (default is None, list the posts).
+
+    Returns:
+        None
+    """
+    
+    # Imported on first use so importing this module stays cheap
+    import pandas as pd
+
+    if posts is None:
+        posts = get_media_list(f"id,{MEDIA_IMAGE_FIELDS}")
+
+    data = {
+        "post_id": [post["id"] for post in posts],
+        "image_url": [post.get("image_url") or media_image_url(post) for post in posts]
+    }
+    df = pd.DataFrame(data).drop_duplicates("post_id")
+
+    download_images(df)
+    move_images_to_tableau()
+
+    return None
+
+def download_images(df):
+    """
+    Downloads images from URLs in a DataFrame and saves them to a local directory.
+
+    This function reads image URLs and corresponding post IDs from the provided DataFrame,
+    deletes any existing 'images' directory in the raw data path (as specified in the config),
+    creates a new one, and downloads each image as a JPEG using the post ID as the filename.
+
+    Args:
+        df (pandas.DataFrame): A DataFrame containing at least two columns:
+            - 'post_id': Unique identifier for each image (used as the filename).
+            - 'image_url': Direct URL to the image.
+
+    Notes:
+        - Skips any row with an invalid or missing image URL.
+        - Prints progress and error messages during the download process.
+    """
+    config = load_config()
+    images_dir = os.path.join(config["RAW_DATA_PATH"], "images")
+
+    # If the directory exists, remove it (faster than deleting contents one by one)
+    if os.path.exists(images_dir):
+        shutil.rmtree(images_dir)
+    os.makedirs(images_dir)
+    
+    # Download images
+    for index, row in df.iterrows():
+        post_id = row["post_id"]
+        image_url = row["image_url"]
+
+        # Skip if image_url is missing or invalid
+        if not isinstance(image_url, str) or not image_url.startswith("http"):
+            print(f"Skipping post {post_id} due to missing or invalid URL: {image_url}")
+            continue
+
+        # Define the image file path
+        image_path = os.path.join(images_dir, f"{post_id}.jpg")
+
+        # Download the image
+        try:
+            response = requests.get(image_url)
+
+            if response.status_code == 200:  # Ensure request was successful
+                with open(image_path, 'wb') as f:
+                    f.write(response.content)
+                print(f"Downloaded image for post {post_id}")
+            else:
+                print(f"Failed to download image for post {post_id}: {response.status_code}")
+
+        except Exception as e:
+            print(f"Error downloading image for post {post_id}: {e}")
+
+def move_images_to_tableau():
+    """
+    Copies image files from a raw data directory to the Tableau shapes folder.
+
+    This function loads configuration settings, locates the source directory containing images,
+    and copies it to the specified destination used by Tableau for custom shapes. If the destination
+    folder already exists, it will be removed before copying the new files.
+
+    Raises:
+        Prints an error message if the copy operation fails.
+    """
+    config = load_config()
+    # Move images to the Tableau repo shapes folder
+    source_dir = os.path.join(config["RAW_DATA_PATH"], "images")
+
+    destination_dir = config["SHAPES_PATH"] + "images/"  # Update with the correct path to the Tableau repo shapes folder
+
+    if os.path.exists(destination_dir):
+        shutil.rmtree(destination_dir)
+
+    try:
+        shutil.copytree(source_dir, destination_dir)
+        print(f"Successfully copied the '{source_dir}' folder to '{destination_dir}'")
+        
+    except Exception as e:
+        print(f"Error copying the folder: {e}")
@@ -0,0 +1,1154 @@
+import requests
+import time
+import random
+import os
+import pickle
+import re
+import queue
+import threading
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from graph_api import load_config
+
+# --- Page Readiness Settings ---
+PAGE_READY_TIMEOUT = 10  # Seconds to wait for the DOM to become usable after navigation
+PAGE_LOAD_TIMEOUT = 30   # Seconds before a hung navigation raises instead of blocking a scrape job
+PAGE_DEADLINE = 10       # Overall seconds a single page scrape may spend waiting for its elements
+LOGIN_TIMEOUT = 120      # Seconds allowed for a manual login, including 2FA
+POLL_FREQUENCY = 0.1     # Seconds between readiness checks
+ELEMENT_GRACE = 1.0      # Seconds optional elements may still take to appear once the post has rendered
+
+# --- Lean Browser Profile Settings ---
+# Scrapers only need DOM text and hrefs, so heavy resources are blocked at the network layer
+BLOCKED_URL_PATTERNS = [
+    "*.mp4*", "*.m4s*", "*.webm*",                   # Video and media segments
+    "*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.heic*",  # Images
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*",       # Fonts
+    "*facebook.com/tr*", "*/logging_client_events*", "*/ajax/bz*",  # Tracking
+]
+
+# --- Post Link Harvesting Settings ---
+HARVEST_IDLE_TIMEOUT = 3.0  # Seconds without new links after a scroll before the feed is considered exhausted
+HARVEST_SETTLE_TIME = 0.3   # Seconds without DOM changes after new links arrive before they are returned
+HARVEST_EMPTY_SCROLLS = 3   # Consecutive scrolls without new links or page growth before the feed is considered exhausted
+POST_SHORTCODE_PATTERN = re.compile(r"/(?:p|reel)/([^/?#]+)")
+
+# Installed once per page. Collects post/reel hrefs as Instagram appends them to the grid so
+# each scroll step only has to drain the new ones in a single round trip.
+HARVEST_OBSERVER_JS = """
+if (!window.__igsHarvest) {
+    var selector = 'a[href*="/p/"], a[href*="/reel/"]';
+    var state = {seen: new Set(), fresh: [], lastChange: Date.now()};
+    var collect = function (root) {
+        var anchors = root.matches && root.matches(selector) ? [root] : [];
+        if (root.querySelectorAll) {
+            anchors = anchors.concat(Array.prototype.slice.call(root.querySelectorAll(selector)));
+        }
+        anchors.forEach(function (a) {
+            if (!state.seen.has(a.href)) {
+                state.seen.add(a.href);
+                state.fresh.push(a.href);
+                state.lastChange = Date.now();
+            }
+        });
+    };
+    collect(document);
+    state.observer = new MutationObserver(function (mutations) {
+        mutations.forEach(function (mutation) {
+            if (mutation.type === 'attributes') {
+                collect(mutation.target);  // Placeholder anchors that get their href later
+            }
+            mutation.addedNodes.forEach(function (node) {
+                if (node.nodeType === 1) { collect(node); }
+            });
+        });
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+    window.__igsHarvest = state;
+}
+"""
+
+# Scrolls, then resolves once the observer has new links that have settled, or once the idle
+# timeout passes with nothing new. Returns the new links and whether the page grew (a slow
+# load still in progress); the caller decides when the feed has ended.
+HARVEST_SCROLL_JS = """
+var distance = arguments[0], idleMs = arguments[1], settleMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var state = window.__igsHarvest;
+var start = Date.now();
+var startHeight = document.documentElement.scrollHeight;
+window.scrollBy(0, distance);
+var check = function () {
+    var now = Date.now();
+    var settled = state.fresh.length > 0 && now - state.lastChange >= settleMs;
+    if (settled || now - start >= idleMs) {
+        var links = state.fresh;
+        state.fresh = [];
+        done({links: links, grew: document.documentElement.scrollHeight > startHeight});
+    } else {
+        setTimeout(check, 100);
+    }
+};
+check();
+"""
+
+# --- Lightweight Fetch Settings ---
+FETCH_TIMEOUT = 10          # Seconds allowed for a browserless page request
+FETCH_CHUNK_SIZE = 16384    # Bytes read at a time while streaming a page's <head>
+FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+COUNT_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+LIKES_XPATH = "//a[contains(@href, 'liked_by')]/span/span"
+HASHTAGS_XPATH = "//a[contains(text(), '#')]"
+POST_READY_XPATH = "//main//time[@datetime]"  # The post's date, rendered with the post itself
+
+# --- Instagram Login ---
+def intizalize_ig_login():
+    """
+    Logs into Instagram using credentials from the configuration file and saves session cookies.
+
+    This function:
+    - Loads login credentials from the configuration file.
+    - Opens Instagram in a Chrome browser using Selenium.
+    - Enters the username and password to log in.
+    - Waits until Instagram issues a session cookie, which also covers two-factor authentication (2FA) completion.
+    - Saves session cookies to a file for future use.
+
+    Returns:
+        None
+
+    Raises:
+        KeyError: If the required credentials ('INSTAGRAM_USERNAME' or 'INSTAGRAM_PASSWORD') are missing from the config.
+        WebDriverException: If the Chrome WebDriver fails to launch.
+        NoSuchElementException: If the login fields cannot be found on the page.
+        Exception: Catches and prints any other unexpected errors.
+    """
+    config = load_config()
+    driver = webdriver.Chrome()
+    driver.get("https://www.instagram.com")
+
+    try:
+        # Wait and find login fields
+        username_input = WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.NAME, "username"))
+        )
+        password_input = driver.find_element(By.NAME, "password")
+
+        # Enter credentials
+        username_input.send_keys(config['INSTAGRAM_USERNAME'])
+        password_input.send_keys(config['INSTAGRAM_PASSWORD'])
+        password_input.send_keys(Keys.RETURN)
+        
+        # Wait for 2FA to complete
+        WebDriverWait(driver, LOGIN_TIMEOUT).until(
+            lambda d: d.get_cookie("sessionid") is not None
+        )
+
+        # Save session cookies
+        pickle.dump(driver.get_cookies(), open("instagram_cookies.pkl", "wb"))
+        print("Cookies saved!")
+    
+    except Exception as e:
+        print(f"Login failed: {e}")
+
+def load_ig_cookies(driver):
+    """
+    Loads previously saved Instagram session cookies into an open WebDriver session.
+
+    This function:
+    - Opens Instagram so the cookies can be set on the right domain.
+    - Skips the cookie file if the browser profile already holds an Instagram session.
+    - Loads the saved cookies from "instagram_cookies.pkl" in the lib folder.
+    - Adds the cookies to the browser session and refreshes the page to apply them.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance to authenticate.
+
+    Returns:
+        WebDriver: The same WebDriver instance, now carrying the Instagram session cookies.
+
+    Raises:
+        FileNotFoundError: If the cookies file ("instagram_cookies.pkl") is missing.
+    """
+    driver.get("https://www.instagram.com")
+
+    # Wait for Instagram to fully load
+    wait_for_page_ready(driver)
+
+    # A persistent Chrome profile may already hold a valid session
+    if driver.get_cookie("sessionid") is not None:
+        return driver
+
+    # Load saved cookies
+    # Sets path to lib folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    with open("instagram_cookies.pkl", "rb") as cookies_file:
+        cookies = pickle.load(cookies_file)
+    for cookie in cookies:
+        driver.add_cookie(cookie)
+
+    driver.refresh()  # Reload page with cookies
+    return driver
+
+def ig_login(driver=None):
+    """
+    Logs into Instagram using previously saved session cookies.
+
+    This function:
+    - Opens a headless Chrome browser using Selenium, unless an existing driver is provided.
+    - Loads the previously saved cookies into the browser session with 'load_ig_cookies'.
+
+    Args:
+        driver (WebDriver, optional): An existing Selenium WebDriver instance to log in with (default is None).
+
+    Returns:
+        WebDriver: The Selenium WebDriver instance with an authenticated Instagram session.
+
+    Raises:
+        FileNotFoundError: If the cookies file ("instagram_cookies.pkl") is missing.
+        WebDriverException: If the Chrome WebDriver fails to launch.
+    """
+    if driver is None:
+        driver = connect_chrome_driver()
+
+    load_ig_cookies(driver)
+    print("Logged in successfully!")
+    return driver
+
+# --- Driver Connections ---
+def build_chrome_options(lean=True, profile_dir=None):
+    """
+    Builds the Chrome options used by the scrapers.
+
+    The browser always runs in Chrome's real headless mode ("--headless=new"; the old
+    'options.headless' attribute is ignored by Selenium 4). With 'lean' enabled the profile is
+    tuned for scraping DOM text and hrefs:
+    - Images are disabled through content-setting preferences and Blink settings.
+    - GPU, extensions, audio and notifications are disabled.
+    - The page-load strategy is "eager", so navigation returns once the DOM is parsed instead of
+      waiting for every subresource.
+
+    Args:
+        lean (bool, optional): Whether to apply the lightweight scraping profile (default is True).
+        profile_dir (str, optional): A Chrome user-data directory to persist cookies between runs (default is None).
+
+    Returns:
+        Options: The configured Selenium Chrome options.
+    """
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,2000")
+
+    if lean:
+        options.page_load_strategy = "eager"
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+
+    return options
+
+def block_heavy_resources(driver, patterns=None):
+    """
+    Blocks video, image, font and tracking requests in a Chrome session via the DevTools protocol.
+
+    Args:
+        driver (WebDriver): The Selenium Chrome WebDriver instance.
+        patterns (list, optional): URL patterns to block (default is BLOCKED_URL_PATTERNS).
+
+    Returns:
+        WebDriver: The same WebDriver instance.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Could not enable request blocking: {e}")
+    return driver
+
+def connect_chrome_driver(login=False, lean=True, profile_dir=None):
+    """
+    Establishes a connection to a Chrome WebDriver, with an option for Instagram login.
+
+    This function:
+    - Initializes a headless Chrome browser instance by fetching the necessary driver path from the configuration file.
+    - If 'lean' is set to True, uses the lightweight scraping profile from 'build_chrome_options' and blocks heavy resources.
+    - Persists cookies in a Chrome user-data directory ('profile_dir', or 'CHROME_PROFILE_PATH' from the configuration file if set).
+    - If 'login' is set to True, logs the browser into Instagram using the 'ig_login' function so the session is authenticated.
+
+    Args:
+        login (bool): Optional flag to indicate whether to log in to Instagram. Default is False.
+        lean (bool): Optional flag to use the lightweight, resource-blocking scraping profile. Default is True.
+        profile_dir (str, optional): Chrome user-data directory for this browser. Default is None.
+
+    Returns:
+        WebDriver: A Selenium WebDriver instance, either with an authenticated Instagram session or a headless browser session.
+
+    Raises:
+        FileNotFoundError: If the specified ChromeDriver path in the configuration file is incorrect or missing.
+        WebDriverException: If the Chrome WebDriver fails to launch or load with the given options.
+        Exception: Catches and prints any other unexpected errors.
+    """
+    # Fetches the full Instagram post HTML
+    config = load_config()
+    if profile_dir is None:
+        profile_dir = config.get('CHROME_PROFILE_PATH')
+
+    options = build_chrome_options(lean=lean, profile_dir=profile_dir)
+    service = Service(config['CHROMEDRIVER_PATH'])  # Update with your chromedriver path
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+    if lean:
+        block_heavy_resources(driver)
+
+    # IG Login
+    if login:
+        driver = ig_login(driver)
+
+    return driver
+
+def disconnect_chrome_driver(driver):
+    """
+    Terminates the Chrome WebDriver session and closes the browser.
+
+    This function gracefully shuts down the WebDriver by quitting the session, 
+    which closes the browser and releases associated resources.
+
+    Args:
+        driver (WebDriver): The active Selenium WebDriver instance to be closed.
+
+    Returns:
+        None: The function terminates the WebDriver session, returning None.
+
+    Raises:
+        WebDriverException: If there is an issue with closing the WebDriver or browser.
+    """
+    driver.quit() # Close the driver
+    return None
+
+class ChromeDriverPool:
+    """
+    Keeps a fixed set of headless Chrome WebDriver sessions warm and leases them to scrape jobs.
+
+    Starting Chrome costs one to three seconds, so the pool starts 'size' browsers once (optionally
+    with the saved Instagram cookies already loaded) and hands them out through 'lease()'. A browser
+    is health-checked before every lease and is quit and replaced when it stops responding or after
+    it has served 'max_pages' leases, which keeps long scraping runs from degrading as Chrome
+    accumulates memory.
+
+    Args:
+        size (int, optional): Number of browsers to keep open (default is 2).
+        login (bool, optional): Whether to load the saved Instagram cookies into each browser (default is True).
+        max_pages (int, optional): Number of leases after which a browser is recycled (default is 50).
+
+    Example:
+        with ChromeDriverPool(size=3) as pool:
+            for url in urls:
+                print(scrape_ig_post(url, pool=pool))
+    """
+
+    def __init__(self, size=2, login=True, max_pages=50):
+        self.size = size
+        self.login = login
+        self.max_pages = max_pages
+        self._idle = queue.Queue()
+        self._page_counts = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        try:
+            for slot in range(size):
+                self._idle.put(self._start_driver(slot))
+        except BaseException:
+            # The caller never gets the pool, so quit the browsers that did start
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_driver(self, slot):
+        # Chrome locks its user-data directory, so every slot gets its own persistent profile
+        config = load_config()
+        profile_dir = None
+        if config.get('CHROME_PROFILE_PATH'):
+            profile_dir = os.path.join(config['CHROME_PROFILE_PATH'], f"pool_{slot}")
+
+        driver = connect_chrome_driver(login=self.login, profile_dir=profile_dir)
+        with self._lock:
+            self._page_counts[driver] = 0
+            self._slots[driver] = slot
+        return driver
+
+    def _retire_driver(self, driver):
+        with self._lock:
+            self._page_counts.pop(driver, None)
+            slot = self._slots.pop(driver, None)
+        try:
+            disconnect_chrome_driver(driver)
+        except Exception as e:
+            print(f"Error closing driver: {e}")
+        return slot
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Leases a healthy browser from the pool for the duration of a 'with' block.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free browser before raising queue.Empty (default waits forever).
+
+        Yields:
+            WebDriver: A Selenium WebDriver instance reserved for the caller.
+        """
+        if self._closed:
+            raise RuntimeError("ChromeDriverPool is closed")
+
+        driver = self._idle.get(timeout=timeout)
+        if isinstance(driver, int) or not self._is_healthy(driver):
+            slot = driver if isinstance(driver, int) else self._retire_driver(driver)
+            try:
+                driver = self._start_driver(slot)
+            except Exception:
+                self._idle.put(slot)  # Keep the slot; the next lease tries to start it again
+                raise
+
+        try:
+            yield driver
+        finally:
+            with self._lock:
+                self._page_counts[driver] = self._page_counts.get(driver, 0) + 1
+                worn_out = self._page_counts[driver] >= self.max_pages
+
+            if self._closed:
+                self._retire_driver(driver)
+            else:
+                if worn_out or not self._is_healthy(driver):
+                    driver = self._restart_slot(self._retire_driver(driver))
+                self._idle.put(driver)
+
+    def _restart_slot(self, slot):
+        # Returns a new browser for the slot, or the slot number as a placeholder that the next
+        # lease restarts, so a failed start neither shrinks the pool nor masks the caller's error
+        try:
+            return self._start_driver(slot)
+        except Exception as e:
+            print(f"Error restarting driver {slot}, retrying on next lease: {e}")
+            return slot
+
+    def close(self):
+        """
+        Quits every idle browser in the pool. Browsers still leased are quit when they are returned.
+        """
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(driver, int):  # Slots waiting for a restart have no browser
+                self._retire_driver(driver)
+
+@contextmanager
+def lease_driver(connected_driver=None, pool=None, login=False):
+    """
+    Provides a WebDriver for a single scrape job from a pool, an existing driver, or a new browser.
+
+    Resolution order:
+    - If a 'pool' is given, a browser is leased from it and returned to it afterwards.
+    - If a 'connected_driver' is given, it is used as-is and left open for the caller to close.
+    - Otherwise a new browser is started with 'connect_chrome_driver' and closed when the job ends.
+
+    Args:
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease from (default is None).
+        login (bool, optional): Whether a newly started browser should log in to Instagram (default is False).
+
+    Yields:
+        WebDriver: The Selenium WebDriver instance to scrape with.
+    """
+    if pool is not None:
+        with pool.lease() as driver:
+            yield driver
+    elif connected_driver is not None:
+        yield connected_driver
+    else:
+        driver = connect_chrome_driver(login=login)
+        try:
+            yield driver
+        finally:
+            disconnect_chrome_driver(driver)
+
+# --- Scraping Post Data ---
+
+## --- Helpers --
+
+def wait_for_page_ready(driver, timeout=PAGE_READY_TIMEOUT):
+    """
+    Waits until the current page's DOM is usable instead of sleeping for a fixed time.
+
+    The wait returns as soon as 'document.readyState' reports "interactive" or "complete", so
+    fast pages are handed back immediately and slow pages get up to 'timeout' seconds.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance that is controlling the browser.
+        timeout (float, optional): Maximum number of seconds to wait (default is PAGE_READY_TIMEOUT).
+
+    Returns:
+        bool: True if the page became ready, False if the timeout was reached first.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+        )
+        return True
+    except Exception as e:
+        print(f"Page not ready after {timeout}s: {e}")
+        return False
+
+def wait_for_elements(driver, xpaths, deadline=PAGE_DEADLINE, ready_xpath=None, grace=ELEMENT_GRACE):
+    """
+    Waits for several elements on a page at once, sharing a single overall deadline.
+
+    All pending XPaths are checked together in one JavaScript round trip per poll, so a page
+    with several dynamic elements costs one combined wait instead of one full wait per element.
+    The wait ends as soon as every XPath matches, or when the deadline passes, in which case
+    whatever was found so far is returned.
+
+    Some elements are optional (a post with hidden likes or no hashtags never shows them). With
+    'ready_xpath', once that element has rendered the others get only 'grace' more seconds, and
+    those still missing are treated as absent instead of being waited out until the deadline.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance that is controlling the browser.
+        xpaths (dict): A mapping of element name to XPath, e.g., {'likes': LIKES_XPATH}.
+        deadline (float, optional): Maximum number of seconds to wait for all elements (default is PAGE_DEADLINE).
+        ready_xpath (str, optional): XPath of an element that shows the page has rendered, e.g.,
+            POST_READY_XPATH (default is None, wait for every element until the deadline).
+        grace (float, optional): Seconds to keep waiting once 'ready_xpath' matches (default is ELEMENT_GRACE).
+
+    Returns:
+        dict: A mapping of element name to the list of matching WebElements, for every XPath that was found.
+
+    Example:
+        found = wait_for_elements(driver, {'likes': LIKES_XPATH, 'hashtags': HASHTAGS_XPATH})
+        print(found.keys())
+    """
+    script = """
+        return arguments[0].map(function (xpath) {
+            return document.evaluate(xpath, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+        });
+    """
+    names = list(xpaths)
+    present = set()
+    end = time.monotonic() + deadline
+    rendered = ready_xpath is None
+
+    while True:
+        pending = [name for name in names if name not in present]
+        checks = [xpaths[name] for name in pending] + ([] if rendered else [ready_xpath])
+        try:
+            matches = driver.execute_script(script, checks)
+        except Exception as e:
+            print(f"Error: {e}")
+            matches = [False] * len(checks)
+
+        present.update(name for name, match in zip(pending, matches) if match)
+        if not rendered and matches[-1]:
+            rendered = True
+            end = min(end, time.monotonic() + grace)
+        if len(present) == len(names) or time.monotonic() >= end:
+            break
+        time.sleep(POLL_FREQUENCY)
+
+    return {name: driver.find_elements(By.XPATH, xpaths[name]) for name in names if name in present}
+
+def check_likes(driver, found=None, deadline=PAGE_DEADLINE):
+    """
+    Retrieves the number of likes on an Instagram post by dynamically loading the 'liked by' element.
+
+    Instagram posts load likes dynamically, so this function waits for the appropriate element to 
+    appear, extracts the like count from the element, and returns the value. If the element is not 
+    found or an error occurs, it returns 'Not Found'.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance that is controlling the browser.
+        found (dict, optional): Elements already located by 'wait_for_elements'. If given, no extra wait is made.
+        deadline (float, optional): Maximum number of seconds to wait when 'found' is not given (default is PAGE_DEADLINE).
+
+    Returns:
+        str: The number of likes on the post or "Not Found" if the like count cannot be retrieved.
+
+    Example:
+        like_count = check_likes(driver)
+        print(like_count)
+
+    Reference:
+        This function relies on the dynamic loading of Instagram elements via Selenium and XPath.
+    """
+    ## Instagram loads likes dynamically, this is required to gather like count
+    # Wait for the likes element to load
+    if found is None:
+        found = wait_for_elements(driver, {"likes": LIKES_XPATH}, deadline)
+
+    try:
+        likes_element = found["likes"][0]
+        likes_text = likes_element.get_attribute("innerHTML").strip()
+    except Exception as e:
+        print(f"Error: likes not found ({e!r})")
+        likes_text = "Not Found"
+    return likes_text
+
+def check_hashtags(driver, found=None, deadline=PAGE_DEADLINE):
+    """
+    Retrieves all hashtags mentioned in the caption of an Instagram post or reel.
+
+    This function waits for the hashtag elements to load dynamically on the page and then extracts the text 
+    of all hashtags. If no hashtags are found or an error occurs, it returns 'Not Found'.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance that is controlling the browser.
+        found (dict, optional): Elements already located by 'wait_for_elements'. If given, no extra wait is made.
+        deadline (float, optional): Maximum number of seconds to wait when 'found' is not given (default is PAGE_DEADLINE).
+
+    Returns:
+        list: A list containing the text of all hashtags in the caption of the Instagram post or reel, or 
+              "Not Found" if no hashtags are found or an error occurs.
+
+    Example:
+        hashtags = check_hashtags(driver)
+        print(hashtags)
+
+    Reference:
+        This function relies on the dynamic loading of Instagram hashtag elements via Selenium and XPath.
+    """
+    # Wait for the caption element to load
+    if found is None:
+        found = wait_for_elements(driver, {"hashtags": HASHTAGS_XPATH}, deadline)
+
+    try:
+        hashtags_text = [element.text for element in found["hashtags"]]
+    except Exception as e:
+        print(f"Error: hashtags not found ({e!r})")
+        hashtags_text = "Not Found"
+    return hashtags_text
+
+def get_data(driver, url, timeout=PAGE_READY_TIMEOUT):
+    """
+    Navigates to a specified URL and retrieves data from it using the provided Selenium WebDriver.
+
+    This function loads the provided URL in the browser and waits only until the page's DOM is
+    ready (see 'wait_for_page_ready'), then returns the driver instance. Elements that Instagram
+    renders later should be awaited with 'wait_for_elements'.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance that is controlling the browser.
+        url (str): The URL of the page from which data should be retrieved.
+        timeout (float, optional): Maximum number of seconds to wait for the page (default is PAGE_READY_TIMEOUT).
+
+    Returns:
+        WebDriver: The Selenium WebDriver instance with the loaded page.
+
+    Example:
+        driver = get_data(driver, "https://example.com")
+        print(driver.page_source)
+    """
+    # Get url data
+    driver.get(url)
+    wait_for_page_ready(driver, timeout)
+    return driver
+
+## --- Lightweight Page Fetch ---
+
+_ig_session = None
+_ig_session_lock = threading.Lock()
+
+class HeadMetaParser(HTMLParser):
+    """
+    Streaming HTML parser that collects <meta> tags and stops at the end of <head>.
+
+    Feed it the page in chunks and check 'done' after each one; everything after the
+    <head> element is ignored, so only the first few kilobytes of a page are parsed.
+
+    Attributes:
+        meta (dict): Meta tag 'property' or 'name' mapped to its 'content'.
+        done (bool): True once the end of <head> (or the start of <body>) has been seen.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "meta":
+            attrs = dict(attrs)
+            key = attrs.get("property") or attrs.get("name")
+            if key and "content" in attrs:
+                self.meta.setdefault(key, attrs["content"])
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+def parse_meta_tags(html):
+    """
+    Extracts the <head> meta tags from an HTML document.
+
+    Args:
+        html (str): The page HTML, e.g., a WebDriver's 'page_source'.
+
+    Returns:
+        dict: Meta tag 'property' or 'name' mapped to its 'content'.
+    """
+    parser = HeadMetaParser()
+    for start in range(0, len(html), FETCH_CHUNK_SIZE):
+        parser.feed(html[start:start + FETCH_CHUNK_SIZE])
+        if parser.done:
+            break
+    return parser.meta
+
+def page_loaded(driver):
+    """
+    Checks whether the page open in a browser is a loaded Instagram page rather than an error page.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance with the page loaded.
+
+    Returns:
+        bool: True if the page has Open Graph ('og:') meta tags.
+    """
+    return any(key.startswith("og:") for key in parse_meta_tags(driver.page_source))
+
+def parse_count(text):
+    """
+    Converts an Instagram count such as "1,234", "12.3K" or "1.2M" into an integer.
+
+    Args:
+        text (str): The count as displayed by Instagram.
+
+    Returns:
+        int or None: The count as an integer, or None if the text is not a count.
+
+    Example:
+        parse_count("12.3K")  # 12300
+    """
+    text = str(text).strip().replace(",", "")
+    multiplier = COUNT_MULTIPLIERS.get(text[-1:].upper(), 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        return int(round(float(text) * multiplier))
+    except ValueError:
+        return None
+
+def count_before(content, label):
+    """
+    Finds the count that precedes a label in a meta description, e.g., "12.3K Followers".
+
+    Args:
+        content (str): The meta description text.
+        label (str): The label that follows the count, e.g., "Followers" or "Posts".
+
+    Returns:
+        int or None: The parsed count, or None if the label is not present.
+    """
+    match = re.search(r"([\d.,]+[KMB]?)\s+" + re.escape(label), content, re.IGNORECASE)
+    return parse_count(match.group(1)) if match else None
+
+def get_ig_session():
+    """
+    Returns a shared HTTP session for browserless Instagram requests.
+
+    The session is created once per process, keeps its connections alive between
+    requests and carries the cookies saved by 'intizalize_ig_login', if present.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _ig_session
+
+    with _ig_session_lock:
+        if _ig_session is None:
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            session.headers.update(FETCH_HEADERS)
+
+            cookies_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instagram_cookies.pkl")
+            if os.path.exists(cookies_path):
+                with open(cookies_path, "rb") as cookies_file:
+                    for cookie in pickle.load(cookies_file):
+                        session.cookies.set(cookie["name"], cookie["value"],
+                                            domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+            _ig_session = session
+
+    return _ig_session
+
+def fetch_meta_tags(url, session=None, timeout=FETCH_TIMEOUT):
+    """
+    Fetches a page over HTTP and returns its <head> meta tags without starting a browser.
+
+    The response is streamed and parsing stops at the end of <head>, so the rest of the page
+    is never downloaded or parsed.
+
+    Args:
+        url (str): The page URL.
+        session (requests.Session, optional): The session to use (default is 'get_ig_session()').
+        timeout (float, optional): Request timeout in seconds (default is FETCH_TIMEOUT).
+
+    Returns:
+        dict or None: Meta tag 'property' or 'name' mapped to its 'content', or None if the
+        request was blocked (non-200 status or a redirect to the login page).
+    """
+    session = session or get_ig_session()
+
+    try:
+        response = session.get(url, stream=True, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Lightweight fetch failed for {url}: {e}")
+        return None
+
+    with response:
+        if response.status_code != 200 or "/accounts/login" in response.url:
+            return None
+
+        response.encoding = response.encoding or "utf-8"
+        parser = HeadMetaParser()
+        for chunk in response.iter_content(FETCH_CHUNK_SIZE, decode_unicode=True):
+            parser.feed(chunk)
+            if parser.done:
+                break
+
+    return parser.meta
+
+def fetch_og_description(url, connected_driver=None, login=False, pool=None, lightweight=True):
+    """
+    Retrieves a page's 'og:description' meta tag, preferring a browserless request.
+
+    The page is first fetched over the shared HTTP session. Only when that request is blocked or
+    the tag is missing is a browser leased (from 'pool', 'connected_driver' or a new browser).
+
+    Args:
+        url (str): The page URL.
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether a newly started browser should log in to Instagram (default is False).
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+        lightweight (bool, optional): Whether to try the browserless request first (default is True).
+
+    Returns:
+        str or None: The description text, or None if the page has none.
+    """
+    if lightweight:
+        meta = fetch_meta_tags(url)
+        if meta and meta.get("og:description"):
+            return meta["og:description"]
+
+    with lease_driver(connected_driver, pool, login) as leased_driver:
+        driver = get_data(leased_driver, url)
+        meta = parse_meta_tags(driver.page_source)
+
+    return meta.get("og:description")
+
+## --- Manual Scrapers ---
+
+def post_shortcode(link):
+    """
+    Extracts the shortcode from an Instagram post or reel URL.
+
+    Args:
+        link (str): A post URL such as "https://www.instagram.com/p/DGqaNAZOfga/", or a bare shortcode.
+
+    Returns:
+        str: The shortcode (e.g., "DGqaNAZOfga").
+    """
+    match = POST_SHORTCODE_PATTERN.search(link)
+    return match.group(1) if match else link.strip("/")
+
+def get_ig_post_links(username, max_scrolls=100, connected_driver=None, login=False, pool=None, known_links=None, known_hits_to_stop=4):
+    """
+    Retrieves a list of Instagram post URLs from a given user's profile by scrolling through the page.
+
+    This function visits the specified Instagram profile and installs a MutationObserver that collects
+    post URLs (both regular posts and reels) as Instagram appends them to the grid. Each scroll step is
+    a single script call that returns only the links that appeared since the previous step, so the cost
+    per scroll stays constant as the profile grows. Scrolling stops when HARVEST_EMPTY_SCROLLS scrolls in a
+    row bring neither new links nor page growth (the end of the feed, not just a slow load), when the
+    maximum number of scrolls is reached, or when the known-post watermark is reached.
+
+    Args:
+        username (str): The Instagram username whose posts are to be retrieved.
+        max_scrolls (int, optional): The maximum number of scrolls to perform (default is 100).
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether to log in to Instagram (default is False). If True, login will be performed.
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+        known_links (iterable, optional): Post URLs or shortcodes already collected on a previous run (default is None).
+            When given, only new links are returned and scrolling stops once the feed reaches known posts.
+        known_hits_to_stop (int, optional): Number of known posts to see before stopping (default is 4).
+            Kept above one so that pinned posts at the top of the grid do not end the run early.
+
+    Returns:
+        list: A list of unique Instagram post URLs (only new ones if 'known_links' is given).
+        int: The number of unique post URLs found.
+
+    Example:
+        post_links, count = get_ig_post_links('username')
+        print(post_links, count)
+
+        new_links, count = get_ig_post_links('username', known_links=post_links)
+
+    Note:
+        The function uses a randomized scrolling distance to avoid Instagram detection of automated browsing.
+    """
+
+    url = f"https://www.instagram.com/{username}/"
+    known = {post_shortcode(link) for link in known_links} if known_links else set()
+
+    post_links = []
+    known_hits = 0
+    empty_scrolls = 0
+
+    with lease_driver(connected_driver, pool, login) as leased_driver:
+        driver = get_data(leased_driver, url)
+        driver.set_script_timeout(HARVEST_IDLE_TIMEOUT + 10)
+        driver.execute_script(HARVEST_OBSERVER_JS)
+
+        for scroll in range(max_scrolls):
+            # Randomized scrolling, then drain the links the observer collected
+            scroll_distance = random.randint(800, 1200)
+            result = driver.execute_async_script(
+                HARVEST_SCROLL_JS,
+                scroll_distance,
+                int(HARVEST_IDLE_TIMEOUT * 1000),
+                int(HARVEST_SETTLE_TIME * 1000),
+            )
+
+            for link in result["links"]:
+                if post_shortcode(link) in known:
+                    known_hits += 1
+                else:
+                    post_links.append(link)
+
+            print(f"🔹 Scroll {scroll+1}: {len(post_links)} posts found...")
+
+            if known and known_hits >= known_hits_to_stop:
+                print("✅ Reached previously collected posts, stopping.")
+                break
+
+            # Stop once several scrolls in a row loaded no new posts and the page stopped growing
+            empty_scrolls = 0 if result["links"] or result["grew"] else empty_scrolls + 1
+            if empty_scrolls >= HARVEST_EMPTY_SCROLLS:
+                print("✅ No new posts loaded, stopping.")
+                break
+
+    return post_links, len(post_links)
+
+def download_image(url, connected_driver=None, login=False, save_path="_image.jpg", pool=None):
+    """
+    Downloads an image from the provided Instagram post URL and saves it to the specified location.
+
+    Args:
+        url (str): The URL of the Instagram post.
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether to log in to Instagram (default is False).
+        save_path (str, optional): The path to save the image file (default is "_image.jpg").
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+
+    Returns:
+        str: The path where the image is saved or an error message.
+    """
+    
+    config = load_config()
+    IMAGE_PATH = config['IMAGE_PATH']
+
+    if url is not None:
+        try:
+            # Initial request to check URL
+            response = requests.get(url, timeout=10)
+            
+            # Check if the request was successful
+            if response.status_code == 200:
+                # XPath for finding the image element
+                html = "//img[contains(@alt, 'Photo by')]"
+                post_id = url.split("/p/")[1].strip("/")
+
+                with lease_driver(connected_driver, pool, login) as leased_driver:
+                    driver = get_data(leased_driver, url)
+
+                    try:
+                        # Wait for the image element to load
+                        found = wait_for_elements(driver, {"image": html})
+                        # Get the image URL
+                        img_url = found["image"][0].get_attribute("src")
+                    except Exception as e:
+                        print(f"Error while retrieving image: {e}")
+                        return "Image element not found"
+
+                # Download and save the image
+                response = requests.get(img_url, stream=True)
+                if response.status_code == 200:
+                    os.makedirs(IMAGE_PATH, exist_ok=True)
+                    image_file_path = os.path.join(IMAGE_PATH, post_id + save_path)
+                    with open(image_file_path, "wb") as file:
+                        for chunk in response.iter_content(1024):
+                            file.write(chunk)
+                    print(f"Image saved as {image_file_path}")
+                    return image_file_path
+                else:
+                    print("Failed to download image")
+                    return "Failed to download"
+        except Exception as e:
+            print(f"Error: {e}")
+            return "URL did not work. Use the permalink for the Instagram post."
+
+def scrape_ig_post(url, connected_driver=None, login=False, elements=None, pool=None, deadline=PAGE_DEADLINE, require_page=False):
+    """
+    Scrapes specified elements (likes, hashtags, comments, etc.) from an Instagram post.
+
+    Args:
+        url (str): The URL of the Instagram post.
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether to log in to Instagram (default is False).
+        elements (list, optional): A list of elements to scrape, e.g., ['likes', 'hashtags'].
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+        deadline (float, optional): Overall seconds to wait for all requested elements (default is PAGE_DEADLINE).
+        require_page (bool, optional): Raise instead of returning "Not Found" values when the post page itself
+            did not load, i.e., it has no Open Graph meta tags (default is False).
+
+    Returns:
+        dict: A dictionary containing the scraped elements (e.g., likes, hashtags).
+
+    Raises:
+        RuntimeError: If 'require_page' is True and the post page did not load.
+
+    Notes:
+        - All requested elements are awaited together, so the scrape returns as soon as they are all present.
+        - Once the post has rendered, elements it does not have (hidden likes, no hashtags) are given only
+          ELEMENT_GRACE more seconds and then reported as "Not Found", instead of waiting until 'deadline'.
+    """
+
+    elements_dict = {}
+
+    with lease_driver(connected_driver, pool, login) as leased_driver:
+        driver_data = get_data(leased_driver, url)
+
+        if elements is None:
+            elements = ["likes", "hashtags"]
+
+        # Instagram loads some elements dynamically, wait for all of them in one pass
+        xpaths = {}
+        if "likes" in elements:
+            xpaths['likes'] = LIKES_XPATH
+        if "hashtags" in elements:
+            xpaths['hashtags'] = HASHTAGS_XPATH
+        found = wait_for_elements(driver_data, xpaths, deadline, ready_xpath=POST_READY_XPATH)
+
+        # Posts with hidden likes and no hashtags are valid; only a page without its meta tags failed
+        if require_page and not page_loaded(driver_data):
+            raise RuntimeError(f"Page did not load: {url}")
+
+        if "likes" in elements:
+            elements_dict['likes'] = check_likes(driver_data, found)
+        # UNDER CONSTRUCTION
+        # if "comments" in elements:
+        #     elements_dict['comments'] = check_comments(driver_data)
+        if "hashtags" in elements:
+            elements_dict['hashtags'] = check_hashtags(driver_data, found)
+        # UNDER CONSTRUCTION
+        # if "caption" in elements:
+        #     elements_dict['caption'] = check_caption(driver_data)
+
+    return elements_dict
+
+def scrape_instagram_profile(username, connected_driver=None, login=False, pool=None, lightweight=True):
+    """
+    Scrapes Instagram profile information like follower count for a given username.
+
+    The profile page is fetched over HTTP first and only its <head> is parsed; a browser is used
+    only if that request is blocked (see 'fetch_og_description').
+
+    Args:
+        username (str): The Instagram username.
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether to log in to Instagram (default is False).
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+        lightweight (bool, optional): Whether to try the browserless request first (default is True).
+
+    Returns:
+        dict: A dictionary containing the username and follower count (as an integer).
+    """
+    url = f"https://www.instagram.com/{username}/"
+    content = fetch_og_description(url, connected_driver, login, pool, lightweight)
+
+    # Extract follower count
+    followers = count_before(content, "Followers") if content else None
+    if followers is not None:
+        return {"username": username, "followers": followers}
+    else:
+        return {"username": username, "followers": "Not found"}
+
+# --- Hashtag Analysis ---
+# UNDER CONSTRUCTION
+def get_hashtag_data(hashtag, connected_driver=None, login=False, pool=None, lightweight=True):
+    """
+    Scrapes Instagram hashtag data such as the number of posts for a given hashtag.
+
+    The hashtag page is fetched over HTTP first and only its <head> is parsed; a browser is used
+    only if that request is blocked (see 'fetch_og_description').
+
+    Args:
+        hashtag (str): The Instagram hashtag.
+        connected_driver (WebDriver, optional): An existing Selenium WebDriver instance (default is None).
+        login (bool, optional): Whether to log in to Instagram (default is False).
+        pool (ChromeDriverPool, optional): A pool of warm browsers to lease a driver from (default is None).
+        lightweight (bool, optional): Whether to try the browserless request first (default is True).
+
+    Returns:
+        dict: A dictionary containing the hashtag and the number of posts (as an integer).
+    """
+    url = f"https://www.instagram.com/explore/tags/{hashtag}/"
+    content = fetch_og_description(url, connected_driver, login, pool, lightweight)
+
+    # Extract post count (Example, might need tweaking)
+    posts = count_before(content, "Posts") if content else None
+    if posts is not None:
+        return {"hashtag": hashtag, "posts": posts}
+    else:
+        return {"hashtag": hashtag, "posts": "Not found"}
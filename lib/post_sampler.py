@@ -0,0 +1,421 @@
+import os
+import json
+import time
+import heapq
+import datetime
+from collections import deque
+from graph_api import load_config, get_media_list, ids_request, MEDIA_PRODUCT_METRICS, FEED_METRICS, MEDIA_IDS_PER_REQUEST
+from graph_flatten import flatten_children
+from history_store import history_root, write_partition
+from schemas import SCHEMAS
+
+# --- Sampling Settings ---
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# (maximum post age, sampling interval) in seconds, youngest first. A post's engagement curve is
+# decided in its first hours, so young posts are sampled often and old posts rarely. An interval
+# of None leaves the tier to the daily run, which already reads those posts' insights once a day.
+SAMPLING_TIERS = [
+    (6 * HOUR, 15 * MINUTE),
+    (2 * DAY, HOUR),
+    (30 * DAY, None),
+]
+OLD_POST_INTERVAL = 7 * DAY  # Posts older than the last tier, no longer read by the daily run
+DAILY_POLL_MAX_AGE = SAMPLING_TIERS[-1][0]  # Oldest post whose insights the daily run reads while the sampler runs
+
+SAMPLING_BUDGET_PER_HOUR = 100  # Graph API calls the sampler may make per rolling hour
+FAILURE_BACKOFF = 15 * MINUTE  # Wait before retrying a post whose insights failed, doubled on every further failure
+MAX_SAMPLE_FAILURES = 5  # Consecutive failures after which a post is no longer sampled
+SAMPLER_STATE_FILE = "sampler_state.json"
+SAMPLES_DATASET = "post_metric_samples"
+
+def sample_interval(age):
+    """
+    Returns how often a post of a given age is sampled.
+
+    Args:
+        age (float): The post's age in seconds.
+
+    Returns:
+        int: The sampling interval in seconds, or None while the daily run reads the post's insights.
+    """
+    for max_age, interval in SAMPLING_TIERS:
+        if age < max_age:
+            return interval
+    return OLD_POST_INTERVAL
+
+def next_due(published, now):
+    """
+    Returns the next time a post should be sampled.
+
+    Due times are aligned to multiples of the interval (every quarter hour, on the hour, at
+    midnight UTC, ...), so posts of the same tier come due together and share a request. A post
+    in a tier left to the daily run is next due when it leaves that tier.
+
+    Args:
+        published (float): The post's publish time, in epoch seconds.
+        now (float): The time of the last sample, in epoch seconds.
+
+    Returns:
+        float: The next due time, in epoch seconds.
+    """
+    age = now - published
+    interval = sample_interval(age)
+    if interval is None:
+        return published + next(max_age for max_age, _ in SAMPLING_TIERS if age < max_age)
+    return (now // interval + 1) * interval
+
+def sampler_enabled():
+    """
+    Returns True when the post sampler runs, i.e., 'SAMPLING_BUDGET_PER_HOUR' is not 0.
+
+    While it runs, the sampler owns the insights of posts older than DAILY_POLL_MAX_AGE and the
+    daily run leaves them out.
+
+    Returns:
+        bool: Whether the sampler has a rate budget.
+    """
+    return load_config().get("SAMPLING_BUDGET_PER_HOUR", SAMPLING_BUDGET_PER_HOUR) > 0
+
+def parse_publish_time(timestamp):
+    """
+    Converts a Graph API timestamp (e.g., "2025-04-01T10:00:00+0000") to epoch seconds.
+
+    Args:
+        timestamp (str): The post's 'timestamp' field.
+
+    Returns:
+        float: The publish time in epoch seconds.
+    """
+    return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S%z").timestamp()
+
+def sampler_state_path():
+    """
+    Returns the path of the file holding the last sample time of every post.
+
+    Returns:
+        str: The sampler state file path inside the history store.
+    """
+    return os.path.join(history_root(), SAMPLER_STATE_FILE)
+
+def load_sampler_state():
+    """
+    Loads the last sample time of every post, saved by the previous run.
+
+    Returns:
+        dict: Post ID mapped to its last sample time in epoch seconds.
+    """
+    try:
+        with open(sampler_state_path(), "r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except FileNotFoundError:
+        return {}
+
+def save_sampler_state(state):
+    """
+    Saves the last sample time of every post, replacing the file atomically.
+
+    Args:
+        state (dict): Post ID mapped to its last sample time in epoch seconds.
+
+    Returns:
+        None
+    """
+    path = sampler_state_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as state_file:
+        json.dump(state, state_file)
+    os.replace(tmp_path, path)
+
+class PostSampler:
+    """
+    Samples the insights of every post at a frequency that decays with the post's age.
+
+    Posts aged between the hourly tier and DAILY_POLL_MAX_AGE are left to the daily run, which
+    reads their insights anyway; past that age the daily run skips them and the sampler reads
+    them weekly, so no post's insights are requested by both.
+    Posts wait in a min-heap ordered by their next due time. Each tick pops the posts that are
+    due, requests their insights in '?ids=' batches (one metric set per media product type),
+    writes the samples to the 'post_metric_samples' history dataset and pushes each post back
+    with its next due time. Calls are counted over a rolling hour, including the retries of
+    failing batches, and a tick stops once the budget is spent; the posts left in the heap are
+    sampled on the next ticks. A post whose insights fail is retried after an exponential
+    backoff and dropped from the schedule after MAX_SAMPLE_FAILURES failures in a row.
+
+    Args:
+        budget_per_hour (int, optional): Maximum calls per rolling hour (default is
+            'SAMPLING_BUDGET_PER_HOUR' from the configuration file, or 100).
+
+    Example:
+        sampler = PostSampler()
+        sampler.refresh_posts()
+        while True:
+            sampler.run_pending()
+            time.sleep(60)
+    """
+
+    def __init__(self, budget_per_hour=None):
+        if budget_per_hour is None:
+            budget_per_hour = load_config().get("SAMPLING_BUDGET_PER_HOUR", SAMPLING_BUDGET_PER_HOUR)
+        self.budget_per_hour = budget_per_hour
+        self._calls = deque()  # Times of the calls made in the last hour
+        self._heap = []  # (due time, post ID); entries whose time differs from '_due' are stale
+        self._due = {}  # Post ID mapped to its scheduled due time, so each post has one live heap entry
+        self._posts = {}  # Post ID mapped to {"published": float, "media_product_type": str}
+        self._failures = {}  # Post ID mapped to its consecutive failed samples
+        self._dropped = set()  # Posts that failed too often, not re-added by 'refresh_posts'
+        self._last_sampled = load_sampler_state()
+
+    # --- Rate Budget ---
+
+    def budget_left(self, now):
+        """
+        Returns how many calls can still be made in the rolling hour ending at 'now'.
+
+        Args:
+            now (float): The current time in epoch seconds.
+
+        Returns:
+            int: The remaining calls.
+        """
+        while self._calls and self._calls[0] <= now - HOUR:
+            self._calls.popleft()
+        return self.budget_per_hour - len(self._calls)
+
+    def _spend(self, now, calls=1):
+        """
+        Records calls against the rate budget.
+
+        Args:
+            now (float): The time of the calls in epoch seconds.
+            calls (int, optional): The number of calls made (default is 1).
+
+        Returns:
+            None
+        """
+        self._calls.extend([now] * calls)
+
+    # --- Scheduling ---
+
+    def refresh_posts(self, full=False, now=None):
+        """
+        Adds newly published posts to the schedule and drops deleted ones.
+
+        The first refresh lists every post; later ones only read the newest page of the media
+        edge, which is enough to pick up new posts at one call per refresh.
+
+        Args:
+            full (bool, optional): List every post even if the schedule is already filled (default is False).
+            now (float, optional): The current time in epoch seconds (default is the current time).
+
+        Returns:
+            int: The number of posts added.
+        """
+        now = time.time() if now is None else now
+        full = full or not self._posts
+
+        posts = get_media_list("id,timestamp,media_product_type", max_pages=None if full else 1)
+        self._spend(now, max(1, -(-len(posts) // 100)))  # One call per page of 100 posts
+
+        if full:
+            listed = {post["id"] for post in posts}
+            for post_id in set(self._posts) - listed:
+                del self._posts[post_id]
+                self._due.pop(post_id, None)  # Its heap entry is skipped when popped
+
+        added = 0
+        for post in posts:
+            if post["id"] in self._posts or post["id"] in self._dropped or not post.get("timestamp"):
+                continue
+
+            published = parse_publish_time(post["timestamp"])
+            self._posts[post["id"]] = {
+                "published": published,
+                "media_product_type": post.get("media_product_type"),
+            }
+
+            # Posts never sampled are due now, unless the daily run covers their age; others resume from their last sample
+            last = self._last_sampled.get(post["id"])
+            if last is not None:
+                due = next_due(published, last)
+            elif sample_interval(now - published) is None:
+                due = next_due(published, now)
+            else:
+                due = now
+            self._schedule(post["id"], due)
+            added += 1
+
+        return added
+
+    def _schedule(self, post_id, due):
+        """
+        Pushes a post onto the heap, replacing any entry it already has there.
+
+        The old entry stays in the heap but no longer matches '_due', so it is skipped when popped;
+        a post removed from the schedule and added again is therefore never sampled twice per due time.
+
+        Args:
+            post_id (str): The ID of the post.
+            due (float): The time the post is next due, in epoch seconds.
+
+        Returns:
+            None
+        """
+        self._due[post_id] = due
+        heapq.heappush(self._heap, (due, post_id))
+
+    def _pop_due(self, now):
+        """
+        Removes and returns every post due at 'now' from the heap.
+
+        Args:
+            now (float): The current time in epoch seconds.
+
+        Returns:
+            list: The IDs of the due posts, most overdue first.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_time, post_id = heapq.heappop(self._heap)
+            if post_id in self._posts and self._due.get(post_id) == due_time:
+                del self._due[post_id]
+                due.append(post_id)
+        return due
+
+    def run_pending(self, now=None):
+        """
+        Samples every due post that fits in the rate budget.
+
+        This function performs the following steps:
+            - Pops the due posts from the heap and groups them by their metric set.
+            - Requests the insights of up to MEDIA_IDS_PER_REQUEST posts per call while budget is left,
+              charging every request sent, including the retries of failing batches.
+            - Writes one row per post and metric to the 'post_metric_samples' dataset, with the post's age.
+              If the write fails, every due post is put back as due and the error is raised.
+            - Only then records the sample times, saves them and reschedules the sampled posts at their next
+              due time, the failed ones after a growing backoff (dropping them after MAX_SAMPLE_FAILURES
+              failures) and the ones left out of budget unchanged.
+
+        Args:
+            now (float, optional): The current time in epoch seconds (default is the current time).
+
+        Returns:
+            int: The number of posts sampled.
+        """
+        now = time.time() if now is None else now
+        due = self._pop_due(now)
+        if not due:
+            return 0
+
+        groups = {}
+        for post_id in due:
+            product_type = self._posts[post_id]["media_product_type"]
+            groups.setdefault(MEDIA_PRODUCT_METRICS.get(product_type, FEED_METRICS), []).append(post_id)
+
+        chunks = [(metrics, ids[start:start + MEDIA_IDS_PER_REQUEST])
+                  for metrics, ids in groups.items() for start in range(0, len(ids), MEDIA_IDS_PER_REQUEST)]
+
+        sampled = {}
+        requested = set()
+        for metrics, chunk in chunks:
+            if self.budget_left(now) <= 0:
+                break
+            stats = {}
+            try:
+                sampled.update(ids_request(chunk, f"insights.metric({metrics})", stats=stats))
+            except Exception as e:
+                # Network errors are not the posts' fault; they and the rest are deferred to the next tick
+                print(f"Error requesting post insights, retrying next tick: {e}")
+                self._spend(now, stats.get("requests", 1))
+                break
+            self._spend(now, stats.get("requests", 1))
+            requested.update(chunk)
+
+        # Samples are stored before their times are recorded, so a failed write never marks a post as sampled
+        if sampled:
+            try:
+                self._write_samples(sampled, now)
+            except BaseException:
+                for post_id in due:
+                    self._schedule(post_id, now)
+                raise
+
+        failed = 0
+        for post_id in due:
+            published = self._posts[post_id]["published"]
+            if post_id in sampled:
+                self._last_sampled[post_id] = now
+                self._failures.pop(post_id, None)
+                self._schedule(post_id, next_due(published, now))
+            elif post_id in requested:
+                failed += 1
+                self._reschedule_failed(post_id, now)
+            else:
+                self._schedule(post_id, now)  # Out of budget, sampled once budget frees up
+
+        if sampled:
+            save_sampler_state(self._last_sampled)
+        if len(sampled) < len(due):
+            print(f"Sampled {len(sampled)} of {len(due)} due posts, {failed} failed, {len(due) - len(sampled) - failed} deferred")
+
+        return len(sampled)
+
+    def _reschedule_failed(self, post_id, now):
+        """
+        Pushes a post whose insights could not be read back after an exponential backoff.
+
+        The backoff starts at FAILURE_BACKOFF and doubles with every consecutive failure. After
+        MAX_SAMPLE_FAILURES failures (e.g., a deleted post, or one the API has no insights for),
+        the post is removed from the schedule so it stops spending the budget.
+
+        Args:
+            post_id (str): The ID of the post that failed.
+            now (float): The current time in epoch seconds.
+
+        Returns:
+            None
+        """
+        failures = self._failures.get(post_id, 0) + 1
+        if failures >= MAX_SAMPLE_FAILURES:
+            print(f"Stopped sampling post {post_id} after {failures} failed requests")
+            del self._posts[post_id]
+            self._failures.pop(post_id, None)
+            self._dropped.add(post_id)
+            return
+
+        self._failures[post_id] = failures
+        self._schedule(post_id, now + FAILURE_BACKOFF * 2 ** (failures - 1))
+
+    def _write_samples(self, sampled, now):
+        """
+        Writes the sampled insights to the history store.
+
+        Args:
+            sampled (dict): Post ID mapped to the '?ids=' response with its 'insights'.
+            now (float): The sample time in epoch seconds.
+
+        Returns:
+            None
+        """
+        items = [
+            {
+                "id": post_id,
+                "media_product_type": self._posts[post_id]["media_product_type"],
+                "post_age_minutes": int((now - self._posts[post_id]["published"]) // MINUTE),
+                "insights": data.get("insights", {}),
+            }
+            for post_id, data in sampled.items()
+        ]
+        df = flatten_children(
+            items,
+            parent_fields={"post_id": "id", "media_product_type": "media_product_type", "post_age_minutes": "post_age_minutes"},
+            children_path=("insights", "data"),
+            child_fields={"name": "name", "value": ("values", 0, "value")},
+            dtypes=SCHEMAS[SAMPLES_DATASET],
+        )
+        df["extraction_datetime"] = datetime.datetime.fromtimestamp(now)
+        write_partition(df, SAMPLES_DATASET)
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import requests
+from graph_api import load_config
+
+# --- Response Cache Settings ---
+DEFAULT_TTL = 6 * 60 * 60  # Seconds a cached response stays fresh
+
+# Seconds each slow-moving endpoint stays fresh; override with 'CACHE_TTLS' in the configuration file
+ENDPOINT_TTLS = {
+    "demographic_insights": 12 * 60 * 60,  # Lifetime "this_month" breakdowns
+    "profile": 60 * 60,                    # Biography, picture and counts
+    "business_discovery": 6 * 60 * 60,     # Competitor counts
+}
+
+_stats = {"hits": 0, "misses": 0, "revalidated": 0, "bypassed": 0}
+_stats_lock = threading.Lock()
+
+def cache_dir():
+    """
+    Returns the directory used for cached Graph API responses.
+
+    Uses 'CACHE_PATH' from the configuration file if set, otherwise a 'cache'
+    folder inside 'RAW_DATA_PATH'.
+
+    Returns:
+        str: The cache directory.
+    """
+    config = load_config()
+    return config.get("CACHE_PATH", os.path.join(config["RAW_DATA_PATH"], "cache"))
+
+def cache_key(endpoint, params=None):
+    """
+    Builds a stable cache key from a request URL and its parameters.
+
+    The access token is left out of the key, so refreshing the token does not
+    invalidate the cache and the token never ends up on disk.
+
+    Args:
+        endpoint (str): The request URL.
+        params (dict, optional): The request parameters.
+
+    Returns:
+        str: A hex digest identifying the request.
+    """
+    params = {key: value for key, value in (params or {}).items() if key != "access_token"}
+    raw = endpoint + "?" + json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def endpoint_ttl(name):
+    """
+    Returns the freshness time of a named endpoint.
+
+    Args:
+        name (str): The endpoint name, a key of ENDPOINT_TTLS or of 'CACHE_TTLS' in the configuration file.
+
+    Returns:
+        float: Seconds a cached response of the endpoint stays fresh.
+    """
+    overrides = load_config().get("CACHE_TTLS", {})
+    return overrides.get(name, ENDPOINT_TTLS.get(name, DEFAULT_TTL))
+
+def record(outcome):
+    """
+    Counts a cache lookup outcome ("hits", "misses", "revalidated" or "bypassed").
+
+    Args:
+        outcome (str): The counter to increment.
+
+    Returns:
+        None
+    """
+    with _stats_lock:
+        _stats[outcome] += 1
+
+def cache_stats():
+    """
+    Returns the cache counters since the process started or the last 'reset_cache_stats'.
+
+    'revalidated' counts expired responses the API confirmed unchanged (HTTP 304), which
+    cost a request but no response body.
+
+    Returns:
+        dict: The 'hits', 'misses', 'revalidated' and 'bypassed' counts and the 'hit_rate'.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"] + stats["revalidated"]
+    stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+    return stats
+
+def reset_cache_stats():
+    """
+    Sets all cache counters back to zero.
+
+    Returns:
+        None
+    """
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+def read_entry(key):
+    """
+    Returns a cached entry regardless of its age.
+
+    Args:
+        key (str): The cache key from 'cache_key'.
+
+    Returns:
+        dict or None: The entry with 'fetched_at', 'etag' and 'data', or None if missing.
+    """
+    path = os.path.join(cache_dir(), key + ".json")
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def read_cache(key, ttl=DEFAULT_TTL):
+    """
+    Returns a cached response if it is younger than 'ttl' seconds.
+
+    Args:
+        key (str): The cache key from 'cache_key'.
+        ttl (float, optional): Maximum age in seconds (default is DEFAULT_TTL).
+
+    Returns:
+        dict or list or None: The cached JSON data, or None if missing or expired.
+    """
+    entry = read_entry(key)
+    if entry is None or time.time() - entry["fetched_at"] > ttl:
+        record("misses")
+        return None
+
+    record("hits")
+    return entry["data"]
+
+def write_cache(key, data, etag=None):
+    """
+    Stores a JSON response in the cache.
+
+    Args:
+        key (str): The cache key from 'cache_key'.
+        data (dict or list): The JSON data to store.
+        etag (str, optional): The response's ETag header, used to revalidate it once expired.
+
+    Returns:
+        None
+    """
+    directory = cache_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, key + ".json")
+    tmp_path = path + f".{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as cache_file:
+        json.dump({"fetched_at": time.time(), "etag": etag, "data": data}, cache_file)
+    os.replace(tmp_path, path)
+
+def cached_get(endpoint, params=None, ttl=DEFAULT_TTL, bypass=False):
+    """
+    Sends a GET request, reusing a cached JSON response while it is fresh.
+
+    This function performs the following steps:
+        - Returns the cached response if it is younger than 'ttl' seconds.
+        - Otherwise, if the expired response has an ETag, sends a conditional request (If-None-Match);
+          when the API answers 304 Not Modified, the cached response is renewed and returned.
+        - Otherwise sends the request and caches the response if it succeeded (200).
+
+    Args:
+        endpoint (str): The request URL.
+        params (dict, optional): The request parameters, including the access token.
+        ttl (float, optional): Maximum age in seconds of a reusable response (default is DEFAULT_TTL).
+        bypass (bool, optional): Always fetch a fresh response, then cache it (default is False).
+            'CACHE_BYPASS' in the configuration file does the same for every request.
+
+    Returns:
+        dict: The JSON response.
+    """
+    key = cache_key(endpoint, params)
+    bypass = bypass or load_config().get("CACHE_BYPASS", False)
+
+    entry = None if bypass else read_entry(key)
+    if bypass:
+        record("bypassed")
+    elif entry is not None and time.time() - entry["fetched_at"] <= ttl:
+        record("hits")
+        return entry["data"]
+
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+    response = requests.get(endpoint, params=params, headers=headers)
+    if response.status_code == 304:
+        record("revalidated")
+        write_cache(key, entry["data"], entry["etag"])
+        return entry["data"]
+
+    if not bypass:
+        record("misses")
+    data = response.json()
+    if response.status_code == 200:
+        write_cache(key, data, response.headers.get("ETag"))
+    return data
@@ -0,0 +1,153 @@
+import datetime
+import pandas as pd
+from graph_api import load_config
+from history_store import replace_partition
+from history_query import read_history, read_as_of
+
+# --- Rollup Definitions ---
+# source:  History store dataset the rollup is built from.
+# series:  Columns identifying one metric series; only its last snapshot in a period is used.
+# groups:  Columns the rollup is grouped by (stored as categoricals).
+# value:   The metric value column.
+# deltas:  Delta table of the source (see derived_metrics.py) whose changes are summed over the period.
+#          Sources without one (demographics are a distribution, not a running count) have no 'change'.
+ROLLUP_SPECS = {
+    "post_rollups": {
+        "source": "daily_post_metrics",
+        "series": ["post_id", "name"],
+        "groups": ["content_pillar", "media_type", "name"],
+        "value": "value",
+        "deltas": "post_metric_deltas",
+    },
+    "demographic_rollups": {
+        "source": "daily_demographic_metrics",
+        "series": ["category", "age", "gender"],
+        "groups": ["category", "age", "gender"],
+        "value": "value",
+    },
+    "actions_rollups": {
+        "source": "daily_actions_metrics",
+        "series": ["Metric Name"],
+        "groups": ["Metric Name"],
+        "value": "Value",
+        "deltas": "actions_metric_deltas",
+    },
+}
+
+GRAINS = ("weekly", "monthly")
+
+def period_bounds(date, grain):
+    """
+    Returns the first and last day of the week (Monday to Sunday) or month containing a date.
+
+    Args:
+        date (date): Any day in the period.
+        grain (str): "weekly" or "monthly".
+
+    Returns:
+        tuple: (period_start, period_end) as datetime.date objects.
+    """
+    if grain == "weekly":
+        start = date - datetime.timedelta(days=date.weekday())
+        return start, start + datetime.timedelta(days=6)
+
+    start = date.replace(day=1)
+    next_month = (start + datetime.timedelta(days=32)).replace(day=1)
+    return start, next_month - datetime.timedelta(days=1)
+
+def period_changes(spec, period_start, period_end):
+    """
+    Sums each series' deltas extracted during a period.
+
+    Args:
+        spec (dict): The rollup's entry in ROLLUP_SPECS, with a 'deltas' table.
+        period_start (date): First day of the period.
+        period_end (date): Last day of the period.
+
+    Returns:
+        pandas.DataFrame: The series columns and 'change'; series without a delta in the period are absent.
+    """
+    deltas = read_history(spec["deltas"], columns=spec["series"] + ["delta"], start=period_start, end=period_end)
+    # Delta keys are stored as text, see derived_metrics.to_long
+    deltas = deltas.astype({column: "string" for column in spec["series"]})
+    deltas["delta"] = pd.to_numeric(deltas["delta"], errors="coerce")
+    return deltas.groupby(spec["series"], observed=True).agg(change=("delta", "sum")).reset_index()
+
+def build_rollup(spec, period_start, period_end):
+    """
+    Aggregates one period of a dataset into a compact, typed rollup table.
+
+    Snapshots are cumulative, so each series contributes only its last snapshot in the period
+    (its end-of-period value); the rollup then sums, averages and counts those values per group.
+    Sources exported in change-only mode ('CHANGE_ONLY_DATASETS') are reconstructed as of the
+    period end instead, since unchanged series have no rows inside the period.
+
+    The sum of end-of-period values is a running total, not what the period added; for sources
+    with a delta table, 'change' holds the sum of every series' deltas extracted in the period.
+
+    Args:
+        spec (dict): The rollup's entry in ROLLUP_SPECS.
+        period_start (date): First day of the period.
+        period_end (date): Last day of the period.
+
+    Returns:
+        pandas.DataFrame: One row per group with 'period_end_total', 'average', 'series_count',
+        'last_extraction' and, for sources with a delta table, 'change'.
+    """
+    columns = list(dict.fromkeys(spec["series"] + spec["groups"] + [spec["value"], "extraction_datetime"]))
+    if spec["source"] in load_config().get('CHANGE_ONLY_DATASETS', []):
+        df = read_as_of(spec["source"], period_end, columns=columns, keys=spec["series"])
+    else:
+        df = read_history(spec["source"], columns=columns, start=period_start, end=period_end)
+    if df.empty:
+        return pd.DataFrame()
+
+    df[spec["value"]] = pd.to_numeric(df[spec["value"]], errors="coerce")
+    latest = df.sort_values("extraction_datetime").drop_duplicates(spec["series"], keep="last")
+
+    aggregations = {
+        "period_end_total": (spec["value"], "sum"),
+        "average": (spec["value"], "mean"),
+        "series_count": (spec["value"], "size"),
+        "last_extraction": ("extraction_datetime", "max"),
+    }
+    if "deltas" in spec:
+        latest = latest.astype({column: "string" for column in spec["series"]})
+        latest = latest.merge(period_changes(spec, period_start, period_end), on=spec["series"], how="left")
+        aggregations["change"] = ("change", "sum")
+
+    rollup = latest.groupby(spec["groups"], observed=True, dropna=False).agg(**aggregations).reset_index()
+
+    rollup = rollup.astype({column: "category" for column in spec["groups"]})
+    rollup["period_end_total"] = rollup["period_end_total"].round().astype("int64")
+    if "change" in rollup.columns:
+        rollup["change"] = rollup["change"].round().astype("int64")
+    rollup["average"] = rollup["average"].astype("float32")
+    rollup["series_count"] = rollup["series_count"].astype("int32")
+    rollup["period_end"] = pd.Timestamp(period_end)
+    return rollup
+
+def refresh_rollups(extraction_date=None):
+    """
+    Rebuilds the weekly and monthly rollups for the periods touched by an extraction.
+
+    Only the week and month containing 'extraction_date' are recomputed, each from just that
+    period's partitions, and they replace the matching rollup partitions. Rollups are stored
+    as "<name>_weekly" and "<name>_monthly" datasets partitioned by 'period_start', so Tableau
+    can read and sort them on typed dates instead of scanning and grouping the raw history.
+
+    Args:
+        extraction_date (date, optional): The date of the latest extraction (default is today).
+
+    Returns:
+        None
+    """
+    extraction_date = extraction_date or datetime.date.today()
+
+    for name, spec in ROLLUP_SPECS.items():
+        for grain in GRAINS:
+            period_start, period_end = period_bounds(extraction_date, grain)
+            rollup = build_rollup(spec, period_start, period_end)
+            if rollup.empty:
+                continue
+            replace_partition(rollup, f"{name}_{grain}", period_start, partition_col="period_start")
@@ -0,0 +1,252 @@
+import pandas as pd
+
+# --- Dataset Schemas ---
+# Column name mapped to its stored dtype. Metric names and other low-cardinality labels are
+# categoricals, counts are nullable integers, rates are single-precision floats, and each dataset
+# keeps a single extraction timestamp; date parts (year, month name, day, ...) are derived at read time.
+SCHEMAS = {
+    "daily_post_metrics": {
+        "post_id": "string",
+        "caption": "string",
+        "media_type": "category",
+        "media_url": "string",
+        "permalink": "string",
+        "publish_datetime": "datetime64[ns]",
+        "content_pillar": "category",
+        "name": "category",
+        "value": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "daily_profile_metrics": {
+        "id": "string",
+        "biography": "string",
+        "followers_count": "Int64",
+        "follows_count": "Int64",
+        "media_count": "Int64",
+        "profile_picture_url": "string",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "daily_demographic_metrics": {
+        "category": "category",
+        "age": "category",
+        "gender": "category",
+        "value": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "daily_actions_metrics": {
+        "Metric Name": "category",
+        "Title": "category",
+        "Value": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "competitor_profile_metrics": {
+        "username": "category",
+        "name": "string",
+        "followers_count": "Int64",
+        "follows_count": "Int64",
+        "media_count": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "competitor_media_metrics": {
+        "username": "category",
+        "post_id": "string",
+        "caption": "string",
+        "media_type": "category",
+        "media_product_type": "category",
+        "permalink": "string",
+        "publish_datetime": "datetime64[ns]",
+        "like_count": "Int64",
+        "comments_count": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "post_comments": {
+        "post_id": "string",
+        "comment_id": "string",
+        "parent_id": "string",
+        "username": "string",
+        "text": "string",
+        "like_count": "Int64",
+        "publish_datetime": "datetime64[ns]",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "hashtag_media": {
+        "hashtag": "category",
+        "edge": "category",
+        "post_id": "string",
+        "caption": "string",
+        "media_type": "category",
+        "permalink": "string",
+        "publish_datetime": "datetime64[ns]",
+        "like_count": "Int64",
+        "comments_count": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "post_metric_samples": {
+        "post_id": "string",
+        "media_product_type": "category",
+        "post_age_minutes": "Int64",
+        "name": "category",
+        "value": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "story_metrics": {
+        "story_id": "string",
+        "media_type": "category",
+        "permalink": "string",
+        "publish_datetime": "datetime64[ns]",
+        "snapshot": "category",
+        "story_age_minutes": "Int64",
+        "name": "category",
+        "value": "Int64",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "post_metric_deltas": {
+        "post_id": "string",
+        "name": "category",
+        "value": "Int64",
+        "previous_value": "Int64",
+        "delta": "Int64",
+        "days_elapsed": "float32",
+        "delta_per_day": "float32",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "profile_metric_deltas": {
+        "name": "category",
+        "value": "Int64",
+        "previous_value": "Int64",
+        "delta": "Int64",
+        "days_elapsed": "float32",
+        "delta_per_day": "float32",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "actions_metric_deltas": {
+        "Metric Name": "category",
+        "value": "Int64",
+        "previous_value": "Int64",
+        "delta": "Int64",
+        "days_elapsed": "float32",
+        "delta_per_day": "float32",
+        "extraction_datetime": "datetime64[ns]",
+    },
+    "caption_postings": {
+        "kind": "category",
+        "term": "string",
+        "post_id": "string",
+        "indexed_datetime": "datetime64[ns]",
+    },
+}
+
+# Column order of the CSV/XLSX exports that the Tableau workbooks were built on. These files
+# keep their original layout, so the date parts are expanded again just before writing them.
+LEGACY_LAYOUTS = {
+    "daily_post_metrics": [
+        "caption", "media_type", "media_url", "permalink", "post_id", "timestamp", "name", "value",
+        "extraction_datetime", "extraction_date", "extraction_year", "extraction_month", "extraction_day", "extraction_time",
+        "publish_datetime", "publish_date", "publish_year", "publish_month", "publish_day", "publish_time",
+        "content_pillar",
+    ],
+    "daily_profile_metrics": [
+        "biography", "followers_count", "follows_count", "media_count", "profile_picture_url", "id",
+        "extraction_datetime", "extraction_date", "extraction_year", "extraction_month", "extraction_day", "extraction_time",
+    ],
+    "daily_demographic_metrics": [
+        "category", "age", "gender", "value",
+        "extraction_datetime", "extraction_date", "extraction_year", "extraction_month", "extraction_day", "extraction_time",
+    ],
+    "daily_actions_metrics": [
+        "Metric Name", "Title", "Value",
+        "extraction_datetime", "extraction_date", "extraction_year", "extraction_month", "extraction_day", "extraction_time",
+    ],
+}
+
+def cast_column(series, dtype):
+    """
+    Converts a column to a schema dtype, coercing unparseable values to missing.
+
+    Args:
+        series (pandas.Series): The column to convert.
+        dtype (str): The schema dtype.
+
+    Returns:
+        pandas.Series: The converted column.
+    """
+    if dtype == "datetime64[ns]":
+        # API timestamps are UTC ("+0000"); they are stored as naive UTC datetimes
+        return pd.to_datetime(series, errors="coerce", utc=True).dt.tz_localize(None).astype(dtype)
+    if dtype == "Int64":
+        return pd.to_numeric(series, errors="coerce").round().astype(dtype)
+    if dtype == "string":
+        return series.astype("object").where(series.notna()).astype(dtype)
+    return series.astype(dtype)
+
+def enforce_schema(df, dataset):
+    """
+    Returns a DataFrame with exactly the columns and dtypes of a dataset's schema.
+
+    Columns missing from 'df' are added as missing values and columns not in the schema
+    are dropped, so every partition of a dataset has the same layout.
+
+    Args:
+        df (pandas.DataFrame): The rows to store.
+        dataset (str): The dataset name, a key of SCHEMAS.
+
+    Returns:
+        pandas.DataFrame: The typed DataFrame.
+    """
+    schema = SCHEMAS[dataset]
+    columns = {}
+    for column, dtype in schema.items():
+        series = df[column] if column in df.columns else pd.Series(pd.NA, index=df.index)
+        columns[column] = cast_column(series, dtype)
+    return pd.DataFrame(columns, index=df.index).reset_index(drop=True)
+
+def add_date_parts(df, column, prefix):
+    """
+    Derives date part columns from a timestamp column, e.g., at read time.
+
+    Adds '<prefix>_date', '<prefix>_year', '<prefix>_month' (full month name), '<prefix>_day'
+    and '<prefix>_time' (HH:MM:SS), matching the columns the pipeline used to store.
+
+    Args:
+        df (pandas.DataFrame): The DataFrame holding 'column'.
+        column (str): The timestamp column, e.g., "extraction_datetime".
+        prefix (str): The prefix of the derived columns, e.g., "extraction".
+
+    Returns:
+        pandas.DataFrame: The DataFrame with the date part columns added.
+    """
+    timestamps = pd.to_datetime(df[column])
+    df[f"{prefix}_date"] = timestamps.dt.strftime("%Y-%m-%d")
+    df[f"{prefix}_year"] = timestamps.dt.year
+    df[f"{prefix}_month"] = timestamps.dt.month_name()
+    df[f"{prefix}_day"] = timestamps.dt.day
+    df[f"{prefix}_time"] = timestamps.dt.strftime("%H:%M:%S")
+    return df
+
+def to_legacy_layout(df, dataset):
+    """
+    Expands a typed DataFrame into the column layout of the existing CSV/XLSX exports.
+
+    Every legacy column is always present, in its original position; columns the rows do not
+    have (e.g., 'publish_datetime' of a post without a timestamp) are left empty, so appended
+    rows never shift the columns of the existing files.
+
+    Args:
+        df (pandas.DataFrame): Rows in the dataset's schema (see 'enforce_schema').
+        dataset (str): The dataset name, a key of LEGACY_LAYOUTS.
+
+    Returns:
+        pandas.DataFrame: The rows with the legacy columns in their original order.
+    """
+    df = add_date_parts(df.copy(), "extraction_datetime", "extraction")
+
+    if "publish_datetime" in df.columns:
+        publish = df["publish_datetime"]
+        df["timestamp"] = publish.dt.strftime("%Y-%m-%dT%H:%M:%S+0000")
+        df["publish_date"] = publish.dt.normalize()
+        df["publish_year"] = publish.dt.year
+        df["publish_month"] = publish.dt.month
+        df["publish_day"] = publish.dt.day
+        df["publish_time"] = publish.dt.time
+
+    return df.reindex(columns=LEGACY_LAYOUTS[dataset])
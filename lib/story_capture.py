@@ -0,0 +1,155 @@
+import time
+import datetime
+from graph_api import load_config, get_stories, ids_request, STORY_METRICS
+from graph_flatten import flatten_children
+from history_store import write_partition
+from post_sampler import parse_publish_time, MINUTE, HOUR
+from schemas import SCHEMAS
+
+# --- Story Capture Settings ---
+STORY_LIFETIME = 24 * HOUR
+STORY_POLL_MINUTES = 30  # How often the stories edge is polled
+FINAL_SNAPSHOT_LEAD = 10 * MINUTE  # How long before expiry the final snapshot is taken
+STORIES_DATASET = "story_metrics"
+
+class StoryCapture:
+    """
+    Measures stories during the 24 hours they are live, without running the whole pipeline.
+
+    Every 'poll_minutes' the stories edge is listed and the insights of all live stories are
+    requested together with one '?ids=' request per MEDIA_IDS_PER_REQUEST stories. Between polls,
+    each story gets a final snapshot once it is within FINAL_SNAPSHOT_LEAD of its expiry, so its
+    last numbers are kept even though it then disappears from the API. Snapshots are written to
+    the 'story_metrics' history dataset, labelled "poll" or "final".
+
+    Args:
+        poll_minutes (int, optional): Minutes between polls (default is 'STORY_POLL_MINUTES' from
+            the configuration file, or 30; 0 disables story capture).
+
+    Example:
+        stories = StoryCapture()
+        while True:
+            stories.run_pending()
+            time.sleep(60)
+    """
+
+    def __init__(self, poll_minutes=None):
+        if poll_minutes is None:
+            poll_minutes = load_config().get("STORY_POLL_MINUTES", STORY_POLL_MINUTES)
+        self.poll_minutes = poll_minutes
+        self._next_poll = 0.0
+        self._stories = {}  # Story ID mapped to its fields, 'published' and 'final'
+
+    def run_pending(self, now=None):
+        """
+        Polls the stories edge if a poll is due and takes the final snapshots that are due.
+
+        A poll or final snapshot that fails (e.g., a network error) is printed and retried on the
+        next call instead of waiting for the next poll interval, so a story is not left without
+        its snapshots; the error is not raised.
+
+        Args:
+            now (float, optional): The current time in epoch seconds (default is the current time).
+
+        Returns:
+            int: The number of story snapshots written.
+        """
+        if not self.poll_minutes:
+            return 0
+        now = time.time() if now is None else now
+
+        written = 0
+        if now >= self._next_poll:
+            try:
+                written += self.poll(now)
+                self._next_poll = now + self.poll_minutes * MINUTE
+            except Exception as e:
+                print(f"Error polling stories, retrying next tick: {e}")
+
+        # Stories whose expiry comes before the next poll get their final snapshot now
+        ending = [story_id for story_id, story in self._stories.items()
+                  if not story["final"] and now >= story["published"] + STORY_LIFETIME - FINAL_SNAPSHOT_LEAD]
+        if ending:
+            try:
+                written += self.capture(ending, now)
+            except Exception as e:
+                print(f"Error taking the final story snapshots, retrying next tick: {e}")
+
+        # Expired stories are no longer returned by the API
+        for story_id in [story_id for story_id, story in self._stories.items()
+                         if now >= story["published"] + STORY_LIFETIME]:
+            del self._stories[story_id]
+
+        return written
+
+    def poll(self, now=None):
+        """
+        Lists the live stories and snapshots the insights of those without a final snapshot yet.
+
+        Args:
+            now (float, optional): The current time in epoch seconds (default is the current time).
+
+        Returns:
+            int: The number of story snapshots written.
+        """
+        now = time.time() if now is None else now
+
+        for story in get_stories():
+            if story["id"] in self._stories or not story.get("timestamp"):
+                continue
+            self._stories[story["id"]] = dict(story, published=parse_publish_time(story["timestamp"]), final=False)
+
+        return self.capture([story_id for story_id, story in self._stories.items() if not story["final"]], now)
+
+    def capture(self, story_ids, now):
+        """
+        Requests the insights of the given stories and writes them to the 'story_metrics' dataset.
+
+        A snapshot taken within FINAL_SNAPSHOT_LEAD of a story's expiry is its final one; a story
+        is only marked as finished once its final snapshot is written.
+
+        Args:
+            story_ids (list): IDs of stories known from 'poll'.
+            now (float): The snapshot time in epoch seconds.
+
+        Returns:
+            int: The number of stories whose insights were written.
+        """
+        if not story_ids:
+            return 0
+
+        insights = ids_request(story_ids, f"insights.metric({STORY_METRICS})")
+
+        items = []
+        for story_id, data in insights.items():
+            story = self._stories[story_id]
+            final = now >= story["published"] + STORY_LIFETIME - FINAL_SNAPSHOT_LEAD
+            items.append(dict(
+                story,
+                snapshot="final" if final else "poll",
+                story_age_minutes=int((now - story["published"]) // MINUTE),
+                insights=data.get("insights", {}),
+            ))
+
+        df = flatten_children(
+            items,
+            parent_fields={
+                "story_id": "id",
+                "media_type": "media_type",
+                "permalink": "permalink",
+                "publish_datetime": "timestamp",
+                "snapshot": "snapshot",
+                "story_age_minutes": "story_age_minutes",
+            },
+            children_path=("insights", "data"),
+            child_fields={"name": "name", "value": ("values", 0, "value")},
+            dtypes=SCHEMAS[STORIES_DATASET],
+        )
+        df["extraction_datetime"] = datetime.datetime.fromtimestamp(now)
+        write_partition(df, STORIES_DATASET)
+
+        for item in items:
+            if item["snapshot"] == "final":
+                self._stories[item["id"]]["final"] = True
+
+        return len(items)
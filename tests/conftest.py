@@ -0,0 +1,33 @@
+import os
+import sys
+import pytest
+
+# The library modules import each other by name, so the lib folder goes on the path
+LIB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+sys.path.insert(0, LIB_PATH)
+
+# Scripts that need a browser, Graph API credentials or 'tests_to_lib.json'; run them directly instead
+collect_ignore = ["driver_test.py", "tests_to_lib_config.py"]
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """
+    Points every library module at a configuration whose data folders are inside 'tmp_path'.
+
+    Modules import 'load_config' by name, so it is replaced in each loaded module. Tests can
+    add settings to the returned dictionary.
+
+    Returns:
+        dict: The configuration returned by 'load_config'.
+    """
+    settings = {
+        "ACCESS_TOKEN": "test-token",
+        "ACCOUNT_ID": "1000",
+        "RAW_DATA_PATH": str(tmp_path / "raw"),
+        "CLEANED_DATA_PATH": str(tmp_path / "cleaned") + os.sep,
+    }
+    for module in list(sys.modules.values()):
+        if getattr(module, "__file__", None) and os.path.dirname(os.path.abspath(module.__file__)) == LIB_PATH \
+                and hasattr(module, "load_config"):
+            monkeypatch.setattr(module, "load_config", lambda: settings)
+    return settings
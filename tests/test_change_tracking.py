@@ -0,0 +1,85 @@
+import datetime
+import pandas as pd
+from change_tracking import detect_changes, save_last_values, load_last_values
+from history_store import write_partition
+from history_query import read_as_of
+
+DATASET = "daily_post_metrics"
+
+def snapshot(day, values):
+    """
+    Builds a daily_post_metrics snapshot extracted on a given day.
+
+    Args:
+        day (int): Day of April 2025.
+        values (dict): (post ID, metric name) mapped to the metric value.
+
+    Returns:
+        pandas.DataFrame: One row per post and metric.
+    """
+    return pd.DataFrame({
+        "post_id": [post_id for post_id, _ in values],
+        "name": [name for _, name in values],
+        "value": list(values.values()),
+        "extraction_datetime": datetime.datetime(2025, 4, day, 9),
+    })
+
+def export_changes(df):
+    """
+    Exports only the changed rows of a snapshot, as export_snapshot does for change-only datasets.
+    """
+    changed, state = detect_changes(DATASET, df)
+    write_partition(changed, DATASET)
+    save_last_values(DATASET, state)
+    return changed
+
+def test_first_export_keeps_every_row(config):
+    df = snapshot(1, {("1", "reach"): 10, ("2", "reach"): 20})
+
+    changed, state = detect_changes(DATASET, df)
+
+    assert len(changed) == 2
+    assert sorted(state["post_id"]) == ["1", "2"]
+
+def test_only_new_and_changed_rows_are_exported(config):
+    export_changes(snapshot(1, {("1", "reach"): 10, ("2", "reach"): 20, ("2", "likes"): 3}))
+
+    changed = export_changes(snapshot(2, {("1", "reach"): 10, ("2", "reach"): 25, ("2", "likes"): 3, ("3", "reach"): 5}))
+
+    assert sorted(zip(changed["post_id"], changed["value"])) == [("2", 25), ("3", 5)]
+
+def test_missing_values_are_not_changes(config):
+    export_changes(snapshot(1, {("1", "reach"): None}))
+
+    changed, _ = detect_changes(DATASET, snapshot(2, {("1", "reach"): None}))
+
+    assert changed.empty
+
+def test_series_missing_from_a_snapshot_keep_their_last_values(config):
+    export_changes(snapshot(1, {("1", "reach"): 10, ("2", "reach"): 20}))
+    export_changes(snapshot(2, {("2", "reach"): 21}))
+
+    state = load_last_values(DATASET).set_index("post_id")["value"]
+
+    assert state.to_dict() == {"1": 10, "2": 21}
+
+def test_read_as_of_reconstructs_change_only_exports(config):
+    export_changes(snapshot(1, {("1", "reach"): 10, ("2", "reach"): 20}))
+    export_changes(snapshot(2, {("1", "reach"): 10, ("2", "reach"): 25}))
+    export_changes(snapshot(3, {("1", "reach"): 12, ("2", "reach"): 25}))
+
+    def values_as_of(day):
+        df = read_as_of(DATASET, datetime.date(2025, 4, day), columns=["value"])
+        return dict(zip(df["post_id"], df["value"]))
+
+    assert values_as_of(1) == {"1": 10, "2": 20}
+    assert values_as_of(2) == {"1": 10, "2": 25}
+    assert values_as_of(3) == {"1": 12, "2": 25}
+
+def test_read_as_of_applies_key_filters(config):
+    export_changes(snapshot(1, {("1", "reach"): 10, ("1", "likes"): 4}))
+    export_changes(snapshot(2, {("1", "reach"): 11, ("1", "likes"): 4}))
+
+    df = read_as_of(DATASET, "2025-04-02", filters=[("name", "==", "likes")])
+
+    assert list(df["value"]) == [4]
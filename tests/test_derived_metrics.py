@@ -0,0 +1,50 @@
+import datetime
+import pandas as pd
+import pytest
+import export_service
+from export_service import export_snapshot
+from history_query import read_history
+
+DATASET = "daily_profile_metrics"
+
+def snapshot(day, followers):
+    """
+    Builds a daily_profile_metrics snapshot extracted on a given day of April 2025.
+    """
+    return pd.DataFrame({
+        "id": ["1000"],
+        "followers_count": [followers],
+        "follows_count": [10],
+        "media_count": [5],
+        "extraction_datetime": [datetime.datetime(2025, 4, day, 9)],
+    })
+
+def export(df, config):
+    return export_snapshot(df, config["CLEANED_DATA_PATH"] + DATASET, sinks=["history"])
+
+def follower_deltas():
+    df = read_history("profile_metric_deltas", filters=[("name", "==", "followers_count")])
+    return sorted(zip(df["extraction_datetime"].dt.day, df["delta"]))
+
+def test_deltas_are_written_with_the_snapshot(config):
+    export(snapshot(1, 100), config)
+    export(snapshot(2, 104), config)
+
+    assert follower_deltas()[1:] == [(2, 4)]  # The first extraction has no previous value
+
+def test_failed_export_writes_no_deltas(config, monkeypatch):
+    export(snapshot(1, 100), config)
+
+    def failing_write(df, dataset):
+        raise OSError("disk full")
+
+    write_partition = export_service.write_partition
+    monkeypatch.setattr(export_service, "write_partition", failing_write)
+    with pytest.raises(OSError):
+        export(snapshot(2, 104), config)
+    monkeypatch.setattr(export_service, "write_partition", write_partition)
+
+    # The rerun is the only export of the new values, so the gain is counted once
+    export(snapshot(3, 104), config)
+
+    assert [delta for day, delta in follower_deltas() if day > 1] == [4]
@@ -0,0 +1,16 @@
+import pandas as pd
+import pytest
+import export_service
+from export_service import ExportService
+
+def test_close_raises_when_a_snapshot_fails(config, monkeypatch):
+    def failing_export(df, metrics_path, sheet_name, sinks=None, fsync=True):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(export_service, "export_snapshot", failing_export)
+
+    with pytest.raises(RuntimeError, match="daily_profile_metrics"):
+        with ExportService() as exports:
+            exports.submit(pd.DataFrame(), config["CLEANED_DATA_PATH"] + "daily_profile_metrics")
+
+    assert [str(error) for _, error in exports.failures] == ["disk full"]
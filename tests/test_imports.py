@@ -0,0 +1,19 @@
+import subprocess
+import sys
+import pytest
+from conftest import LIB_PATH
+
+# Packages the API pipeline must not load just by being imported
+HEAVY_PACKAGES = ["selenium", "pandas", "pyarrow", "numpy"]
+
+def loaded_modules(module):
+    """
+    Imports a library module in a fresh interpreter and returns the names of every module loaded.
+    """
+    code = f"import sys; sys.path.insert(0, {LIB_PATH!r}); import {module}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+@pytest.mark.parametrize("module", ["graph_api", "ig_data_scraper", "ig_images", "automated_api_insights"])
+def test_api_modules_do_not_import_heavy_packages(module):
+    assert loaded_modules(module).isdisjoint(HEAVY_PACKAGES)
@@ -0,0 +1,136 @@
+import datetime
+import pytest
+import graph_api
+import post_sampler
+from post_sampler import PostSampler, FAILURE_BACKOFF, MAX_SAMPLE_FAILURES, DAILY_POLL_MAX_AGE, HOUR, DAY
+
+NOW = datetime.datetime(2025, 4, 1, 12, tzinfo=datetime.timezone.utc).timestamp()
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+@pytest.fixture
+def api(config, monkeypatch):
+    """
+    Serves a media list and '?ids=' insights requests that fail for the posts in 'failing'.
+
+    Returns:
+        dict: The listed 'posts', the 'failing' post IDs and the number of 'requests' sent.
+    """
+    calls = {"posts": [], "failing": set(), "requests": 0}
+
+    def fake_get(endpoint, params=None, headers=None):
+        calls["requests"] += 1
+        ids = params["ids"].split(",")
+        if calls["failing"] & set(ids):
+            return FakeResponse(400, {"error": {"message": "Unsupported get request"}})
+        data = [{"name": "reach", "values": [{"value": 10}]}]
+        return FakeResponse(200, {post_id: {"id": post_id, "insights": {"data": data}} for post_id in ids})
+
+    monkeypatch.setattr(graph_api.requests, "get", fake_get)
+    monkeypatch.setattr(post_sampler, "get_media_list", lambda fields, max_pages=None: calls["posts"])
+    return calls
+
+def listed_posts(count, age=HOUR):
+    return [
+        {"id": str(post_id), "media_product_type": "FEED",
+         "timestamp": datetime.datetime.fromtimestamp(NOW - age, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")}
+        for post_id in range(count)
+    ]
+
+def test_every_request_is_charged_including_retries(api):
+    api["posts"] = listed_posts(4)
+    api["failing"] = {"3"}
+    sampler = PostSampler(budget_per_hour=100)
+    sampler.refresh_posts(now=NOW)
+    budget = sampler.budget_left(NOW)
+
+    assert sampler.run_pending(now=NOW) == 3
+
+    # One batch of four, bisected into halves and the failing half into single posts
+    assert api["requests"] == 5
+    assert sampler.budget_left(NOW) == budget - 5
+
+def test_tick_stops_when_the_budget_is_spent(api):
+    api["posts"] = listed_posts(120)
+    sampler = PostSampler(budget_per_hour=3)
+    sampler.refresh_posts(now=NOW)  # Two calls for the two pages of the media list
+
+    assert sampler.run_pending(now=NOW) == 50
+    assert sampler.run_pending(now=NOW + 60) == 0
+
+    # Once the rolling hour has passed, the deferred posts and the hourly resamples fit in three calls
+    assert sampler.run_pending(now=NOW + HOUR) == 120
+
+def test_failed_posts_back_off_then_are_dropped(api):
+    api["posts"] = listed_posts(1)
+    api["failing"] = {"0"}
+    sampler = PostSampler(budget_per_hour=100)
+    sampler.refresh_posts(now=NOW)
+
+    now = NOW
+    for failures in range(1, MAX_SAMPLE_FAILURES):
+        sampler.run_pending(now=now)
+        requests = api["requests"]
+        retry_at = now + FAILURE_BACKOFF * 2 ** (failures - 1)
+
+        sampler.run_pending(now=retry_at - 1)
+        assert api["requests"] == requests  # Not retried before its backoff
+        now = retry_at
+
+    sampler.run_pending(now=now)
+    requests = api["requests"]
+    sampler.refresh_posts(now=now)
+    sampler.run_pending(now=now + 30 * 24 * HOUR)
+
+    assert api["requests"] == requests  # Dropped, and not re-added by the refresh
+
+def test_posts_covered_by_the_daily_run_are_not_sampled(api):
+    api["posts"] = listed_posts(1, age=10 * DAY)
+    sampler = PostSampler(budget_per_hour=100)
+    sampler.refresh_posts(now=NOW)
+
+    assert sampler.run_pending(now=NOW) == 0
+
+    # The sampler takes the post over once it is older than the daily run reads
+    handover = NOW + DAILY_POLL_MAX_AGE - 10 * DAY
+    assert sampler.run_pending(now=handover) == 1
+    assert sum(sampler.run_pending(now=handover + day * DAY) for day in range(1, 15)) == 2  # Weekly
+
+def test_failed_write_leaves_posts_due(api, monkeypatch):
+    api["posts"] = listed_posts(2)
+    sampler = PostSampler(budget_per_hour=100)
+    sampler.refresh_posts(now=NOW)
+
+    write_partition = post_sampler.write_partition
+
+    def failing_write(df, dataset):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(post_sampler, "write_partition", failing_write)
+    with pytest.raises(OSError):
+        sampler.run_pending(now=NOW)
+    assert post_sampler.load_sampler_state() == {}
+
+    monkeypatch.setattr(post_sampler, "write_partition", write_partition)
+    assert sampler.run_pending(now=NOW + 60) == 2
+
+def test_readded_post_has_a_single_heap_entry(api):
+    api["posts"] = listed_posts(2)
+    sampler = PostSampler(budget_per_hour=100)
+    sampler.refresh_posts(now=NOW)
+
+    api["posts"] = listed_posts(1)
+    sampler.refresh_posts(full=True, now=NOW)  # Post "1" is missing from this listing
+    api["posts"] = listed_posts(2)
+    sampler.refresh_posts(full=True, now=NOW)
+
+    requests = api["requests"]
+    assert sampler.run_pending(now=NOW) == 2
+    assert api["requests"] == requests + 1
+    assert len(sampler._heap) == 2
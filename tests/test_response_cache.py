@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import pytest
+import response_cache
+from response_cache import cached_get, cache_key, read_entry, cache_stats, reset_cache_stats
+
+ENDPOINT = "https://graph.facebook.com/v22.0/1000"
+PARAMS = {"fields": "followers_count", "access_token": "test-token"}
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._data
+
+@pytest.fixture
+def api(config, monkeypatch):
+    """
+    Replaces the HTTP GET used by the cache with a queue of canned responses.
+
+    Returns:
+        dict: 'responses' to answer with, in order, and the 'requests' sent (their headers).
+    """
+    calls = {"responses": [], "requests": []}
+
+    def fake_get(endpoint, params=None, headers=None):
+        calls["requests"].append(headers or {})
+        return calls["responses"].pop(0)
+
+    monkeypatch.setattr(response_cache.requests, "get", fake_get)
+    reset_cache_stats()
+    return calls
+
+def expire(seconds=3600):
+    """
+    Makes the cached response of the test request 'seconds' older.
+    """
+    key = cache_key(ENDPOINT, PARAMS)
+    entry = read_entry(key)
+    with open(os.path.join(response_cache.cache_dir(), key + ".json"), "w", encoding="utf-8") as cache_file:
+        json.dump(dict(entry, fetched_at=entry["fetched_at"] - seconds), cache_file)
+
+def test_fresh_response_is_served_from_disk(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}, etag='"v1"'))
+
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 5}
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 5}
+
+    assert len(api["requests"]) == 1
+    assert cache_stats()["hits"] == 1
+
+def test_access_token_is_not_part_of_the_key(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}))
+    cached_get(ENDPOINT, PARAMS, ttl=60)
+
+    assert cached_get(ENDPOINT, dict(PARAMS, access_token="refreshed"), ttl=60) == {"followers_count": 5}
+    assert len(api["requests"]) == 1
+
+def test_expired_response_is_revalidated_with_its_etag(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}, etag='"v1"'))
+    cached_get(ENDPOINT, PARAMS, ttl=60)
+    expire()
+
+    api["responses"].append(FakeResponse(304))
+    before = time.time()
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 5}
+
+    assert api["requests"][-1] == {"If-None-Match": '"v1"'}
+    assert read_entry(cache_key(ENDPOINT, PARAMS))["fetched_at"] >= before  # Fresh again
+    assert cache_stats()["revalidated"] == 1
+
+def test_changed_response_replaces_the_cached_one(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}, etag='"v1"'))
+    cached_get(ENDPOINT, PARAMS, ttl=60)
+    expire()
+
+    api["responses"].append(FakeResponse(200, {"followers_count": 6}, etag='"v2"'))
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 6}
+
+    entry = read_entry(cache_key(ENDPOINT, PARAMS))
+    assert entry["data"] == {"followers_count": 6}
+    assert entry["etag"] == '"v2"'
+
+def test_expired_response_without_etag_is_fetched_unconditionally(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}))
+    cached_get(ENDPOINT, PARAMS, ttl=60)
+    expire()
+
+    api["responses"].append(FakeResponse(200, {"followers_count": 7}))
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 7}
+    assert api["requests"][-1] == {}
+
+def test_errors_are_not_cached(api):
+    api["responses"].append(FakeResponse(400, {"error": {"message": "Invalid"}}))
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"error": {"message": "Invalid"}}
+
+    assert read_entry(cache_key(ENDPOINT, PARAMS)) is None
+
+def test_bypass_fetches_and_refreshes_the_cache(api):
+    api["responses"].append(FakeResponse(200, {"followers_count": 5}))
+    cached_get(ENDPOINT, PARAMS, ttl=60)
+
+    api["responses"].append(FakeResponse(200, {"followers_count": 8}))
+    assert cached_get(ENDPOINT, PARAMS, ttl=60, bypass=True) == {"followers_count": 8}
+    assert cached_get(ENDPOINT, PARAMS, ttl=60) == {"followers_count": 8}
+    assert cache_stats()["bypassed"] == 1
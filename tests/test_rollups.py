@@ -0,0 +1,28 @@
+import datetime
+import pandas as pd
+from export_service import export_snapshot
+from rollups import ROLLUP_SPECS, build_rollup
+
+def snapshot(day, values):
+    """
+    Builds a daily_post_metrics snapshot of two posts' reach, extracted on a given day of April 2025.
+    """
+    return pd.DataFrame({
+        "post_id": ["1", "2"],
+        "name": "reach",
+        "value": values,
+        "media_type": "IMAGE",
+        "content_pillar": ["tips", "promo"],
+        "publish_datetime": datetime.datetime(2025, 3, 1),
+        "extraction_datetime": datetime.datetime(2025, 4, day, 9),
+    })
+
+def test_change_sums_the_deltas_of_the_period(config):
+    for day, values in [(1, [10, 20]), (2, [15, 20]), (3, [18, 30])]:
+        export_snapshot(snapshot(day, values), config["CLEANED_DATA_PATH"] + "daily_post_metrics", sinks=["history"])
+
+    rollup = build_rollup(ROLLUP_SPECS["post_rollups"], datetime.date(2025, 4, 2), datetime.date(2025, 4, 3))
+    rollup = rollup.set_index(rollup["content_pillar"].astype(str))
+
+    assert rollup["period_end_total"].to_dict() == {"tips": 18, "promo": 30}
+    assert rollup["change"].to_dict() == {"tips": 8, "promo": 10}
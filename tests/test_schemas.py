@@ -0,0 +1,16 @@
+import datetime
+import pandas as pd
+from schemas import LEGACY_LAYOUTS, to_legacy_layout
+
+def test_legacy_layout_keeps_every_column():
+    df = pd.DataFrame({
+        "post_id": ["1"],
+        "name": ["reach"],
+        "value": [10],
+        "extraction_datetime": [datetime.datetime(2025, 4, 1, 9)],
+    })
+
+    legacy = to_legacy_layout(df, "daily_post_metrics")
+
+    assert list(legacy.columns) == LEGACY_LAYOUTS["daily_post_metrics"]
+    assert legacy[["caption", "publish_datetime", "timestamp"]].isna().all(axis=None)